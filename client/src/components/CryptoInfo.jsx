@@ -1,5 +1,5 @@
 import React from 'react'
-import { fetchCryptoCategories, fetchCryptoAlgorithms } from '../utils/api.js'
+import { fetchCryptoCategories, fetchCryptoAlgorithms, fetchCryptoAlgorithm } from '../utils/api.js'
 
 function CryptoInfo() {
   try {
@@ -41,18 +41,15 @@ function CryptoInfo() {
               if (!key) return;
               if (!byCategory[key]) byCategory[key] = [];
               byCategory[key].push({
+                id: a.id,
                 name: a.name,
                 keySize: a.key_size,
                 security: a.security,
                 speed: a.speed,
                 description: a.description,
-                technicalDetails: a.technical_details,
-                vulnerabilities: a.vulnerabilities,
-                simpleExplanation: a.simple_explanation,
-                realWorldExample: a.real_world_example,
-                applications: a.applications || [],
-                advantages: a.advantages || [],
-                disadvantages: a.disadvantages || [],
+                applications: [],
+                advantages: [],
+                disadvantages: [],
               });
             });
 
@@ -69,6 +66,25 @@ function CryptoInfo() {
       loadCryptoInfo();
     }, []);
 
+    async function selectAlgorithm(algo) {
+      setSelectedAlgorithm(algo);
+      try {
+        const a = await fetchCryptoAlgorithm(algo.id);
+        setSelectedAlgorithm(current => current?.id === algo.id ? {
+          ...algo,
+          technicalDetails: a.technical_details,
+          vulnerabilities: a.vulnerabilities,
+          simpleExplanation: a.simple_explanation,
+          realWorldExample: a.real_world_example,
+          applications: a.applications || [],
+          advantages: a.advantages || [],
+          disadvantages: a.disadvantages || [],
+        } : current);
+      } catch (e) {
+        console.error('Error loading algorithm details from server:', e);
+      }
+    }
+
     return (
       <div className="space-y-6 sm:space-y-8 max-w-7xl mx-auto" data-name="crypto-info" data-file="components/CryptoInfo.jsx">
         <div className="section-header">
@@ -121,7 +137,7 @@ function CryptoInfo() {
                 {algorithms && algorithms[selectedCategory] && algorithms[selectedCategory].map((algo, index) => (
                   <button
                     key={index}
-                    onClick={() => setSelectedAlgorithm(algo)}
+                    onClick={() => selectAlgorithm(algo)}
                     className={`p-4 rounded-xl border transition-all duration-300 text-left transform hover:scale-105 ${selectedAlgorithm?.name === algo.name
                       ? 'border-[var(--primary-color)] bg-[var(--primary-color)] bg-opacity-5'
                       : 'border-[var(--border-color)] hover:border-[var(--primary-color)] hover:bg-[var(--bg-tertiary)]'
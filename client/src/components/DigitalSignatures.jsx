@@ -1,6 +1,5 @@
 import React from 'react'
 import { NotificationManager } from './Notification.jsx'
-import { addToHistory } from '../utils/storage.js'
 import { authorizedPost } from '../utils/api.js'
 import CopyButton from './common/CopyButton.jsx'
 
@@ -49,14 +48,6 @@ function DigitalSignatures() {
       const signatureB64 = data.signature;
       setSignature(signatureB64);
 
-      await addToHistory({
-        type: 'sign',
-        algorithm: 'RSA-PSS-2048',
-        input: message,
-        output: signatureB64,
-        timestamp: Date.now()
-      });
-
       NotificationManager.success('Цифровая подпись успешно создана (на сервере)!');
     } catch (error) {
       console.error('Ошибка подписи:', error);
@@ -81,14 +72,6 @@ function DigitalSignatures() {
       const isValid = data.is_valid;
       setVerificationResult(isValid);
 
-      await addToHistory({
-        type: 'verify',
-        algorithm: 'RSA-PSS-2048',
-        input: `${message} | ${signature}`,
-        output: isValid ? 'Подпись верна' : 'Подпись неверна',
-        timestamp: Date.now()
-      });
-
       if (isValid) {
         NotificationManager.success('Подпись действительна!');
       } else {
@@ -6,7 +6,6 @@ import {
 	encryptECC,
 	decryptECC
 } from '../utils/cryptoUtils.js'
-import { addToHistory } from '../utils/storage.js'
 import { NotificationManager } from './Notification.jsx'
 import CopyButton from './common/CopyButton.jsx'
 
@@ -120,14 +119,6 @@ function ECCPanel() {
 					}
 				}));
 
-				await addToHistory({
-					type: 'sign',
-					algorithm: 'ECC-' + curve,
-					input: `Сообщение: ${message.substring(0, 50)}...`,
-					output: `Подпись: ${result.signature.substring(0, 50)}...`,
-					timestamp: Date.now()
-				});
-
 				NotificationManager.success('Сообщение успешно подписано!');
 			} catch (error) {
 				console.error('ECC signing error:', error);
@@ -161,14 +152,6 @@ function ECCPanel() {
 					}
 				}));
 
-				await addToHistory({
-					type: 'verify',
-					algorithm: 'ECC-' + curve,
-					input: `Сообщение: ${message.substring(0, 50)}...`,
-					output: result.is_valid ? 'Подпись верна' : 'Подпись неверна',
-					timestamp: Date.now()
-				});
-
 				if (result.is_valid) {
 					NotificationManager.success('Подпись верифицирована успешно!');
 				} else {
@@ -1,6 +1,5 @@
 import React from 'react'
 import { encryptText, decryptText } from '../utils/cryptoUtils.js'
-import { addToHistory } from '../utils/storage.js'
 import { NotificationManager } from './Notification.jsx'
 import CopyButton from './common/CopyButton.jsx'
 import { ALGORITHM_INFO } from '../utils/constants.js'
@@ -53,14 +52,6 @@ function EncryptionPanel() {
 
         setOutputText(result);
 
-        await addToHistory({
-          type: operation,
-          algorithm: algorithm.toUpperCase(),
-          input: inputText,
-          output: result,
-          timestamp: Date.now()
-        });
-
         NotificationManager.success(
           operation === 'encrypt'
             ? 'Текст успешно зашифрован!'
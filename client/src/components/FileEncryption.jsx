@@ -1,7 +1,6 @@
 import React from 'react'
 import { readFileAsText, readFileAsBase64, isTextFile, isBinaryFile, getMimeType } from '../utils/fileUtils.js'
 import { encryptFile, decryptFile } from '../utils/cryptoUtils.js'
-import { addToHistory } from '../utils/storage.js'
 import { NotificationManager } from './Notification.jsx'
 import KeyGeneratorModal from './KeyGeneratorModal.jsx'
 
@@ -112,14 +111,6 @@ function FileEncryption() {
           processedSize: processedContent.length
         });
 
-        await addToHistory({
-          type: operation,
-          algorithm: algorithm.toUpperCase(),
-          input: `Файл: ${selectedFile.name} (${isBinary ? 'бинарный' : 'текстовый'})`,
-          output: `Обработан файл: ${selectedFile.size} → ${processedContent.length} байт`,
-          timestamp: Date.now()
-        });
-
         NotificationManager.success(`Файл успешно ${operation === 'encrypt' ? 'зашифрован' : 'расшифрован'}!`);
       } catch (error) {
         console.error('File processing error:', error);
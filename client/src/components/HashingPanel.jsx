@@ -1,6 +1,5 @@
 import React from 'react'
 import { hashData, verifyHash } from '../utils/cryptoUtils.js'
-import { addToHistory } from '../utils/storage.js'
 import { NotificationManager } from './Notification.jsx'
 import CopyButton from './common/CopyButton.jsx'
 
@@ -41,14 +40,6 @@ function HashingPanel() {
 					setOutputHash(result.hash);
 				}
 
-				await addToHistory({
-					type: 'hash',
-					algorithm: algorithm.toUpperCase(),
-					input: inputText.substring(0, 100) + (inputText.length > 100 ? '...' : ''),
-					output: result.hash.substring(0, 50) + '...',
-					timestamp: Date.now()
-				});
-
 				NotificationManager.success('Хэширование выполнено успешно!');
 			} catch (error) {
 				console.error('Hashing error:', error);
@@ -77,14 +68,6 @@ function HashingPanel() {
 
 				setVerificationResult(result.is_valid);
 
-				await addToHistory({
-					type: 'verify',
-					algorithm: algorithm.toUpperCase(),
-					input: `Текст: ${inputText.substring(0, 50)}...`,
-					output: result.is_valid ? 'Хэш верен' : 'Хэш не совпадает',
-					timestamp: Date.now()
-				});
-
 				// Показываем всплывающее уведомление
 				if (result.is_valid) {
 					NotificationManager.success('Хэш верифицирован успешно!');
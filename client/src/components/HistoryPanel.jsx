@@ -1,5 +1,5 @@
 import React from 'react'
-import { getEncryptionHistory, exportHistory, clearHistoryOnServer } from '../utils/storage.js'
+import { getHistoryPage, exportHistory, clearHistoryOnServer } from '../utils/storage.js'
 import { NotificationManager } from './Notification.jsx'
 import { OPERATION_LABELS, OPERATION_ICONS } from '../utils/constants.js'
 
@@ -7,16 +7,21 @@ function HistoryPanel() {
   try {
     const [history, setHistory] = React.useState([]);
     const [filter, setFilter] = React.useState('all');
+    const [nextCursor, setNextCursor] = React.useState(null);
     const [isLoading, setIsLoading] = React.useState(false);
+    const [isLoadingMore, setIsLoadingMore] = React.useState(false);
+
+    const operationType = filter === 'all' ? undefined : filter;
 
     React.useEffect(() => {
       let isMounted = true;
 
       const loadHistory = async () => {
         setIsLoading(true);
-        const data = await getEncryptionHistory();
+        const page = await getHistoryPage({ operationType });
         if (isMounted) {
-          setHistory(data);
+          setHistory(page.results);
+          setNextCursor(page.next_cursor);
           setIsLoading(false);
         }
       };
@@ -26,12 +31,15 @@ function HistoryPanel() {
       return () => {
         isMounted = false;
       };
-    }, []);
+    }, [filter]);
 
-    const filteredHistory = history.filter(item => {
-      if (filter === 'all') return true;
-      return item.type === filter;
-    });
+    const loadMore = async () => {
+      setIsLoadingMore(true);
+      const page = await getHistoryPage({ operationType, cursor: nextCursor });
+      setHistory(prev => [...prev, ...page.results]);
+      setNextCursor(page.next_cursor);
+      setIsLoadingMore(false);
+    };
 
     const clearHistory = async () => {
       if (history.length === 0) {
@@ -42,6 +50,7 @@ function HistoryPanel() {
         try {
           await clearHistoryOnServer();
           setHistory([]);
+          setNextCursor(null);
           NotificationManager.success('История операций очищена');
         } catch (error) {
           NotificationManager.error('Не удалось очистить историю операций на сервере');
@@ -97,7 +106,7 @@ function HistoryPanel() {
               <h3 className="text-base sm:text-lg font-semibold text-[var(--text-primary)] mb-2">Загрузка истории операций...</h3>
               <p className="text-sm sm:text-base text-[var(--text-secondary)]">Пожалуйста, подождите, пока мы получаем данные с сервера</p>
             </div>
-          ) : filteredHistory.length === 0 ? (
+          ) : history.length === 0 ? (
             <div className="text-center py-12 sm:py-16">
               <div className="w-16 h-16 sm:w-20 sm:h-20 bg-[var(--bg-tertiary)] rounded-xl sm:rounded-2xl flex items-center justify-center mx-auto mb-4 sm:mb-6">
                 <div className="icon-history text-2xl sm:text-3xl text-[var(--text-secondary)]"></div>
@@ -107,8 +116,8 @@ function HistoryPanel() {
             </div>
           ) : (
             <div className="space-y-4">
-              {filteredHistory.map((item, index) => (
-                <div key={index} className="border border-[var(--border-color)] rounded-xl p-4 sm:p-6 hover:shadow-lg transition-all duration-200">
+              {history.map((item) => (
+                <div key={item.id} className="border border-[var(--border-color)] rounded-xl p-4 sm:p-6 hover:shadow-lg transition-all duration-200">
                   <div className="flex flex-col sm:flex-row items-start sm:items-center justify-between mb-4 gap-4">
                     <div className="flex items-center space-x-4">
                       <div className={`w-12 h-12 rounded-xl flex items-center justify-center ${item.type === 'encrypt' || item.type === 'sign' ? 'bg-green-100' : 'bg-blue-100'
@@ -156,6 +165,13 @@ function HistoryPanel() {
                   </div>
                 </div>
               ))}
+              {nextCursor && (
+                <div className="text-center pt-2">
+                  <button onClick={loadMore} disabled={isLoadingMore} className="btn-secondary">
+                    {isLoadingMore ? 'Загрузка...' : 'Показать еще'}
+                  </button>
+                </div>
+              )}
             </div>
           )}
         </div>
@@ -66,8 +66,16 @@ export async function fetchCryptoCategories() {
   return authorizedGet('/crypto-categories/');
 }
 
+// The list only carries what the algorithm cards show; long texts and
+// lists come from fetchCryptoAlgorithm when an algorithm is opened.
+const CRYPTO_ALGORITHM_LIST_FIELDS = 'id,category_key,name,key_size,security,speed,description';
+
 export async function fetchCryptoAlgorithms() {
-  return authorizedGet('/crypto-algorithms/');
+  return authorizedGet(`/crypto-algorithms/?fields=${CRYPTO_ALGORITHM_LIST_FIELDS}`);
+}
+
+export async function fetchCryptoAlgorithm(id) {
+  return authorizedGet(`/crypto-algorithms/${id}/`);
 }
 
 export { API_BASE, SECURITY_API_BASE };
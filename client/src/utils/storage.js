@@ -51,20 +51,21 @@ export async function getEncryptionHistory() {
   }
 }
 
-export async function addToHistory(operation) {
+// One page of the history, newest first: { results, next_cursor }.
+// Filters (operationType, algorithm) are applied on the server.
+export async function getHistoryPage({ operationType, algorithm, cursor, limit = 50 } = {}) {
+  const params = new URLSearchParams({ limit: String(limit) });
+  if (operationType) params.set('operation_type', operationType);
+  if (algorithm) params.set('algorithm', algorithm);
+  if (cursor) params.set('cursor', cursor);
   try {
-    await authorizedRequest('/security/history/', {
-      method: 'POST',
-      body: JSON.stringify({
-        type: operation.type,
-        algorithm: operation.algorithm,
-        input: operation.input,
-        output: operation.output,
-      }),
+    return await authorizedRequest(`/security/history/?${params}`, {
+      method: 'GET',
     });
   } catch (error) {
-    console.error('Error saving operation to history on server:', error);
-    NotificationManager.warning('Операция выполнена, но не удалось сохранить её в историю');
+    console.error('Error reading encryption history from server:', error);
+    NotificationManager.error('Не удалось загрузить историю операций');
+    return { results: [], next_cursor: null };
   }
 }
 
@@ -2,3 +2,5 @@ from .web_implementation_example_admin import WebImplementationExampleAdmin
 from .algorithm_comparison_admin import AlgorithmComparisonAdmin
 from .crypto_category_admin import CryptoCategoryAdmin
 from .crypto_algorithm_admin import CryptoAlgorithmAdmin
+from .algorithm_measurement_admin import AlgorithmMeasurementAdmin
+from .argon2_profile_admin import Argon2ProfileAdmin
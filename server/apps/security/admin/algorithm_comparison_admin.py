@@ -40,6 +40,7 @@ class AlgorithmComparisonAdmin(admin.ModelAdmin):
                 'year',
                 'explanation',
                 'use_case',
+                'engine_algorithm',
             ),
         }),
     )
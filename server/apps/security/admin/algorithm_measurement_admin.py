@@ -0,0 +1,40 @@
+from django.contrib import admin
+from apps.security.models import AlgorithmMeasurement
+
+
+@admin.register(AlgorithmMeasurement)
+class AlgorithmMeasurementAdmin(admin.ModelAdmin):
+    list_display = (
+        'id',
+        'algorithm',
+        'operation',
+        'mode',
+        'payload_size',
+        'ops_per_second',
+        'mb_per_second',
+        'host',
+        'measured_at',
+    )
+    list_filter = (
+        'algorithm',
+        'host',
+    )
+    ordering = (
+        'algorithm',
+        'operation',
+    )
+    list_per_page = 20
+    readonly_fields = (
+        'host',
+        'algorithm',
+        'operation',
+        'mode',
+        'payload_size',
+        'ops_per_second',
+        'mb_per_second',
+        'p50_ms',
+        'p99_ms',
+        'cpu_model',
+        'library_versions',
+        'measured_at',
+    )
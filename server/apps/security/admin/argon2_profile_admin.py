@@ -0,0 +1,34 @@
+from django.contrib import admin
+from apps.security.models import Argon2Profile
+
+
+@admin.register(Argon2Profile)
+class Argon2ProfileAdmin(admin.ModelAdmin):
+    list_display = (
+        'id',
+        'host',
+        'time_cost',
+        'memory_cost',
+        'parallelism',
+        'measured_ms',
+        'target_ms',
+        'calibrated_at',
+    )
+    ordering = (
+        'host',
+    )
+    list_per_page = 20
+    readonly_fields = (
+        'host',
+        'time_cost',
+        'memory_cost',
+        'parallelism',
+        'hash_len',
+        'measured_ms',
+        'target_ms',
+        'max_memory_kib',
+        'cpu_model',
+        'cpu_count',
+        'argon2_version',
+        'calibrated_at',
+    )
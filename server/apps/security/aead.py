@@ -0,0 +1,203 @@
+"""
+The ``auto`` AEAD: AES-GCM or ChaCha20-Poly1305, whichever is faster here.
+
+AES-GCM is the faster of the two only where the CPU has AES-NI and
+carry-less multiplication (PCLMULQDQ) and pycryptodome uses them; without
+them ChaCha20-Poly1305 usually wins. Nodes differ, so each process picks
+its AEAD once: it reads the CPU features pycryptodome dispatches on, then
+times both ciphers on a short sample. ``CRYPTO_AUTO_AEAD.FORCE`` pins the
+choice instead.
+
+The chosen AEAD is recorded in the ciphertext header, so any node can
+decrypt whatever another node produced::
+
+    version (1) | aead id (1) | nonce (12) | tag (16) | ciphertext
+
+The two header bytes are authenticated as associated data.
+"""
+from __future__ import annotations
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from Crypto.Cipher import AES, ChaCha20_Poly1305
+from .key_cache import _cache_settings
+
+VERSION = 1
+AEADS = {
+    "aes-gcm": 1,
+    "chacha20-poly1305": 2,
+}
+_AEAD_NAMES = {value: name for name, value in AEADS.items()}
+HEADER_SIZE = 2
+NONCE_SIZE = 12
+TAG_SIZE = 16
+OVERHEAD = HEADER_SIZE + NONCE_SIZE + TAG_SIZE
+
+
+class AeadError(ValueError):
+    """Raised for malformed or unauthentic ``auto`` ciphertexts."""
+
+
+@dataclass(frozen=True)
+class CpuFeatures:
+    aes_ni: bool
+    clmul: bool
+    source: str
+
+
+@dataclass(frozen=True)
+class Calibration:
+    choice: str
+    reason: str
+    cpu: CpuFeatures
+    sample_size: int
+    mb_per_s: dict[str, float] = field(default_factory=dict)
+    calibrated_at: str = ""
+    duration_ms: float = 0.0
+
+
+def detect_cpu_features() -> CpuFeatures:
+    """
+    The features pycryptodome itself checks before using its AES-NI and
+    CLMUL code paths; /proc/cpuinfo flags where that is not available.
+    """
+    try:
+        from Crypto.Util import _cpu_features
+        return CpuFeatures(
+            aes_ni=bool(_cpu_features.have_aes_ni()),
+            clmul=bool(_cpu_features.have_clmul()),
+            source="pycryptodome",
+        )
+    except (ImportError, AttributeError, OSError):
+        pass
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as cpuinfo:
+            for line in cpuinfo:
+                if line.startswith("flags"):
+                    flags = set(line.partition(":")[2].split())
+                    return CpuFeatures(aes_ni="aes" in flags, clmul="pclmulqdq" in flags, source="cpuinfo")
+    except OSError:
+        pass
+    return CpuFeatures(aes_ni=False, clmul=False, source="unknown")
+
+
+def _cipher(aead_id: int, key: bytes, nonce):
+    if aead_id == AEADS["aes-gcm"]:
+        return AES.new(key, AES.MODE_GCM, nonce=nonce)
+    if aead_id == AEADS["chacha20-poly1305"]:
+        return ChaCha20_Poly1305.new(key=key, nonce=nonce)
+    raise AeadError(f"Неизвестный AEAD в заголовке: {aead_id}")
+
+
+def seal(aead: str, key: bytes, data) -> bytearray:
+    """Encrypt ``data`` with ``aead`` into one preallocated buffer."""
+    aead_id = AEADS[aead]
+    output = bytearray(OVERHEAD + len(data))
+    view = memoryview(output)
+    view[0] = VERSION
+    view[1] = aead_id
+    view[HEADER_SIZE:HEADER_SIZE + NONCE_SIZE] = os.urandom(NONCE_SIZE)
+    cipher = _cipher(aead_id, key, view[HEADER_SIZE:HEADER_SIZE + NONCE_SIZE])
+    cipher.update(view[:HEADER_SIZE])
+    cipher.encrypt(data, output=view[OVERHEAD:])
+    view[HEADER_SIZE + NONCE_SIZE:OVERHEAD] = cipher.digest()
+    return output
+
+
+def open_sealed(key: bytes, data) -> bytearray:
+    """Decrypt a ciphertext produced by ``seal`` with any AEAD."""
+    data = memoryview(data)
+    if len(data) < OVERHEAD or data[0] != VERSION:
+        raise AeadError("Неверный ключ или поврежденные данные")
+    cipher = _cipher(data[1], key, data[HEADER_SIZE:HEADER_SIZE + NONCE_SIZE])
+    cipher.update(data[:HEADER_SIZE])
+    output = bytearray(len(data) - OVERHEAD)
+    cipher.decrypt(data[OVERHEAD:], output=output)
+    try:
+        cipher.verify(data[HEADER_SIZE + NONCE_SIZE:OVERHEAD])
+    except ValueError as exc:
+        raise AeadError("Неверный ключ или поврежденные данные") from exc
+    return output
+
+
+def sealed_with(data) -> str:
+    """Name of the AEAD a ciphertext was produced with."""
+    if len(data) < HEADER_SIZE or data[0] != VERSION or data[1] not in _AEAD_NAMES:
+        raise AeadError("Неверный ключ или поврежденные данные")
+    return _AEAD_NAMES[data[1]]
+
+
+class AeadSelector:
+    def __init__(self, force: str = "", sample_size: int = 256 * 1024, rounds: int = 5):
+        self.force = force
+        self.sample_size = sample_size
+        self.rounds = max(1, rounds)
+        self._lock = threading.Lock()
+        self._calibration: Calibration | None = None
+
+    @classmethod
+    def from_settings(cls, name: str = "CRYPTO_AUTO_AEAD") -> "AeadSelector":
+        config = _cache_settings(name)
+        return cls(
+            force=config.get("FORCE", "") or "",
+            sample_size=int(config.get("SAMPLE_SIZE", 256 * 1024)),
+            rounds=int(config.get("ROUNDS", 5)),
+        )
+
+    def choice(self) -> str:
+        calibration = self._calibration
+        if calibration is None:
+            calibration = self.calibration()
+        return calibration.choice
+
+    def calibration(self) -> Calibration:
+        """The current calibration, running it on first use."""
+        with self._lock:
+            if self._calibration is None:
+                self._calibration = self._calibrate()
+            return self._calibration
+
+    def recalibrate(self) -> Calibration:
+        with self._lock:
+            self._calibration = self._calibrate()
+            return self._calibration
+
+    def _calibrate(self) -> Calibration:
+        started = time.perf_counter()
+        cpu = detect_cpu_features()
+        calibrated_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        if self.force in AEADS:
+            return Calibration(
+                choice=self.force,
+                reason="setting",
+                cpu=cpu,
+                sample_size=0,
+                calibrated_at=calibrated_at,
+            )
+
+        key = os.urandom(32)
+        sample = os.urandom(self.sample_size)
+        speeds = {}
+        for aead in AEADS:
+            seal(aead, key, sample)
+            best = min(self._time_seal(aead, key, sample) for _ in range(self.rounds))
+            speeds[aead] = round(self.sample_size / 1e6 / best, 1) if best else float("inf")
+        return Calibration(
+            choice=max(speeds, key=speeds.get),
+            reason="calibration",
+            cpu=cpu,
+            sample_size=self.sample_size,
+            mb_per_s=speeds,
+            calibrated_at=calibrated_at,
+            duration_ms=round((time.perf_counter() - started) * 1000, 3),
+        )
+
+    @staticmethod
+    def _time_seal(aead: str, key: bytes, sample: bytes) -> float:
+        started = time.perf_counter()
+        seal(aead, key, sample)
+        return time.perf_counter() - started
+
+
+aead_selector = AeadSelector.from_settings()
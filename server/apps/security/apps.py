@@ -1,6 +1,30 @@
+import threading
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class SecurityConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.security'
+
+    def ready(self):
+        from .response_cache import connect_signals
+        connect_signals()
+        from .worker_pool import in_worker
+        if in_worker():
+            # Worker pool processes only run items handed to them.
+            return
+        if getattr(settings, 'CRYPTO_KEY_POOL', {}).get('PREWARM'):
+            from .key_pool import key_pool
+            key_pool.prewarm()
+        if getattr(settings, 'CRYPTO_AUTO_AEAD', {}).get('CALIBRATE_ON_STARTUP'):
+            from .aead import aead_selector
+            # Off the startup path; the first "auto" request waits for it.
+            threading.Thread(target=aead_selector.calibration, name='aead-calibration', daemon=True).start()
+        if getattr(settings, 'CRYPTO_ARGON2_CALIBRATION', {}).get('CALIBRATE_ON_STARTUP'):
+            from .argon2_calibration import argon2_calibrator
+            # Calibrates only when no stored profile fits this host; hashes use
+            # the static defaults until then.
+            threading.Thread(
+                target=argon2_calibrator.calibrate_on_startup, name='argon2-calibration', daemon=True,
+            ).start()
@@ -0,0 +1,288 @@
+"""
+Per-host default cost parameters for Argon2.
+
+Fixed defaults are too cheap to mean anything on a large node and too
+slow on a small one, so the defaults of ``hash_argon2`` come from a
+calibration on the host itself, following RFC 9106, section 4:
+
+* ``parallelism`` follows the cores available, up to MAX_PARALLELISM;
+* ``memory_cost`` starts at the memory target: MAX_MEMORY_KIB, but no more
+  than one Argon2 worker's share of the executor memory budget. If a single
+  pass over it already takes longer than TARGET_MS, the memory is halved
+  until a pass fits or MIN_MEMORY_KIB is reached;
+* ``time_cost`` then grows while the next pass still fits into TARGET_MS.
+
+The profile is stored per host in Argon2Profile and used while the CPU,
+the core count, the argon2-cffi version and the targets stay the same.
+Processes read it on first use and again every RELOAD_INTERVAL seconds, so
+a recalibration reaches every worker. At startup (CALIBRATE_ON_STARTUP) a
+host without a fitting profile is calibrated in the background. Web
+workers booting together take a lock in the shared cache first, so one of
+them measures while the others wait for its result instead of slowing down
+each other's timing runs and racing to store theirs; with a cache that is
+not shared between processes each one calibrates. ``manage.py
+calibrate_argon2`` recalibrates on demand. Until a profile is stored,
+DEFAULT_PROFILE applies.
+"""
+from __future__ import annotations
+import os
+import platform
+import statistics
+import threading
+import time
+from dataclasses import asdict, dataclass
+from importlib import metadata
+from django.apps import apps
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from django.utils import timezone
+from .key_cache import _cache_settings
+
+try:
+    import argon2
+    from argon2.low_level import Type, hash_secret_raw
+except ImportError:
+    argon2 = None
+
+MIN_MEMORY_KIB = 8 * 1024
+# Longer than any calibration takes; only matters when the calibrating process dies.
+CALIBRATION_LOCK_TIMEOUT = 300
+
+
+@dataclass(frozen=True)
+class Argon2Parameters:
+    time_cost: int
+    memory_cost: int
+    parallelism: int
+    hash_len: int = 32
+
+
+@dataclass(frozen=True)
+class Argon2CalibrationProfile:
+    parameters: Argon2Parameters
+    # "default", "stored" or "calibration"
+    source: str
+    measured_ms: float | None = None
+    target_ms: float | None = None
+    max_memory_kib: int | None = None
+    host: str = ""
+    cpu_model: str = ""
+    cpu_count: int | None = None
+    argon2_version: str = ""
+    calibrated_at: str = ""
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+DEFAULT_PROFILE = Argon2CalibrationProfile(
+    parameters=Argon2Parameters(time_cost=2, memory_cost=512, parallelism=2),
+    source="default",
+)
+
+
+def _host() -> str:
+    return platform.node() or "localhost"
+
+
+def _cpu_model() -> str:
+    from .benchmark import cpu_model
+    return cpu_model()
+
+
+def _argon2_version() -> str:
+    try:
+        return metadata.version("argon2-cffi")
+    except metadata.PackageNotFoundError:
+        return ""
+
+
+class Argon2Calibrator:
+    def __init__(self, target_ms: float = 250.0, max_memory_kib: int = 64 * 1024, max_parallelism: int = 4,
+                 hash_len: int = 32, rounds: int = 3, reload_interval: float = 300.0):
+        self.target_ms = target_ms
+        self.max_memory_kib = max_memory_kib
+        self.max_parallelism = max_parallelism
+        self.hash_len = hash_len
+        self.rounds = max(1, rounds)
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._profile: Argon2CalibrationProfile | None = None
+        self._loaded_at: float | None = None
+
+    @classmethod
+    def from_settings(cls, name: str = "CRYPTO_ARGON2_CALIBRATION") -> "Argon2Calibrator":
+        config = _cache_settings(name)
+        return cls(
+            target_ms=float(config.get("TARGET_MS", 250)),
+            max_memory_kib=int(config.get("MAX_MEMORY_KIB", 64 * 1024)),
+            max_parallelism=int(config.get("MAX_PARALLELISM", 4)),
+            hash_len=int(config.get("HASH_LEN", 32)),
+            rounds=int(config.get("ROUNDS", 3)),
+            reload_interval=float(config.get("RELOAD_INTERVAL", 300)),
+        )
+
+    def profile(self) -> Argon2CalibrationProfile:
+        """The stored profile of this host if it fits, DEFAULT_PROFILE otherwise."""
+        loaded_at = self._loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at >= self.reload_interval:
+            # One thread reloads; the others keep using the current profile.
+            if self._lock.acquire(blocking=loaded_at is None):
+                try:
+                    if self._loaded_at is loaded_at:
+                        self._profile = self._load()
+                        self._loaded_at = time.monotonic()
+                finally:
+                    self._lock.release()
+        return self._profile or DEFAULT_PROFILE
+
+    def parameters(self) -> Argon2Parameters:
+        return self.profile().parameters
+
+    def calibrate_on_startup(self) -> None:
+        """For a thread started in AppConfig.ready(): calibrate unless a fitting profile is stored."""
+        # Queries before the app registry is ready are discouraged; wait for it.
+        while not apps.ready:
+            time.sleep(0.05)
+        try:
+            # No table yet (``migrate`` on a new database): nothing to store into.
+            if self.profile().source == "stored" or not self._has_table():
+                return
+            lock = f"security:argon2:calibrating:{_host()}"
+            # One process calibrates; the lock expires should it die meanwhile.
+            while not cache.add(lock, os.getpid(), CALIBRATION_LOCK_TIMEOUT):
+                time.sleep(1.0)
+            try:
+                with self._lock:
+                    # Another process may have stored one while this one waited.
+                    stored = self._load()
+                    self._profile, self._loaded_at = stored, time.monotonic()
+                if stored is None:
+                    self.recalibrate()
+            finally:
+                cache.delete(lock)
+        finally:
+            connection.close()
+
+    def recalibrate(self) -> Argon2CalibrationProfile:
+        """Calibrate on this host and store the result; other processes pick it up on their next reload."""
+        with self._lock:
+            profile = self._store(self._calibrate())
+            if profile.source == "calibration":
+                self._profile = profile
+                self._loaded_at = time.monotonic()
+            return profile
+
+    def _limits(self) -> tuple[int, int, int]:
+        """``(memory_kib, parallelism, max_time_cost)`` allowed on this host."""
+        limits = _cache_settings("CRYPTO_ARGON2")
+        parallelism = max(1, min(os.cpu_count() or 1, self.max_parallelism, int(limits.get("MAX_PARALLELISM", 8))))
+        worker_share = int(limits.get("MEMORY_BUDGET_KIB", 1024 * 1024)) // max(1, int(limits.get("MAX_WORKERS", 4)))
+        memory_kib = min(self.max_memory_kib, int(limits.get("MAX_MEMORY_COST", 256 * 1024)), worker_share)
+        return max(memory_kib, 8 * parallelism), parallelism, int(limits.get("MAX_TIME_COST", 10))
+
+    def _time_ms(self, time_cost: int, memory_cost: int, parallelism: int) -> float:
+        secret, salt = os.urandom(32), os.urandom(16)
+        samples = []
+        for _ in range(self.rounds):
+            started = time.perf_counter()
+            hash_secret_raw(secret, salt, time_cost, memory_cost, parallelism, self.hash_len, Type.ID)
+            samples.append((time.perf_counter() - started) * 1000)
+        return statistics.median(samples)
+
+    def _calibrate(self) -> Argon2CalibrationProfile:
+        if argon2 is None:
+            return DEFAULT_PROFILE
+        memory_cap, parallelism, max_time_cost = self._limits()
+        memory_kib = memory_cap
+        floor = min(memory_kib, max(MIN_MEMORY_KIB, 8 * parallelism))
+
+        time_cost = 1
+        measured = self._time_ms(time_cost, memory_kib, parallelism)
+        while measured > self.target_ms and memory_kib > floor:
+            memory_kib = max(floor, memory_kib // 2)
+            measured = self._time_ms(time_cost, memory_kib, parallelism)
+        # The cost is linear in time_cost: add passes while one more still fits.
+        while time_cost < max_time_cost and measured * (time_cost + 1) / time_cost <= self.target_ms:
+            time_cost += 1
+            measured = self._time_ms(time_cost, memory_kib, parallelism)
+
+        return Argon2CalibrationProfile(
+            parameters=Argon2Parameters(time_cost, memory_kib, parallelism, self.hash_len),
+            source="calibration",
+            measured_ms=round(measured, 3),
+            target_ms=self.target_ms,
+            max_memory_kib=memory_cap,
+            host=_host(),
+            cpu_model=_cpu_model(),
+            cpu_count=os.cpu_count() or 1,
+            argon2_version=_argon2_version(),
+            calibrated_at=timezone.now().isoformat(),
+        )
+
+    @staticmethod
+    def _has_table() -> bool:
+        from .models import Argon2Profile
+        try:
+            return Argon2Profile._meta.db_table in connection.introspection.table_names()
+        except DatabaseError:
+            return False
+
+    def _load(self) -> Argon2CalibrationProfile | None:
+        from .models import Argon2Profile
+        try:
+            row = Argon2Profile.objects.filter(host=_host()).first()
+        except DatabaseError:
+            return None
+        memory_kib, parallelism, _ = self._limits()
+        if row is None or (
+            row.cpu_model, row.cpu_count, row.argon2_version, row.target_ms, row.max_memory_kib,
+            row.parallelism, row.hash_len,
+        ) != (
+            _cpu_model(), os.cpu_count() or 1, _argon2_version(), self.target_ms, memory_kib,
+            parallelism, self.hash_len,
+        ):
+            return None
+        return Argon2CalibrationProfile(
+            parameters=Argon2Parameters(row.time_cost, row.memory_cost, row.parallelism, row.hash_len),
+            source="stored",
+            measured_ms=row.measured_ms,
+            target_ms=row.target_ms,
+            max_memory_kib=row.max_memory_kib,
+            host=row.host,
+            cpu_model=row.cpu_model,
+            cpu_count=row.cpu_count,
+            argon2_version=row.argon2_version,
+            calibrated_at=row.calibrated_at.isoformat(),
+        )
+
+    @staticmethod
+    def _store(profile: Argon2CalibrationProfile) -> Argon2CalibrationProfile:
+        """Persist a fresh calibration; without a database it is kept in memory only."""
+        if profile.source != "calibration":
+            return profile
+        from .models import Argon2Profile
+        parameters = profile.parameters
+        try:
+            Argon2Profile.objects.update_or_create(
+                host=profile.host,
+                defaults={
+                    "time_cost": parameters.time_cost,
+                    "memory_cost": parameters.memory_cost,
+                    "parallelism": parameters.parallelism,
+                    "hash_len": parameters.hash_len,
+                    "measured_ms": profile.measured_ms,
+                    "target_ms": profile.target_ms,
+                    "max_memory_kib": profile.max_memory_kib,
+                    "cpu_model": profile.cpu_model,
+                    "cpu_count": profile.cpu_count,
+                    "argon2_version": profile.argon2_version,
+                    "calibrated_at": profile.calibrated_at,
+                },
+            )
+        except DatabaseError:
+            pass
+        return profile
+
+
+argon2_calibrator = Argon2Calibrator.from_settings()
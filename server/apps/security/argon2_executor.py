@@ -0,0 +1,176 @@
+"""
+Bounded executor for memory-hard hashing.
+
+Each Argon2 call allocates ``memory_cost`` KiB for its whole run, so the
+number of concurrent hashes alone says little about the load. Work is run
+on a small dedicated thread pool (argon2-cffi releases the GIL) and only
+starts once its memory fits into the budget shared by everything in
+flight. Submissions beyond ``max_queue`` waiting jobs, or jobs that cannot
+start within ``queue_timeout`` seconds, are rejected with ``ExecutorBusy``
+so the caller can answer 429 with a Retry-After hint.
+
+The budget is per server process.
+"""
+from __future__ import annotations
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable
+from .key_cache import _cache_settings
+
+
+class ExecutorBusy(Exception):
+    """Raised when a job is rejected by admission control."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class ExecutorStats:
+    max_workers: int
+    max_queue: int
+    memory_budget_kib: int
+    memory_in_use_kib: int
+    running: int
+    queued: int
+    submitted: int
+    completed: int
+    rejected: int
+    queue_avg_ms: float
+    queue_max_ms: float
+    exec_avg_ms: float
+    exec_max_ms: float
+
+
+class _Timing:
+    __slots__ = ("count", "total", "maximum")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.maximum = max(self.maximum, seconds)
+
+    @property
+    def average(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class MemoryBoundedExecutor:
+    def __init__(
+        self,
+        max_workers: int = 4,
+        memory_budget_kib: int = 1024 * 1024,
+        max_queue: int = 32,
+        queue_timeout: float = 10.0,
+        name: str = "argon2",
+    ):
+        self.max_workers = max(1, max_workers)
+        self.memory_budget_kib = memory_budget_kib
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._name = name
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        self._threads: ThreadPoolExecutor | None = None
+        self._memory_in_use = 0
+        self._running = 0
+        self._queued = 0
+        self._submitted = 0
+        self._completed = 0
+        self._rejected = 0
+        self._queue_time = _Timing()
+        self._exec_time = _Timing()
+
+    @classmethod
+    def from_settings(cls, name: str) -> "MemoryBoundedExecutor":
+        config = _cache_settings(name)
+        return cls(
+            max_workers=int(config.get("MAX_WORKERS", 4)),
+            memory_budget_kib=int(config.get("MEMORY_BUDGET_KIB", 1024 * 1024)),
+            max_queue=int(config.get("MAX_QUEUE", 32)),
+            queue_timeout=float(config.get("QUEUE_TIMEOUT", 10.0)),
+        )
+
+    def run(self, memory_kib: int, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run ``func`` on the pool once ``memory_kib`` fits into the budget
+        and return its result. Blocks the caller until the job is done.
+        """
+        if memory_kib > self.memory_budget_kib:
+            raise ValueError("memory_kib exceeds the executor memory budget")
+        with self._lock:
+            if self._queued >= self.max_queue:
+                self._rejected += 1
+                raise ExecutorBusy("Очередь вычислений переполнена", self._retry_after_locked())
+            self._queued += 1
+            self._submitted += 1
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix=self._name,
+                )
+            threads = self._threads
+        return threads.submit(self._execute, time.perf_counter(), memory_kib, func, args, kwargs).result()
+
+    def _execute(self, enqueued: float, memory_kib: int, func, args, kwargs):
+        deadline = enqueued + self.queue_timeout
+        with self._lock:
+            try:
+                while self._memory_in_use + memory_kib > self.memory_budget_kib:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        self._rejected += 1
+                        raise ExecutorBusy("Превышен лимит памяти для вычислений", self._retry_after_locked())
+                    self._released.wait(remaining)
+            finally:
+                self._queued -= 1
+            self._memory_in_use += memory_kib
+            self._running += 1
+            started = time.perf_counter()
+            self._queue_time.add(started - enqueued)
+
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._memory_in_use -= memory_kib
+                self._running -= 1
+                self._completed += 1
+                self._exec_time.add(time.perf_counter() - started)
+                self._released.notify_all()
+
+    def _retry_after_locked(self) -> int:
+        # Time to drain the current backlog at the observed execution speed.
+        backlog = self._queued + self._running
+        estimate = self._exec_time.average * backlog / self.max_workers
+        return max(1, math.ceil(estimate))
+
+    def stats(self) -> ExecutorStats:
+        with self._lock:
+            return ExecutorStats(
+                max_workers=self.max_workers,
+                max_queue=self.max_queue,
+                memory_budget_kib=self.memory_budget_kib,
+                memory_in_use_kib=self._memory_in_use,
+                running=self._running,
+                queued=self._queued,
+                submitted=self._submitted,
+                completed=self._completed,
+                rejected=self._rejected,
+                queue_avg_ms=round(self._queue_time.average * 1000, 3),
+                queue_max_ms=round(self._queue_time.maximum * 1000, 3),
+                exec_avg_ms=round(self._exec_time.average * 1000, 3),
+                exec_max_ms=round(self._exec_time.maximum * 1000, 3),
+            )
+
+
+argon2_executor = MemoryBoundedExecutor.from_settings("CRYPTO_ARGON2")
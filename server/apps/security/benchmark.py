@@ -0,0 +1,446 @@
+"""
+Benchmark sweep over the algorithms served by CryptoEngine.
+
+Every cell is one (algorithm, operation, mode, payload size) combination.
+The operations and modes come from the algorithm registry, so a newly
+registered algorithm is benchmarked without touching this module. Modes:
+
+    text    UTF-8 text payload, as sent to /crypto/
+    binary  Base64 payload with ``is_binary`` set
+    raw     bytes through encrypt_bytes/decrypt_bytes, as /crypto/raw/
+
+RSA signing is not an engine operation; it is benchmarked through the
+module-level functions the RSA endpoints use. Key pair generation calls
+the generators directly so the key pool does not hide the cost.
+
+For each cell the operation is run once as a warm-up, then repeated until
+``min_time`` has passed (at least ``min_repeats``, at most
+``max_repeats`` samples). Operations that take only microseconds are
+timed in batches, one sample being the average call of a batch. Reported
+are p50/p99 latency, throughput at p50 and the peak of Python allocations
+during one extra traced run. Memory allocated inside C libraries (the
+Argon2 memory cost, for example) is not visible to tracemalloc.
+
+Results are plain dicts keyed by cell, so a run can be stored as a JSON
+baseline and a later run compared against it.
+"""
+from __future__ import annotations
+import base64
+import math
+import os
+import platform
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Callable, Iterable, Iterator
+import Crypto
+import argon2
+from .argon2_calibration import Argon2Parameters, argon2_calibrator
+from .crypto_service import (
+    ALGORITHM_REGISTRY,
+    CryptoEngine,
+    generate_ecc_keypair,
+    generate_rsa_keypair,
+    sign_message_rsa_pss,
+    verify_message_rsa_pss,
+)
+from .key_pool import key_pool
+from .registry import BINARY
+
+# 64 B .. 64 MiB in steps of 4x.
+SIZES = tuple(64 * 4 ** step for step in range(11))
+MODES = ("text", "binary", "raw")
+# Largest payload per algorithm where the full sweep would take minutes
+# (pure-Python Twofish) or says nothing new (Argon2 cost does not depend
+# on the password length).
+SIZE_LIMITS = {
+    "twofish": 256 * 1024,
+    "argon2": 64 * 1024,
+}
+# Operations whose cost does not depend on a payload are run once, size 0.
+SIZELESS_OPERATIONS = frozenset({"generate_keypair"})
+DEFAULT_THRESHOLD = 0.10
+# Operations faster than this are timed in batches and averaged per call,
+# so timer overhead and scheduler noise do not dominate the sample.
+SAMPLE_FLOOR_NS = 50_000
+MAX_BATCH = 1000
+# Peak memory differences below this are allocator noise, not regressions.
+MEMORY_SLACK_KIB = 64
+
+_KEY = "benchmark-key"
+# Maps every byte value onto printable ASCII, to turn random bytes into text.
+_TEXT_TABLE = bytes(0x20 + byte % 0x5F for byte in range(256))
+
+
+@dataclass(frozen=True)
+class BenchmarkCell:
+    algorithm: str
+    operation: str
+    mode: str
+    size: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.algorithm}/{self.operation}/{self.mode}/{self.size}"
+
+    @classmethod
+    def from_key(cls, key: str) -> "BenchmarkCell":
+        algorithm, operation, mode, size = key.split("/")
+        return cls(algorithm, operation, mode, int(size))
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    algorithm: str
+    operation: str
+    mode: str
+    size: int
+    repeats: int
+    p50_ms: float
+    p99_ms: float
+    mb_per_s: float | None
+    peak_memory_kib: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.algorithm}/{self.operation}/{self.mode}/{self.size}"
+
+
+@dataclass(frozen=True)
+class Regression:
+    key: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        return self.current / self.baseline - 1 if self.baseline else math.inf
+
+
+def cpu_model() -> str:
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as cpuinfo:
+            for line in cpuinfo:
+                if line.startswith("model name"):
+                    return line.partition(":")[2].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def environment() -> dict:
+    """What the numbers depend on besides the code."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_model": cpu_model(),
+        "cpu_count": os.cpu_count(),
+        "pycryptodome": Crypto.__version__,
+        "argon2_cffi": argon2.__version__,
+    }
+
+
+def _modes(algorithm: str, operation: str) -> tuple[str, ...]:
+    spec = ALGORITHM_REGISTRY[algorithm]
+    modes = []
+    if (algorithm, operation, False) in ALGORITHM_REGISTRY.dispatch:
+        modes.append("text")
+    if BINARY in spec.capabilities and spec.supports_binary(operation):
+        modes.append("binary")
+    if (algorithm, operation) in ALGORITHM_REGISTRY.bytes_dispatch:
+        modes.append("raw")
+    return tuple(modes)
+
+
+def _operations() -> Iterator[tuple[str, str, tuple[str, ...]]]:
+    for algorithm in ALGORITHM_REGISTRY.names():
+        for operation in sorted(ALGORITHM_REGISTRY[algorithm].operations):
+            yield algorithm, operation, _modes(algorithm, operation)
+    yield "rsa", "sign", ("text",)
+    yield "rsa", "verify", ("text",)
+
+
+def cells(
+    algorithms: Iterable[str] | None = None,
+    operations: Iterable[str] | None = None,
+    modes: Iterable[str] | None = None,
+    sizes: Iterable[int] = SIZES,
+) -> list[BenchmarkCell]:
+    """The sweep, optionally narrowed to some algorithms/operations/modes/sizes."""
+    algorithms = set(algorithms) if algorithms else None
+    operations = set(operations) if operations else None
+    modes = set(modes) if modes else None
+    sizes = sorted(set(sizes))
+    selected = []
+    for algorithm, operation, supported in _operations():
+        if algorithms is not None and algorithm not in algorithms:
+            continue
+        if operations is not None and operation not in operations:
+            continue
+        for mode in supported:
+            if modes is not None and mode not in modes:
+                continue
+            if operation in SIZELESS_OPERATIONS:
+                selected.append(BenchmarkCell(algorithm, operation, mode, 0))
+                continue
+            limit = SIZE_LIMITS.get(algorithm)
+            selected.extend(
+                BenchmarkCell(algorithm, operation, mode, size)
+                for size in sizes
+                if limit is None or size <= limit
+            )
+    return selected
+
+
+# ---------------------------------------------------------------------------
+# Cell setup
+# ---------------------------------------------------------------------------
+
+def _text(size: int) -> str:
+    return os.urandom(size).translate(_TEXT_TABLE).decode("ascii")
+
+
+def _payload(mode: str, size: int) -> str | bytes:
+    if mode == "raw":
+        return os.urandom(size)
+    if mode == "binary":
+        return base64.b64encode(os.urandom(size)).decode("ascii")
+    return _text(size)
+
+
+def _engine(algorithm: str, operation: str, mode: str, params: dict | None = None) -> CryptoEngine:
+    return CryptoEngine(
+        algorithm=algorithm,
+        key=_KEY if algorithm != "caesar" else "3",
+        is_binary=mode == "binary",
+        operation=operation,
+        params=params,
+    )
+
+
+class _Keys:
+    """Key pairs shared by all cells of one run."""
+
+    def __init__(self):
+        self._pairs = {}
+
+    def get(self, algorithm: str):
+        if algorithm not in self._pairs:
+            self._pairs[algorithm] = generate_rsa_keypair() if algorithm == "rsa" else generate_ecc_keypair()
+        return self._pairs[algorithm]
+
+
+def _prepare(cell: BenchmarkCell, keys: _Keys, argon2_parameters: Argon2Parameters | None = None) -> Callable[[], object]:
+    """Return a zero-argument callable running the cell's operation once."""
+    algorithm, operation, mode = cell.algorithm, cell.operation, cell.mode
+
+    if operation == "generate_keypair":
+        generator = generate_rsa_keypair if algorithm == "rsa" else generate_ecc_keypair
+        return generator
+
+    payload = _payload(mode, cell.size)
+
+    if algorithm == "rsa":
+        pair = keys.get("rsa")
+        signature = sign_message_rsa_pss(payload, pair.private_key_b64)
+        if operation == "sign":
+            return lambda: sign_message_rsa_pss(payload, pair.private_key_b64)
+        return lambda: verify_message_rsa_pss(payload, signature, pair.public_key_b64)
+
+    if algorithm == "ecc":
+        pair = keys.get("ecc")
+        if operation in ("sign", "encrypt"):
+            engine = CryptoEngine("ecc", pair.private_key_b64 if operation == "sign" else pair.public_key_b64,
+                                  operation=operation, params={"format": "compact"} if operation == "encrypt" else None)
+            return lambda: engine.process(payload)
+        if operation == "verify":
+            signature = CryptoEngine("ecc", pair.private_key_b64, operation="sign").process(payload)["signature"]
+            engine = CryptoEngine("ecc", pair.public_key_b64, operation="verify", params={"signature": signature})
+            return lambda: engine.process(payload)
+        ciphertext = CryptoEngine("ecc", pair.public_key_b64, operation="encrypt",
+                                  params={"format": "compact"}).process(payload)["encrypted"]
+        engine = CryptoEngine("ecc", pair.private_key_b64, operation="decrypt")
+        return lambda: engine.process(ciphertext)
+
+    if operation == "hash":
+        engine = _engine(algorithm, "hash", mode, _default_params(algorithm, "hash", argon2_parameters))
+        return lambda: engine.process(payload)
+
+    if operation == "verify":
+        digest = _engine(
+            algorithm, "hash", mode, _default_params(algorithm, "hash", argon2_parameters),
+        ).process(payload)["hash"]
+        engine = _engine(algorithm, "verify", mode, {"hash": digest})
+        return lambda: engine.process(payload)
+
+    encryptor = _engine(algorithm, "encrypt", mode)
+    if mode == "raw":
+        if operation == "encrypt":
+            return lambda: encryptor.encrypt_bytes(payload)
+        ciphertext = bytes(encryptor.encrypt_bytes(payload))
+        decryptor = _engine(algorithm, "decrypt", mode)
+        return lambda: decryptor.decrypt_bytes(ciphertext)
+    if operation == "encrypt":
+        return lambda: encryptor.process(payload)
+    ciphertext = encryptor.process(payload)["result"]
+    decryptor = _engine(algorithm, "decrypt", mode)
+    return lambda: decryptor.process(ciphertext)
+
+
+def _default_params(algorithm: str, operation: str,
+                    argon2_parameters: Argon2Parameters | None = None) -> dict | None:
+    _, params = ALGORITHM_REGISTRY.validate_request(algorithm, operation, _KEY, False, None)
+    if algorithm == "argon2" and operation == "hash":
+        # The costs requests on this host get, unless the caller pins them.
+        parameters = argon2_parameters or argon2_calibrator.parameters()
+        params = {**asdict(parameters), **(params or {})}
+    return params or None
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def _percentile(samples: list[int], fraction: float) -> int:
+    """Nearest-rank percentile of sorted ``samples``."""
+    rank = max(1, math.ceil(fraction * len(samples)))
+    return samples[rank - 1]
+
+
+def _peak_memory(func: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return max(0, peak - baseline)
+
+
+def _batch_size(func: Callable[[], object]) -> int:
+    """Calls per sample so that one sample takes at least SAMPLE_FLOOR_NS."""
+    started = time.perf_counter_ns()
+    func()
+    elapsed = time.perf_counter_ns() - started
+    return max(1, min(MAX_BATCH, SAMPLE_FLOOR_NS // max(elapsed, 1)))
+
+
+def measure(
+    cell: BenchmarkCell,
+    keys: _Keys | None = None,
+    min_time: float = 0.5,
+    min_repeats: int = 5,
+    max_repeats: int = 1000,
+    argon2_parameters: Argon2Parameters | None = None,
+) -> BenchmarkResult:
+    func = _prepare(cell, keys or _Keys(), argon2_parameters)
+    func()
+    batch = _batch_size(func)
+    calls = range(batch)
+
+    samples = []
+    deadline = time.perf_counter() + min_time
+    while len(samples) < max_repeats and (len(samples) < min_repeats or time.perf_counter() < deadline):
+        started = time.perf_counter_ns()
+        for _ in calls:
+            func()
+        samples.append((time.perf_counter_ns() - started) // batch)
+    samples.sort()
+
+    p50 = _percentile(samples, 0.50)
+    return BenchmarkResult(
+        algorithm=cell.algorithm,
+        operation=cell.operation,
+        mode=cell.mode,
+        size=cell.size,
+        repeats=len(samples) * batch,
+        p50_ms=round(p50 / 1e6, 6),
+        p99_ms=round(_percentile(samples, 0.99) / 1e6, 6),
+        mb_per_s=round(cell.size / 1e6 / (p50 / 1e9), 3) if cell.size and p50 else None,
+        peak_memory_kib=round(_peak_memory(func) / 1024, 1),
+    )
+
+
+def run(
+    selected: Iterable[BenchmarkCell],
+    min_time: float = 0.5,
+    min_repeats: int = 5,
+    max_repeats: int = 1000,
+    progress: Callable[[BenchmarkResult], None] | None = None,
+    argon2_parameters: Argon2Parameters | None = None,
+) -> list[BenchmarkResult]:
+    """
+    Measure ``selected``. Argon2 hashes with this host's calibrated costs
+    unless ``argon2_parameters`` pins them, as runs compared with a
+    baseline must.
+    """
+    # The pool would serve the compact ECC envelope from stock and refill
+    # it in the background, measuring a pool hit and competing for the CPU
+    # with the cells that follow.
+    pool_enabled, key_pool.enabled = key_pool.enabled, False
+    keys = _Keys()
+    results = []
+    try:
+        for cell in selected:
+            result = measure(cell, keys, min_time=min_time, min_repeats=min_repeats, max_repeats=max_repeats,
+                             argon2_parameters=argon2_parameters)
+            results.append(result)
+            if progress is not None:
+                progress(result)
+    finally:
+        key_pool.enabled = pool_enabled
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Baselines
+# ---------------------------------------------------------------------------
+
+def to_document(results: Iterable[BenchmarkResult]) -> dict:
+    """JSON-ready form of a run, as stored in a baseline file."""
+    return {
+        "environment": environment(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "results": {result.key: asdict(result) for result in results},
+    }
+
+
+def compare(
+    baseline: dict,
+    current: dict,
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[Regression]:
+    """
+    Cells of ``current`` that are slower (p50) or use more memory than in
+    ``baseline`` by more than ``threshold``. Both are baseline documents;
+    cells present in only one of them are ignored.
+    """
+    regressions = []
+    for key, now in current["results"].items():
+        before = baseline["results"].get(key)
+        if before is None:
+            continue
+        if now["p50_ms"] > before["p50_ms"] * (1 + threshold):
+            regressions.append(Regression(key, "p50_ms", before["p50_ms"], now["p50_ms"]))
+        memory_limit = max(before["peak_memory_kib"] * (1 + threshold), before["peak_memory_kib"] + MEMORY_SLACK_KIB)
+        if now["peak_memory_kib"] > memory_limit:
+            regressions.append(Regression(key, "peak_memory_kib", before["peak_memory_kib"], now["peak_memory_kib"]))
+    return regressions
+
+
+def keep_best(document: dict, results: Iterable[BenchmarkResult]) -> None:
+    """
+    Fold re-measured ``results`` into ``document``, keeping the faster
+    measurement of each cell. Used to confirm regressions: a cell only
+    counts as slower if it stays slower when measured again, which filters
+    out a neighbour briefly stealing the CPU.
+    """
+    for result in results:
+        previous = document["results"].get(result.key)
+        if previous is None or result.p50_ms < previous["p50_ms"]:
+            document["results"][result.key] = asdict(result)
@@ -0,0 +1,344 @@
+"""
+Bulk encryption of directory trees for ``manage.py crypto_bulk``.
+
+Files are written in the chunked stream format of ``file_stream`` with the
+same key derivation as the web service, so the results open with the
+files/decrypt endpoint and the other way round. Every chunk of that format
+is sealed on its own under its counter, which lets a large file be cut into
+segments of whole chunks that workers seal in parallel, each straight into
+its byte range of a preallocated output file. Inputs and outputs are memory
+mapped, so no file is ever read into memory as a whole.
+
+Small files are not worth a pool round trip each: they are packed many to
+a task, so thousands of them cost a few hundred tasks rather than a task
+(or a process) per file. All work goes through the shared ``worker_pool``
+executor.
+
+A manifest records the SHA-256 of the plaintext and of the ciphertext of
+every file, its size, segment count and worker time.
+"""
+from __future__ import annotations
+import hashlib
+import mmap
+import os
+import time
+from concurrent.futures import as_completed
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable
+from . import worker_pool
+from .crypto_service import CryptoServiceError, _derive_key, _generate_secure_random_bytes
+from .file_stream import (
+    DEFAULT_CHUNK_SIZE, HEADER_SIZE, NONCE_PREFIX_SIZE, TAG_SIZE,
+    chunk_count, encrypted_size, make_header, open_chunk_into, parse_header, plaintext_size, seal_chunk_into,
+)
+
+OPERATIONS = ("encrypt", "decrypt")
+SUFFIX = ".enc"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+DEFAULT_SEGMENT_SIZE = 8 * 1024 * 1024
+# Upper bound of files packed into one task; a task also closes once its
+# files add up to a segment.
+BATCH_FILES = 256
+
+
+@dataclass(frozen=True)
+class FilePlan:
+    index: int
+    source: str
+    target: str
+    size: int
+    output_size: int
+    algorithm: str
+    chunk_size: int
+    header: bytes
+
+    @property
+    def chunks(self) -> int:
+        return chunk_count(min(self.size, self.output_size), self.chunk_size)
+
+
+@dataclass(frozen=True)
+class Job:
+    """Chunks ``first`` to ``stop`` (exclusive) of one file."""
+    plan: FilePlan
+    first: int
+    stop: int
+
+    @property
+    def whole(self) -> bool:
+        return self.first == 0 and self.stop == self.plan.chunks
+
+
+@dataclass(frozen=True)
+class JobResult:
+    index: int
+    seconds: float
+    error: str = ""
+    sha256: str = ""
+    encrypted_sha256: str = ""
+
+
+@dataclass
+class FileRecord:
+    path: str
+    output: str
+    size: int
+    output_size: int = 0
+    segments: int = 0
+    sha256: str = ""
+    encrypted_sha256: str = ""
+    elapsed_ms: float = 0.0
+    status: str = "ok"
+    error: str = ""
+
+
+def output_name(name: str, operation: str) -> str:
+    if operation == "encrypt":
+        return name + SUFFIX
+    return name[:-len(SUFFIX)] if name.endswith(SUFFIX) else name
+
+
+def collect(source: Path) -> list[Path]:
+    """Regular files under ``source`` in a stable order, without a manifest."""
+    return sorted(
+        path for path in source.rglob("*")
+        if path.is_file() and path != source / MANIFEST_NAME
+    )
+
+
+@contextmanager
+def _mapped(path: str, size: int, writable: bool):
+    """A memoryview over the first ``size`` bytes of ``path``."""
+    if size == 0:
+        yield memoryview(b"")
+        return
+    access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+    with open(path, "r+b" if writable else "rb") as file, \
+            mmap.mmap(file.fileno(), size, access=access) as mapped:
+        view = memoryview(mapped)
+        try:
+            yield view
+        finally:
+            view.release()
+
+
+def _preallocate(path: Path, size: int) -> None:
+    """Create ``path`` with ``size`` bytes reserved on disk."""
+    with open(path, "wb") as file:
+        if size and hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(file.fileno(), 0, size)
+                return
+            except OSError:
+                pass
+        file.truncate(size)
+
+
+def _seal(job: Job, key: bytes, source, target) -> None:
+    plan = job.plan
+    step = plan.chunk_size + TAG_SIZE
+    last = plan.chunks - 1
+    if job.first == 0:
+        target[:HEADER_SIZE] = plan.header
+    for counter in range(job.first, job.stop):
+        chunk = source[counter * plan.chunk_size:(counter + 1) * plan.chunk_size]
+        offset = HEADER_SIZE + counter * step
+        seal_chunk_into(plan.algorithm, key, plan.header, counter, counter == last, chunk,
+                        target[offset:offset + len(chunk) + TAG_SIZE])
+
+
+def _open(job: Job, key: bytes, source, target) -> None:
+    plan = job.plan
+    step = plan.chunk_size + TAG_SIZE
+    last = plan.chunks - 1
+    for counter in range(job.first, job.stop):
+        start = counter * plan.chunk_size
+        size = min(plan.chunk_size, plan.output_size - start)
+        offset = HEADER_SIZE + counter * step
+        open_chunk_into(plan.algorithm, key, plan.header, counter, counter == last,
+                        source[offset:offset + size + TAG_SIZE], target[start:start + size])
+
+
+def _digests(operation: str, source, target) -> tuple[str, str]:
+    """``(plaintext, ciphertext)`` SHA-256 of a source/target pair."""
+    source_hash = hashlib.sha256(source).hexdigest()
+    target_hash = hashlib.sha256(target).hexdigest()
+    return (source_hash, target_hash) if operation == "encrypt" else (target_hash, source_hash)
+
+
+def _transform(operation: str, key: bytes, job: Job, source, target) -> str:
+    """
+    Seal or open a job; the error message on failure. The exception is
+    dropped here, inside the mappings: its traceback pins the chunk views
+    and a mapping with live views cannot be closed.
+    """
+    try:
+        (_seal if operation == "encrypt" else _open)(job, key, source, target)
+    except (ValueError, CryptoServiceError) as exc:
+        return str(exc)
+    return ""
+
+
+def _run_job(operation: str, key: bytes, job: Job) -> JobResult:
+    started = time.perf_counter()
+    plan = job.plan
+    try:
+        with _mapped(plan.source, plan.size, writable=False) as source, \
+                _mapped(plan.target, plan.output_size, writable=True) as target:
+            error = _transform(operation, key, job, source, target)
+            digests = _digests(operation, source, target) if job.whole and not error else ("", "")
+    except (OSError, ValueError) as exc:
+        error, digests = str(exc), ("", "")
+    return JobResult(plan.index, time.perf_counter() - started, error, *digests)
+
+
+def run_task(operation: str, key: bytes, jobs: list[Job]) -> list[JobResult]:
+    """Worker entry point: process a batch of jobs."""
+    return [_run_job(operation, key, job) for job in jobs]
+
+
+def hash_task(operation: str, plans: list[FilePlan]) -> list[JobResult]:
+    """Worker entry point: digests of files that were processed in segments."""
+    results = []
+    for plan in plans:
+        started = time.perf_counter()
+        try:
+            with _mapped(plan.source, plan.size, writable=False) as source, \
+                    _mapped(plan.target, plan.output_size, writable=False) as target:
+                digests = _digests(operation, source, target)
+        except (OSError, ValueError) as exc:
+            results.append(JobResult(plan.index, time.perf_counter() - started, error=str(exc)))
+            continue
+        results.append(JobResult(plan.index, time.perf_counter() - started, "", *digests))
+    return results
+
+
+def _plan(index: int, path: Path, target: Path, operation: str, algorithm: str, chunk_size: int) -> FilePlan:
+    size = path.stat().st_size
+    if operation == "encrypt":
+        prefix = _generate_secure_random_bytes(NONCE_PREFIX_SIZE)
+        return FilePlan(index, str(path), str(target), size, encrypted_size(size, chunk_size), algorithm,
+                        chunk_size, make_header(algorithm, chunk_size, prefix))
+    with open(path, "rb") as file:
+        header = file.read(HEADER_SIZE)
+    algorithm, chunk_size, _ = parse_header(header)
+    return FilePlan(index, str(path), str(target), size, plaintext_size(size, chunk_size), algorithm,
+                    chunk_size, header)
+
+
+def _tasks(plans: list[FilePlan], segment_size: int) -> list[list[Job]]:
+    """Split large files into segments and pack small ones into batches."""
+    tasks, batch, batch_bytes = [], [], 0
+    for plan in plans:
+        if plan.size > segment_size:
+            per_segment = max(1, segment_size // plan.chunk_size)
+            for first in range(0, plan.chunks, per_segment):
+                tasks.append([Job(plan, first, min(first + per_segment, plan.chunks))])
+            continue
+        batch.append(Job(plan, 0, plan.chunks))
+        batch_bytes += plan.size
+        if batch_bytes >= segment_size or len(batch) >= BATCH_FILES:
+            tasks.append(batch)
+            batch, batch_bytes = [], 0
+    if batch:
+        tasks.append(batch)
+    return tasks
+
+
+def _execute(func: Callable, args: tuple, tasks: list) -> list[JobResult]:
+    """
+    Run ``func(*args, task)`` for every task on the shared pool; inline
+    when the pool is disabled, there is a single task, or a worker dies.
+    """
+    executor = worker_pool.get_executor() if len(tasks) > 1 else None
+    if executor is None:
+        return [result for task in tasks for result in func(*args, task)]
+
+    results, pending = [], {executor.submit(func, *args, task): task for task in tasks}
+    try:
+        for future in as_completed(list(pending)):
+            results.extend(future.result())
+            del pending[future]
+    except BrokenProcessPool:
+        worker_pool.shutdown(wait=False)
+        for task in pending.values():
+            results.extend(func(*args, task))
+    return results
+
+
+def run(operation: str, source: Path, target: Path, password: str, algorithm: str = "aes-gcm",
+        chunk_size: int = DEFAULT_CHUNK_SIZE, segment_size: int = DEFAULT_SEGMENT_SIZE) -> dict:
+    """
+    Encrypt or decrypt every file under ``source`` into the same relative
+    path under ``target`` and return the manifest. Files that fail leave no
+    output behind and are reported in the manifest instead.
+    """
+    if operation not in OPERATIONS:
+        raise CryptoServiceError(f"Неизвестная операция: {operation}")
+    started_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    started = time.perf_counter()
+    key = _derive_key(password, 32)
+
+    records, plans, directories = [], [], set()
+    for path in collect(source):
+        relative = path.relative_to(source)
+        output = relative.with_name(output_name(relative.name, operation))
+        record = FileRecord(path=relative.as_posix(), output=output.as_posix(), size=path.stat().st_size)
+        records.append(record)
+        try:
+            plan = _plan(len(records) - 1, path, target / output, operation, algorithm, chunk_size)
+            if output.parent not in directories:
+                (target / output.parent).mkdir(parents=True, exist_ok=True)
+                directories.add(output.parent)
+            _preallocate(target / output, plan.output_size)
+        except (OSError, CryptoServiceError) as exc:
+            record.status, record.error = "error", str(exc)
+            continue
+        record.output_size = plan.output_size
+        plans.append(plan)
+
+    tasks = _tasks(plans, segment_size)
+    for task in tasks:
+        for job in task:
+            records[job.plan.index].segments += 1
+    results = _execute(run_task, (operation, key), tasks)
+
+    segmented = {plan.index: plan for plan in plans if records[plan.index].segments > 1}
+    for result in results:
+        _apply(records[result.index], result)
+    hash_tasks = [[plan] for index, plan in segmented.items() if records[index].status == "ok"]
+    for result in _execute(hash_task, (operation,), hash_tasks):
+        _apply(records[result.index], result)
+
+    for plan in plans:
+        if records[plan.index].status != "ok":
+            Path(plan.target).unlink(missing_ok=True)
+
+    failed = sum(record.status != "ok" for record in records)
+    return {
+        "version": MANIFEST_VERSION,
+        "operation": operation,
+        "algorithm": algorithm if operation == "encrypt" else None,
+        "chunk_size": chunk_size if operation == "encrypt" else None,
+        "segment_size": segment_size,
+        "started_at": started_at,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+        "files_total": len(records),
+        "files_failed": failed,
+        "bytes_in": sum(record.size for record in records),
+        "bytes_out": sum(record.output_size for record in records if record.status == "ok"),
+        "files": [asdict(record) for record in records],
+    }
+
+
+def _apply(record: FileRecord, result: JobResult) -> None:
+    record.elapsed_ms = round(record.elapsed_ms + result.seconds * 1000, 3)
+    if result.error:
+        record.status = "error"
+        record.error = record.error or result.error
+    if result.sha256:
+        record.sha256, record.encrypted_sha256 = result.sha256, result.encrypted_sha256
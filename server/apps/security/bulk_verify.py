@@ -0,0 +1,171 @@
+"""
+Bulk RSA-PSS / ECDSA signature verification.
+
+Items are grouped by public key so each key is parsed and its verifier
+built once. Large groups are split into slices, and the slices are spread
+over the shared worker process pool, each carrying its public key once
+instead of once per item. The result is a validity bitmap plus errors for
+the items that could not be checked at all (bad key, malformed signature).
+"""
+from __future__ import annotations
+import hashlib
+import hmac
+from dataclasses import dataclass, field
+from typing import Callable
+from Crypto.Hash import SHA256, SHA512
+from . import worker_pool
+from .crypto_service import _b64_decode, _load_ecc_key, _load_rsa_key
+
+ALGORITHMS = ("rsa-pss", "ecdsa")
+HASH_ALGORITHMS = {
+    "SHA256": SHA256,
+    "SHA512": SHA512,
+}
+# Items per task sent to a worker: small enough to balance one big group
+# across workers, large enough to amortize the key transfer.
+SLICE_SIZE = 256
+
+
+@dataclass(frozen=True)
+class BulkVerifyResult:
+    count: int
+    bitmap: bytes
+    errors: dict[int, str] = field(default_factory=dict)
+
+    @property
+    def valid_count(self) -> int:
+        return sum(bin(byte).count("1") for byte in self.bitmap)
+
+    def is_valid(self, index: int) -> bool:
+        return bool(self.bitmap[index >> 3] & (0x80 >> (index & 7)))
+
+
+def _mgf1_sha256(seed: bytes, length: int) -> bytes:
+    blocks = (length + 31) // 32
+    return b"".join(
+        hashlib.sha256(seed + counter.to_bytes(4, "big")).digest()
+        for counter in range(blocks)
+    )[:length]
+
+
+def _rsa_pss_sha256_verifier(key) -> Callable[[bytes, bytes], bool]:
+    """
+    RSA-PSS (RFC 8017, 9.1.2) with SHA-256, MGF1-SHA-256 and a 32-byte salt,
+    the parameters pss.new() uses by default. Same checks as pycryptodome's
+    verifier, written against plain ints and hashlib: at bulk scale
+    pycryptodome spends most of a verification converting between its
+    Integer type and bytes.
+    """
+    n, e = int(key.n), int(key.e)
+    mod_bits = n.bit_length()
+    k = (mod_bits + 7) // 8
+    em_bits = mod_bits - 1
+    em_len = (em_bits + 7) // 8
+    h_len = s_len = 32
+    db_len = em_len - h_len - 1
+    free_bits = 8 * em_len - em_bits
+    ps_len = em_len - h_len - s_len - 2
+
+    def verify(message: bytes, signature: bytes) -> bool:
+        if len(signature) != k or ps_len < 0:
+            return False
+        s = int.from_bytes(signature, "big")
+        if s >= n:
+            return False
+        m = pow(s, e, n)
+        if m.bit_length() > 8 * em_len:
+            return False
+        em = m.to_bytes(em_len, "big")
+        if em[-1] != 0xBC:
+            return False
+        masked_db, digest = em[:db_len], em[db_len:-1]
+        if free_bits and masked_db[0] >> (8 - free_bits):
+            return False
+        db = (int.from_bytes(masked_db, "big") ^ int.from_bytes(_mgf1_sha256(digest, db_len), "big"))
+        db &= (1 << (8 * db_len - free_bits)) - 1
+        db = db.to_bytes(db_len, "big")
+        if db[:ps_len] != bytes(ps_len) or db[ps_len] != 0x01:
+            return False
+        salt = db[-s_len:]
+        expected = hashlib.sha256(bytes(8) + hashlib.sha256(message).digest() + salt).digest()
+        return hmac.compare_digest(expected, digest)
+
+    return verify
+
+
+def _verifier(algorithm: str, public_key_b64: str, hash_algorithm: str) -> Callable[[bytes, bytes], bool]:
+    if algorithm == "rsa-pss":
+        return _rsa_pss_sha256_verifier(_load_rsa_key(public_key_b64, "rsa-public").key)
+
+    scheme = _load_ecc_key(public_key_b64, "ecc-public").scheme
+    if scheme is None:
+        raise ValueError("Кривая не поддерживает подписи ECDSA")
+    hash_module = HASH_ALGORITHMS[hash_algorithm]
+
+    def verify(message: bytes, signature: bytes) -> bool:
+        try:
+            scheme.verify(hash_module.new(message), signature)
+            return True
+        except (ValueError, TypeError):
+            return False
+
+    return verify
+
+
+def verify_slice(task: tuple) -> list[tuple[int, bool, str | None]]:
+    """
+    Worker entry point: verify ``(index, message, signature_b64)`` items
+    against one public key. Returns ``(index, valid, error)`` per item.
+    """
+    algorithm, hash_algorithm, public_key_b64, items = task
+    try:
+        verify = _verifier(algorithm, public_key_b64, hash_algorithm)
+    except Exception:
+        error = "Некорректный открытый ключ"
+        return [(index, False, error) for index, _, _ in items]
+
+    results = []
+    for index, message, signature_b64 in items:
+        try:
+            signature = _b64_decode(signature_b64)
+        except Exception:
+            results.append((index, False, "Подпись не является корректным Base64"))
+            continue
+        results.append((index, verify(message.encode("utf-8"), signature), None))
+    return results
+
+
+def bulk_verify(
+    algorithm: str,
+    items: list[tuple[str, str, str] | None],
+    hash_algorithm: str = "SHA256",
+    errors: dict[int, str] | None = None,
+) -> BulkVerifyResult:
+    """
+    Verify ``(message, signature_b64, public_key_b64)`` triples. ``None``
+    entries are skipped (counted as invalid); their reasons can be passed
+    in ``errors`` so they end up in the result.
+    """
+    errors = dict(errors or {})
+    groups: dict[str, list[tuple[int, str, str]]] = {}
+    for index, item in enumerate(items):
+        if item is None:
+            continue
+        message, signature_b64, public_key_b64 = item
+        groups.setdefault(public_key_b64, []).append((index, message, signature_b64))
+
+    tasks = [
+        (algorithm, hash_algorithm, public_key_b64, group[start:start + SLICE_SIZE])
+        for public_key_b64, group in groups.items()
+        for start in range(0, len(group), SLICE_SIZE)
+    ]
+
+    bitmap = bytearray((len(items) + 7) // 8)
+    for results in worker_pool.map_ordered(verify_slice, tasks):
+        for index, valid, error in results:
+            if valid:
+                bitmap[index >> 3] |= 0x80 >> (index & 7)
+            elif error is not None:
+                errors[index] = error
+
+    return BulkVerifyResult(count=len(items), bitmap=bytes(bitmap), errors=errors)
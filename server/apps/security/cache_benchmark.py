@@ -0,0 +1,114 @@
+"""
+Throughput of cache backends under concurrent worker processes.
+
+Every process runs the cache-aside pattern of the views: ``get`` a random
+key out of a fixed key space and ``set`` it on a miss, plus a share of
+unconditional writes. All processes start at the same moment, so they
+contend for the backend the way gunicorn workers on one node do. A
+per-process backend such as locmem pays for that with its hit rate: every
+worker has to fill its own copy.
+"""
+from __future__ import annotations
+import multiprocessing
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from django.utils.module_loading import import_string
+
+BACKENDS = {
+    "shared": "apps.security.shared_cache.SharedMemoryCache",
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+}
+# Latency is sampled on every n-th operation.
+LATENCY_SAMPLE_EVERY = 16
+# Time for the pool to spawn its workers before they all start, per worker.
+START_DELAY = 0.5
+
+
+@dataclass(frozen=True)
+class Workload:
+    operations: int = 20_000
+    keys: int = 2_000
+    value_size: int = 1024
+    write_ratio: float = 0.05
+
+
+@dataclass(frozen=True)
+class CacheBenchmarkResult:
+    backend: str
+    processes: int
+    operations: int
+    ops_per_second: float
+    hit_rate: float
+    p50_us: float
+    p99_us: float
+
+
+def _backend(name: str, location: str):
+    params = {"TIMEOUT": 3600, "OPTIONS": {"MAX_ENTRIES": 1_000_000}}
+    if name == "shared":
+        params["OPTIONS"] = {"SIZE": 64 * 1024 * 1024}
+    return import_string(BACKENDS[name])(location, params)
+
+
+def _worker(name: str, location: str, workload: Workload, seed: int, start_at: float) -> tuple:
+    cache = _backend(name, location)
+    generator = random.Random(seed)
+    value = os.urandom(workload.value_size)
+    keys = [f"bench:{index}" for index in range(workload.keys)]
+    hits = misses = 0
+    latencies = []
+
+    time.sleep(max(0.0, start_at - time.time()))
+    started = time.time()
+    for operation in range(workload.operations):
+        key = generator.choice(keys)
+        measured = operation % LATENCY_SAMPLE_EVERY == 0
+        begin = time.perf_counter() if measured else 0.0
+        if generator.random() < workload.write_ratio:
+            cache.set(key, value)
+        elif cache.get(key) is None:
+            misses += 1
+            cache.set(key, value)
+        else:
+            hits += 1
+        if measured:
+            latencies.append(time.perf_counter() - begin)
+    return started, time.time(), hits, misses, latencies
+
+
+def run(name: str, processes: int, workload: Workload) -> CacheBenchmarkResult:
+    workdir = tempfile.mkdtemp(prefix="cache-benchmark-")
+    location = {"shared": os.path.join(workdir, "shared-cache"), "file": workdir}.get(name, "cache-benchmark")
+    try:
+        start_at = time.time() + START_DELAY * (processes + 1)
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=processes, mp_context=context) as executor:
+            futures = [
+                executor.submit(_worker, name, location, workload, seed, start_at)
+                for seed in range(processes)
+            ]
+            outcomes = [future.result() for future in futures]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    wall = max(outcome[1] for outcome in outcomes) - min(outcome[0] for outcome in outcomes)
+    hits = sum(outcome[2] for outcome in outcomes)
+    misses = sum(outcome[3] for outcome in outcomes)
+    latencies = sorted(latency for outcome in outcomes for latency in outcome[4])
+    total = workload.operations * processes
+    return CacheBenchmarkResult(
+        backend=name,
+        processes=processes,
+        operations=total,
+        ops_per_second=round(total / wall, 1) if wall else 0.0,
+        hit_rate=round(hits / (hits + misses), 4) if hits + misses else 0.0,
+        p50_us=round(statistics.median(latencies) * 1e6, 1),
+        p99_us=round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1e6, 1),
+    )
@@ -0,0 +1,102 @@
+"""
+Classical (educational) ciphers over Latin and Cyrillic text.
+
+The per-shift translation tables are built once and cached. ASCII text
+goes through ``bytes.translate``. Large mixed-alphabet text is mapped as
+a UTF-16 code-unit array with a NumPy lookup table. Everything else uses
+``str.translate``. The streaming variants shift input that arrives in
+chunks, such as an uploaded file, one chunk at a time.
+"""
+from __future__ import annotations
+import codecs
+from functools import lru_cache
+from typing import Iterable, Iterator
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# (first code point, last code point, alphabet size) of the shifted ranges.
+_CAESAR_RANGES = (
+    (65, 90, 26),
+    (97, 122, 26),
+    (1040, 1071, 33),
+    (1072, 1103, 33),
+)
+
+# Below this length the NumPy round trip costs more than str.translate.
+_NUMPY_MIN_CHARS = 1 << 16
+# Code units mapped per NumPy gather; keeps the working set cache-sized.
+_NUMPY_CHUNK = 1 << 16
+
+
+@lru_cache(maxsize=64)
+def _caesar_mapping(shift: int) -> dict[int, int]:
+    mapping = {}
+    for start, end, alphabet in _CAESAR_RANGES:
+        for code in range(start, end + 1):
+            mapping[code] = ((code - start + shift) % alphabet) + start
+    return mapping
+
+
+@lru_cache(maxsize=64)
+def _caesar_ascii_table(shift: int) -> bytes:
+    mapping = _caesar_mapping(shift)
+    return bytes(mapping.get(code, code) for code in range(256))
+
+
+@lru_cache(maxsize=64)
+def _caesar_utf16_table(shift: int):
+    table = np.arange(1 << 16, dtype=np.uint16)
+    for code, shifted in _caesar_mapping(shift).items():
+        table[code] = shifted
+    table.flags.writeable = False
+    return table
+
+
+def _shift_utf16(text: str, shift: int) -> str:
+    table = _caesar_utf16_table(shift)
+    buffer = bytearray(text.encode("utf-16-le", "surrogatepass"))
+    units = np.frombuffer(buffer, dtype="<u2")
+    for offset in range(0, len(units), _NUMPY_CHUNK):
+        chunk = units[offset:offset + _NUMPY_CHUNK]
+        chunk[...] = table[chunk]
+    return buffer.decode("utf-16-le", "surrogatepass")
+
+
+def caesar_shift(text: str, shift: int) -> str:
+    """Shift Latin and Cyrillic letters of ``text`` by ``shift`` positions."""
+    if text.isascii():
+        return text.encode("ascii").translate(_caesar_ascii_table(shift)).decode("ascii")
+    if NUMPY_AVAILABLE and len(text) >= _NUMPY_MIN_CHARS:
+        return _shift_utf16(text, shift)
+    return text.translate(_caesar_mapping(shift))
+
+
+def caesar_shift_stream(chunks: Iterable[str], shift: int) -> Iterator[str]:
+    """
+    Streaming variant of ``caesar_shift``. The cipher maps characters one
+    to one, so chunks can be split anywhere.
+    """
+    for chunk in chunks:
+        yield caesar_shift(chunk, shift)
+
+
+def _utf8_pieces(chunks: Iterable[bytes]) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for chunk in chunks:
+        yield decoder.decode(chunk)
+    # Always yields a last, possibly empty, piece; raises on a truncated character.
+    yield decoder.decode(b"", final=True)
+
+
+def caesar_shift_utf8_stream(chunks: Iterable[bytes], shift: int) -> Iterator[bytes]:
+    """
+    ``caesar_shift_stream`` over UTF-8 bytes. A character split between two
+    chunks is carried over to the next one; invalid UTF-8 raises
+    ``UnicodeDecodeError``.
+    """
+    for text in caesar_shift_stream(_utf8_pieces(chunks), shift):
+        yield text.encode("utf-8")
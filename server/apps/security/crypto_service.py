@@ -1,7 +1,9 @@
 from __future__ import annotations
 import base64
+import binascii
 import os
 import hashlib
+import hmac
 import json
 from dataclasses import dataclass
 from typing import Callable
@@ -10,6 +12,26 @@ from Crypto.Hash import SHA256, SHA512
 from Crypto.PublicKey import RSA, ECC
 from Crypto.Signature import pss, DSS
 from Crypto.Util.Padding import pad, unpad
+from . import aead, parallel_cipher, twofish
+from .aead import aead_selector
+from .classical import caesar_shift
+from .argon2_calibration import argon2_calibrator
+from .argon2_executor import ExecutorBusy, argon2_executor
+from .registry import (
+    BINARY,
+    HASH,
+    KEY_DEFAULT,
+    KEY_NONE,
+    KEY_REQUIRED,
+    KEYGEN,
+    SIGN,
+    TEXT,
+    AlgorithmRegistry,
+    AlgorithmSpec,
+    Handler,
+    ParamSpec,
+)
+from .key_cache import ParsedKey, _cache_settings, cache_key, derived_key_cache, key_object_cache
 
 class CryptoServiceError(Exception):
     """Raised when we cannot complete the requested crypto operation."""
@@ -23,6 +45,13 @@ class ECCSignatureError(CryptoServiceError):
 class HashingError(CryptoServiceError):
     """Raised when hashing operations fail."""
 
+class Argon2BusyError(HashingError):
+    """Raised when the Argon2 executor cannot accept more work right now."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
 try:
     import argon2
     ARGON2_AVAILABLE = True
@@ -42,6 +71,69 @@ def _derive_bytes(source: str, length: int) -> bytes:
     return digest[:length]
 
 
+def _derive_key(source: str, length: int) -> bytes:
+    """
+    Memoized ``_derive_bytes``. The cache keeps its own mutable copy (wiped
+    on eviction) and every caller gets an independent ``bytes`` object.
+    """
+    material = derived_key_cache.get_or_create(
+        cache_key("derive", str(length), source),
+        lambda: bytearray(_derive_bytes(source, length)),
+    )
+    return bytes(material)
+
+
+# Below this size a CBC encryption chained by hand over the cached ECB key
+# schedule is cheaper than running Blowfish's key setup again.
+_BLOWFISH_CACHED_SCHEDULE_MAX_BYTES = 128
+
+# Twofish output starts with magic + mode, so decryption needs no params and
+# never mistakes it for the headerless AES-CBC of earlier versions.
+_TWOFISH_CBC_HEADER = b"TF\x01\x01"
+_TWOFISH_CTR_HEADER = b"TF\x01\x02"
+
+
+def _blowfish_schedule(source: str):
+    """Blowfish ECB object for the derived key; ECB objects are stateless."""
+    return derived_key_cache.get_or_create(
+        cache_key("blowfish-ecb", source),
+        lambda: Blowfish.new(_derive_bytes(source, 56), Blowfish.MODE_ECB),
+    )
+
+
+def _blowfish_cbc_encrypt(source: str, iv: bytes, data: bytes) -> bytes:
+    block_size = Blowfish.block_size
+    if not derived_key_cache.enabled or len(data) > _BLOWFISH_CACHED_SCHEDULE_MAX_BYTES:
+        cipher = Blowfish.new(_derive_key(source, 56), Blowfish.MODE_CBC, iv=iv)
+        return cipher.encrypt(data)
+
+    ecb = _blowfish_schedule(source)
+    output = bytearray(len(data))
+    previous = int.from_bytes(iv, "big")
+    for offset in range(0, len(data), block_size):
+        block = int.from_bytes(data[offset:offset + block_size], "big") ^ previous
+        encrypted = ecb.encrypt(block.to_bytes(block_size, "big"))
+        output[offset:offset + block_size] = encrypted
+        previous = int.from_bytes(encrypted, "big")
+    return bytes(output)
+
+
+def _blowfish_cbc_decrypt(source: str, iv: bytes, data: bytes) -> bytes:
+    # CBC decryption has no chaining dependency: decrypt every block in one
+    # ECB call, then XOR with the previous ciphertext blocks in one go.
+    if not derived_key_cache.enabled:
+        cipher = Blowfish.new(_derive_key(source, 56), Blowfish.MODE_CBC, iv=iv)
+        return cipher.decrypt(data)
+    if len(iv) != Blowfish.block_size:
+        raise ValueError("Incorrect IV length (it must be 8 bytes long)")
+    if len(data) % Blowfish.block_size:
+        raise ValueError("Data must be padded to 8 byte boundary in CBC mode")
+    decrypted = _blowfish_schedule(source).decrypt(data)
+    chain = (iv + data)[:len(data)]
+    plain = int.from_bytes(decrypted, "big") ^ int.from_bytes(chain, "big")
+    return plain.to_bytes(len(data), "big")
+
+
 def _b64_encode(data: bytes) -> str:
     return base64.b64encode(data).decode("utf-8")
 
@@ -56,6 +148,29 @@ def _generate_secure_random_bytes(length: int) -> bytes:
     return os.urandom(length)
 
 
+def _load_rsa_key(key_b64: str, namespace: str) -> ParsedKey:
+    """Parse a Base64 DER RSA key, reusing the cached key and PSS scheme."""
+    def _parse() -> ParsedKey:
+        key = RSA.import_key(_b64_decode(key_b64))
+        return ParsedKey(key=key, scheme=pss.new(key))
+
+    return key_object_cache.get_or_create(cache_key(namespace, key_b64), _parse)
+
+
+def _load_ecc_key(key_b64: str, namespace: str) -> ParsedKey:
+    """Parse a Base64 PEM ECC key, reusing the cached key and DSS scheme."""
+    def _parse() -> ParsedKey:
+        key = ECC.import_key(_b64_decode(key_b64).decode('utf-8'))
+        try:
+            scheme = DSS.new(key, 'fips-186-3')
+        except ValueError:
+            # Edwards curves have no DSS scheme but still work for ECDH.
+            scheme = None
+        return ParsedKey(key=key, scheme=scheme)
+
+    return key_object_cache.get_or_create(cache_key(namespace, key_b64), _parse)
+
+
 # ---------------------------------------------------------------------------
 # RSA helpers (digital signatures)
 # ---------------------------------------------------------------------------
@@ -92,14 +207,12 @@ def sign_message_rsa_pss(message: str, private_key_b64: str) -> str:
     Create RSA-PSS signature over the provided message.
     """
     try:
-        private_der = _b64_decode(private_key_b64)
-        private_key = RSA.import_key(private_der)
+        signer = _load_rsa_key(private_key_b64, "rsa-private").scheme
     except Exception as exc:
         raise RSASignatureError("Некорректный приватный ключ RSA") from exc
 
     try:
         digest = SHA256.new(message.encode("utf-8"))
-        signer = pss.new(private_key)
         signature = signer.sign(digest)
     except Exception as exc:
         raise RSASignatureError("Не удалось создать цифровую подпись") from exc
@@ -112,15 +225,13 @@ def verify_message_rsa_pss(message: str, signature_b64: str, public_key_b64: str
     Verify RSA-PSS signature for the given message.
     """
     try:
-        public_der = _b64_decode(public_key_b64)
-        public_key = RSA.import_key(public_der)
+        verifier = _load_rsa_key(public_key_b64, "rsa-public").scheme
     except Exception as exc:
         raise RSASignatureError("Некорректный открытый ключ RSA") from exc
 
     try:
         signature = _b64_decode(signature_b64)
         digest = SHA256.new(message.encode("utf-8"))
-        verifier = pss.new(public_key)
         verifier.verify(digest, signature)
         return True
     except (ValueError, TypeError):
@@ -157,29 +268,70 @@ def hash_sha512(data: str) -> str:
     except Exception as exc:
         raise HashingError(f"Ошибка при вычислении SHA-512: {str(exc)}")
 
-def hash_argon2(data: str, time_cost: int = 2, memory_cost: int = 512, 
-               parallelism: int = 2, hash_len: int = 32) -> dict:
+def check_argon2_params(time_cost: int, memory_cost: int, parallelism: int, hash_len: int = 32) -> None:
+    """Reject Argon2 parameters above the ceilings from CRYPTO_ARGON2."""
+    limits = _cache_settings("CRYPTO_ARGON2")
+    ceilings = (
+        ("time_cost", time_cost, limits.get("MAX_TIME_COST", 10)),
+        ("memory_cost", memory_cost, limits.get("MAX_MEMORY_COST", 256 * 1024)),
+        ("parallelism", parallelism, limits.get("MAX_PARALLELISM", 8)),
+        ("hash_len", hash_len, limits.get("MAX_HASH_LEN", 64)),
+    )
+    for name, value, ceiling in ceilings:
+        if value > ceiling:
+            raise HashingError(f"Параметр Argon2 {name} не может превышать {ceiling}")
+
+
+def _run_argon2(memory_cost: int, func: Callable, *args):
+    """Run an Argon2 call on the bounded executor."""
+    try:
+        return argon2_executor.run(memory_cost, func, *args)
+    except ExecutorBusy as exc:
+        raise Argon2BusyError(f"Сервер перегружен вычислениями Argon2: {exc}", exc.retry_after) from exc
+
+
+def _argon2_hash_now(data: str, time_cost: int, memory_cost: int, parallelism: int, hash_len: int) -> str:
+    hasher = argon2.PasswordHasher(
+        time_cost=time_cost,
+        memory_cost=memory_cost,
+        parallelism=parallelism,
+        hash_len=hash_len,
+        type=argon2.Type.ID
+    )
+    return hasher.hash(data)
+
+
+def _argon2_verify_now(data: str, hash_value: str) -> bool:
+    try:
+        return argon2.PasswordHasher().verify(hash_value, data)
+    except argon2.exceptions.VerifyMismatchError:
+        return False
+
+
+def hash_argon2(data: str, time_cost: int | None = None, memory_cost: int | None = None,
+               parallelism: int | None = None, hash_len: int | None = None) -> dict:
     """
     Compute Argon2 hash of the input data.
-    Returns a simplified dictionary with only hash.
+    Returns a simplified dictionary with only hash. Parameters left out
+    come from the profile calibrated for this host.
     """
     if not ARGON2_AVAILABLE:
         raise HashingError("Argon2 не доступен. Установите argon2-cffi: pip install argon2-cffi")
+    defaults = argon2_calibrator.parameters()
+    time_cost = defaults.time_cost if time_cost is None else time_cost
+    memory_cost = defaults.memory_cost if memory_cost is None else memory_cost
+    parallelism = defaults.parallelism if parallelism is None else parallelism
+    hash_len = defaults.hash_len if hash_len is None else hash_len
+    check_argon2_params(time_cost, memory_cost, parallelism, hash_len)
     
     try:
-        hasher = argon2.PasswordHasher(
-            time_cost=time_cost,
-            memory_cost=memory_cost,
-            parallelism=parallelism,
-            hash_len=hash_len,
-            type=argon2.Type.ID
-        )
-        
-        hash_result = hasher.hash(data)
+        hash_result = _run_argon2(memory_cost, _argon2_hash_now, data, time_cost, memory_cost, parallelism, hash_len)
         
         return {
             "hash": hash_result
         }
+    except Argon2BusyError:
+        raise
     except Exception as exc:
         raise HashingError(f"Ошибка при вычислении Argon2: {str(exc)}")
 
@@ -189,10 +341,13 @@ def verify_argon2(data: str, hash_value: str) -> bool:
         raise HashingError("Argon2 не доступен. Установите argon2-cffi: pip install argon2-cffi")
     
     try:
-        hasher = argon2.PasswordHasher()
-        return hasher.verify(hash_value, data)
-    except argon2.exceptions.VerifyMismatchError:
-        return False
+        # The cost parameters come from the hash itself, so they are
+        # checked against the same ceilings as new hashes.
+        parameters = argon2.extract_parameters(hash_value)
+        check_argon2_params(parameters.time_cost, parameters.memory_cost, parameters.parallelism, parameters.hash_len)
+        return _run_argon2(parameters.memory_cost, _argon2_verify_now, data, hash_value)
+    except HashingError:
+        raise
     except Exception as exc:
         raise HashingError(f"Ошибка при проверке Argon2: {str(exc)}")
 
@@ -232,8 +387,7 @@ def sign_message_ecc(message: str, private_key_b64: str, hash_algorithm: str = "
     Create ECDSA signature over the provided message.
     """
     try:
-        private_pem = _b64_decode(private_key_b64).decode('utf-8')
-        private_key = ECC.import_key(private_pem)
+        signer = _load_ecc_key(private_key_b64, "ecc-private").scheme
     except Exception as exc:
         raise ECCSignatureError("Некорректный приватный ключ ECC") from exc
 
@@ -245,7 +399,8 @@ def sign_message_ecc(message: str, private_key_b64: str, hash_algorithm: str = "
         else:
             raise ValueError(f"Неподдерживаемый хэш-алгоритм: {hash_algorithm}")
         
-        signer = DSS.new(private_key, 'fips-186-3')
+        if signer is None:
+            raise ValueError("Кривая не поддерживает подписи ECDSA")
         signature = signer.sign(hash_obj)
         return _b64_encode(signature)
     except Exception as exc:
@@ -257,8 +412,7 @@ def verify_message_ecc(message: str, signature_b64: str, public_key_b64: str,
     Verify ECDSA signature for the given message.
     """
     try:
-        public_pem = _b64_decode(public_key_b64).decode('utf-8')
-        public_key = ECC.import_key(public_pem)
+        verifier = _load_ecc_key(public_key_b64, "ecc-public").scheme
     except Exception as exc:
         raise ECCSignatureError("Некорректный открытый ключ ECC") from exc
 
@@ -272,7 +426,8 @@ def verify_message_ecc(message: str, signature_b64: str, public_key_b64: str,
         else:
             raise ValueError(f"Неподдерживаемый хэш-алгоритм: {hash_algorithm}")
         
-        verifier = DSS.new(public_key, 'fips-186-3')
+        if verifier is None:
+            raise ValueError("Кривая не поддерживает подписи ECDSA")
         verifier.verify(hash_obj, signature)
         return True
     except (ValueError, TypeError):
@@ -286,8 +441,7 @@ def encrypt_ecc(message: str, public_key_b64: str) -> dict:
     Returns a simple JSON object, not a string.
     """
     try:
-        public_pem = _b64_decode(public_key_b64).decode('utf-8')
-        recipient_key = ECC.import_key(public_pem)
+        recipient_key = _load_ecc_key(public_key_b64, "ecc-public").key
         
         curve_name = recipient_key.curve
         
@@ -323,8 +477,7 @@ def decrypt_ecc(encrypted_data: dict, private_key_b64: str) -> str:
         else:
             data = encrypted_data
         
-        private_pem = _b64_decode(private_key_b64).decode('utf-8')
-        private_key = ECC.import_key(private_pem)
+        private_key = _load_ecc_key(private_key_b64, "ecc-private").key
         
         ephemeral_pubkey_pem = _b64_decode(data["ephemeral_pubkey"]).decode('utf-8')
         ephemeral_pubkey = ECC.import_key(ephemeral_pubkey_pem)
@@ -350,6 +503,147 @@ def decrypt_ecc(encrypted_data: dict, private_key_b64: str) -> str:
     except Exception as exc:
         raise CryptoServiceError(f"Ошибка при расшифровании ECC: {str(exc)}") from exc
 
+# Compact binary envelope:
+#   version (1) | SEC1-compressed ephemeral point | nonce (12) | tag (16) | ciphertext
+# The AES key is HKDF-SHA256 over the big-endian x coordinate of the shared
+# point; version byte and ephemeral point are bound as GCM associated data.
+ECC_ENVELOPE_VERSION = 1
+_ECC_NONCE_SIZE = 12
+_ECC_TAG_SIZE = 16
+
+
+@dataclass(frozen=True)
+class ECDHEphemeral:
+    """Ephemeral scalar with its public point already encoded (SEC1, compressed)."""
+    curve: str
+    d: int
+    point: bytes
+
+
+def generate_ecdh_ephemeral(curve: str = "P-256") -> ECDHEphemeral:
+    """
+    Generate an ephemeral ECDH key. Plain ints and bytes keep it cheap to
+    pickle, so the key pool can pre-generate these in worker processes.
+    """
+    key = ECC.generate(curve=curve)
+    return ECDHEphemeral(
+        curve=curve,
+        d=int(key.d),
+        point=key.public_key().export_key(format="SEC1", compress=True),
+    )
+
+
+def _weierstrass_curve(key):
+    curve = ECC._curves[key.curve]
+    if not curve.is_weierstrass:
+        raise CryptoServiceError(f"Компактный формат ECC не поддерживает кривую {key.curve}")
+    return curve
+
+
+def _sqrt_mod(a: int, p: int) -> int:
+    """
+    A square root of ``a`` modulo the prime ``p``, or a wrong value when
+    there is none (the caller checks the point). For p = 3 (mod 4), as on
+    P-192/256/384/521, it is a single pow(); P-224 has p = 1 (mod 4) and
+    goes through Tonelli-Shanks.
+    """
+    if p % 4 == 3:
+        return pow(a, (p + 1) // 4, p)
+    # p - 1 = q * 2**s with q odd.
+    q, s = p - 1, 0
+    while q % 2 == 0:
+        q, s = q // 2, s + 1
+    z = 2
+    while pow(z, (p - 1) // 2, p) != p - 1:
+        z += 1
+    m, c, t, r = s, pow(z, q, p), pow(a, q, p), pow(a, (q + 1) // 2, p)
+    while t not in (0, 1):
+        i, t2 = 0, t
+        while t2 != 1:
+            t2, i = t2 * t2 % p, i + 1
+            if i == m:
+                return r
+        b = pow(c, 1 << (m - i - 1), p)
+        m, c, t, r = i, b * b % p, t * b * b % p, r * b % p
+    return 0 if t == 0 else r
+
+
+def _decompress_point(data: bytes, key):
+    """Decode a SEC1-compressed point on the curve of ``key``."""
+    curve = _weierstrass_curve(key)
+    size = (curve.modulus_bits + 7) // 8
+    if len(data) != size + 1 or data[0] not in (2, 3):
+        raise CryptoServiceError("Некорректная точка эфемерного ключа")
+    p = int(curve.p)
+    x = int.from_bytes(data[1:], "big")
+    y = _sqrt_mod((x * x * x - 3 * x + int(curve.b)) % p, p)
+    if y & 1 != data[0] & 1:
+        y = p - y
+    # EccPoint checks that (x, y) is on the curve, which also rejects an x
+    # without a square root.
+    return ECC.EccPoint(x, y, key.curve)
+
+
+def _envelope_key(shared_point, header: bytes) -> bytes:
+    # HKDF-SHA256 (RFC 5869) with an empty salt, expanded to one block.
+    # Written out with hmac.digest: Crypto.Protocol.KDF.HKDF gives the same
+    # bytes but costs far more per call through its Python HMAC objects.
+    size = shared_point.size_in_bytes()
+    prk = hmac.digest(bytes(32), int(shared_point.x).to_bytes(size, "big"), "sha256")
+    return hmac.digest(prk, header + b"\x01", "sha256")
+
+
+def _ecdh_ephemeral(curve: str) -> ECDHEphemeral:
+    from .key_pool import key_pool
+    return key_pool.acquire("ecdh", curve)
+
+
+def encrypt_ecc_compact(message: bytes, public_key_b64: str) -> bytes:
+    """Encrypt ``message`` for an ECC public key into the compact envelope."""
+    try:
+        recipient_key = _load_ecc_key(public_key_b64, "ecc-public").key
+        curve = _weierstrass_curve(recipient_key)
+        ephemeral = _ecdh_ephemeral(curve.canonical.replace("NIST ", ""))
+        header = bytes([ECC_ENVELOPE_VERSION]) + ephemeral.point
+        shared_key = _envelope_key(ephemeral.d * recipient_key.pointQ, header)
+
+        nonce = _generate_secure_random_bytes(_ECC_NONCE_SIZE)
+        cipher = AES.new(shared_key, AES.MODE_GCM, nonce=nonce, mac_len=_ECC_TAG_SIZE)
+        cipher.update(header)
+        ciphertext, tag = cipher.encrypt_and_digest(message)
+        return b"".join((header, nonce, tag, ciphertext))
+    except CryptoServiceError:
+        raise
+    except Exception as exc:
+        raise CryptoServiceError(f"Ошибка при шифровании ECC: {str(exc)}") from exc
+
+
+def decrypt_ecc_compact(envelope: bytes, private_key_b64: str) -> bytes:
+    """Decrypt a compact envelope produced by ``encrypt_ecc_compact``."""
+    try:
+        private_key = _load_ecc_key(private_key_b64, "ecc-private").key
+        curve = _weierstrass_curve(private_key)
+        point_size = (curve.modulus_bits + 7) // 8 + 1
+        body = 1 + point_size
+        if len(envelope) < body + _ECC_NONCE_SIZE + _ECC_TAG_SIZE:
+            raise CryptoServiceError("Слишком короткий конверт ECC")
+        if envelope[0] != ECC_ENVELOPE_VERSION:
+            raise CryptoServiceError(f"Неизвестная версия конверта ECC: {envelope[0]}")
+
+        header = bytes(envelope[:body])
+        ephemeral_point = _decompress_point(header[1:], private_key)
+        shared_key = _envelope_key(private_key.d * ephemeral_point, header)
+
+        nonce = envelope[body:body + _ECC_NONCE_SIZE]
+        tag = envelope[body + _ECC_NONCE_SIZE:body + _ECC_NONCE_SIZE + _ECC_TAG_SIZE]
+        cipher = AES.new(shared_key, AES.MODE_GCM, nonce=nonce, mac_len=_ECC_TAG_SIZE)
+        cipher.update(header)
+        return cipher.decrypt_and_verify(envelope[body + _ECC_NONCE_SIZE + _ECC_TAG_SIZE:], tag)
+    except CryptoServiceError:
+        raise
+    except Exception as exc:
+        raise CryptoServiceError(f"Ошибка при расшифровании ECC: {str(exc)}") from exc
+
 @dataclass(frozen=True)
 class CryptoEngine:
     """
@@ -361,47 +655,47 @@ class CryptoEngine:
     operation: str = "encrypt"
     params: dict = None
 
+    @property
+    def spec(self) -> AlgorithmSpec:
+        spec = ALGORITHM_REGISTRY.get(self.algorithm)
+        if spec is None:
+            raise CryptoServiceError(f"Неподдерживаемый алгоритм: {self.algorithm}")
+        return spec
+
     def _require_key(self) -> str:
-        if self.algorithm in {"base64", "sha256", "argon2"}:
+        spec = self.spec
+        if spec.key_policy == KEY_NONE:
             return ""
-        if self.algorithm == "caesar":
-            return self.key or "3"
+        if spec.key_policy == KEY_DEFAULT:
+            return self.key or spec.default_key
         if not self.key:
             raise CryptoServiceError("Необходим ключ для выбранного алгоритма")
         return self.key
 
+    def _key_bytes(self) -> bytes:
+        """Symmetric key derived to the length the algorithm's spec asks for."""
+        return _derive_key(self._require_key(), self.spec.key_length)
+
     def process(self, payload: str = "") -> dict:
         """Основной метод для обработки всех операций."""
         try:
-            if self.algorithm in ["sha256", "sha512", "argon2"] and self.operation == "verify":
-                if self.params and "hash" in self.params:
-                    return self._verify_hash(payload, self.params["hash"])
-                else:
-                    raise CryptoServiceError("Для проверки хэша необходимо передать hash в параметрах")
-            
-            if self.algorithm in ["sha256", "sha512", "argon2"]:
-                if self.operation == "hash":
-                    return self._hash(payload)
-                else:
-                    raise CryptoServiceError(f"Неподдерживаемая операция '{self.operation}' для алгоритма {self.algorithm}")
-            
-            elif self.algorithm in ["ecc", "rsa"] and self.operation == "generate_keypair":
-                return self._generate_keypair()
-            
-            elif self.algorithm == "ecc" and self.operation in ["sign", "verify"]:
-                return self._ecc_operation(payload)
-            
-            elif self.algorithm == "ecc" and self.operation in ["encrypt", "decrypt"]:
-                return self._ecc_crypto(payload)
-            
-            elif self.is_binary:
-                return {"result": self._dispatch_binary(self.operation)(payload)}
-            else:
-                return {"result": self._dispatch(self.operation)(payload)}
-                
+            handler = ALGORITHM_REGISTRY.dispatch.get((self.algorithm, self.operation, self.is_binary))
+            if handler is None:
+                raise CryptoServiceError(self._unsupported())
+            return handler(self, payload)
+        except Argon2BusyError:
+            raise
         except Exception as exc:
             raise CryptoServiceError(str(exc))
 
+    def _unsupported(self) -> str:
+        errors, _ = ALGORITHM_REGISTRY.validate_request(
+            self.algorithm, self.operation, self.key, self.is_binary, None,
+        )
+        if errors:
+            return errors[0]
+        return f"Неподдерживаемая операция '{self.operation}' для алгоритма {self.algorithm}"
+
     def _hash(self, payload: str) -> dict:
         """Обработка хэширования."""
         if self.algorithm == "sha256":
@@ -415,14 +709,19 @@ class CryptoEngine:
             params = self.params or {}
             result = hash_argon2(
                 payload,
-                time_cost=params.get("time_cost", 2),
-                memory_cost=params.get("memory_cost", 512),
-                parallelism=params.get("parallelism", 2),
-                hash_len=params.get("hash_len", 32)
+                time_cost=params.get("time_cost"),
+                memory_cost=params.get("memory_cost"),
+                parallelism=params.get("parallelism"),
+                hash_len=params.get("hash_len")
             )
             return {"hash": result["hash"]}
         raise CryptoServiceError(f"Неподдерживаемый алгоритм хэширования: {self.algorithm}")
 
+    def _verify_hash_request(self, payload: str) -> dict:
+        if self.params and "hash" in self.params:
+            return self._verify_hash(payload, self.params["hash"])
+        raise CryptoServiceError("Для проверки хэша необходимо передать hash в параметрах")
+
     def _verify_hash(self, payload: str, hash_value: str) -> dict:
         """Проверка хэша для SHA-256, SHA-512 и Argon2."""
         try:
@@ -438,18 +737,13 @@ class CryptoEngine:
                 if not ARGON2_AVAILABLE:
                     raise HashingError("Argon2 не доступен. Установите argon2-cffi: pip install argon2-cffi")
                 
-                try:
-                    hasher = argon2.PasswordHasher()
-                    hasher.verify(hash_value, payload)
-                    return {"is_valid": True}
-                except argon2.exceptions.VerifyMismatchError:
-                    return {"is_valid": False}
-                except Exception as e:
-                    raise HashingError(f"Ошибка при проверке Argon2: {str(e)}")
+                return {"is_valid": verify_argon2(payload, hash_value)}
             
             else:
                 raise CryptoServiceError(f"Неподдерживаемый алгоритм для проверки: {self.algorithm}")
                 
+        except Argon2BusyError:
+            raise
         except Exception as exc:
             raise HashingError(f"Ошибка при проверке хэша: {str(exc)}")
 
@@ -463,16 +757,16 @@ class CryptoEngine:
 
     def _generate_keypair(self) -> dict:
         """Генерация ключевых пар."""
+        from .key_pool import key_pool
         if self.algorithm == "ecc":
-            keypair = generate_ecc_keypair(self.params.get("curve", "P-256") if self.params else "P-256")
+            keypair = key_pool.acquire("ecc", self.params.get("curve", "P-256") if self.params else "P-256")
             return {
                 "public_key": keypair.public_key_b64,
                 "private_key": keypair.private_key_b64,
                 "curve": keypair.curve
             }
         elif self.algorithm == "rsa":
-            from .crypto_service import generate_rsa_keypair
-            keypair = generate_rsa_keypair(self.params.get("bits", 2048) if self.params else 2048)
+            keypair = key_pool.acquire("rsa", self.params.get("bits", 2048) if self.params else 2048)
             return {
                 "public_key": keypair.public_key_b64,
                 "private_key": keypair.private_key_b64
@@ -504,10 +798,16 @@ class CryptoEngine:
         if not self.key:
             raise CryptoServiceError("Для ECC шифрования необходим ключ")
         
+        envelope = (self.params or {}).get("format", "json")
         if self.operation == "encrypt":
+            if envelope == "compact":
+                return {"encrypted": _b64_encode(encrypt_ecc_compact(payload.encode("utf-8"), self.key))}
             encrypted = encrypt_ecc(payload, self.key)
             return {"encrypted": encrypted}
         elif self.operation == "decrypt":
+            if isinstance(payload, str) and not payload.lstrip().startswith("{"):
+                decrypted = decrypt_ecc_compact(_b64_decode(payload), self.key)
+                return {"decrypted": decrypted.decode("utf-8")}
             if isinstance(payload, str):
                 try:
                     payload_data = json.loads(payload)
@@ -522,59 +822,65 @@ class CryptoEngine:
         raise CryptoServiceError(f"Неподдерживаемая ECC операция: {self.operation}")
 
     def encrypt(self, payload: str) -> str:
-        if self.is_binary:
-            return self._dispatch_binary("encrypt")(payload)
-        return self._dispatch("encrypt")(payload)
+        return self._dispatch("encrypt")(self, payload)["result"]
 
     def decrypt(self, payload: str) -> str:
-        if self.is_binary:
-            return self._dispatch_binary("decrypt")(payload)
-        return self._dispatch("decrypt")(payload)
-
-    def _dispatch(self, operation: str) -> Callable[[str], str]:
-        lookup = {
-            "aes-gcm": (self._aes_encrypt, self._aes_decrypt),
-            "chacha20": (self._chacha_encrypt, self._chacha_decrypt),
-            "blowfish": (self._blowfish_encrypt, self._blowfish_decrypt),
-            "twofish": (self._twofish_encrypt, self._twofish_decrypt),
-            "caesar": (self._caesar_encrypt, self._caesar_decrypt),
-            "base64": (self._base64_encode, self._base64_decode),
-        }
-
-        if self.algorithm not in lookup:
-            raise CryptoServiceError(f"Неподдерживаемый алгоритм: {self.algorithm}")
-
-        encryptor, decryptor = lookup[self.algorithm]
-        return encryptor if operation == "encrypt" else decryptor
-
-    def _dispatch_binary(self, operation: str) -> Callable[[str], str]:
-        lookup = {
-            "aes-gcm": (self._aes_encrypt_binary, self._aes_decrypt_binary),
-            "chacha20": (self._chacha_encrypt_binary, self._chacha_decrypt_binary),
-            "blowfish": (self._blowfish_encrypt_binary, self._blowfish_decrypt_binary),
-            "twofish": (self._twofish_encrypt_binary, self._twofish_decrypt_binary),
-            "base64": (self._base64_encode_binary, self._base64_decode_binary),
-        }
-
-        if self.algorithm not in lookup:
+        return self._dispatch("decrypt")(self, payload)["result"]
+
+    def _dispatch(self, operation: str) -> Handler:
+        handler = ALGORITHM_REGISTRY.dispatch.get((self.algorithm, operation, self.is_binary))
+        if handler is None:
+            raise CryptoServiceError(self._unsupported())
+        return handler
+
+    def encrypt_bytes(self, data: bytes | bytearray | memoryview) -> bytes | bytearray:
+        """
+        Bytes-native encryption with the same output layout as the binary
+        mode, but without base64. The input is read through a memoryview and,
+        where pycryptodome allows it, the result is written straight into
+        one preallocated buffer.
+        """
+        return self._run_bytes("encrypt", data)
+
+    def decrypt_bytes(self, data: bytes | bytearray | memoryview) -> bytes | bytearray:
+        return self._run_bytes("decrypt", data)
+
+    def _run_bytes(self, operation: str, data) -> bytes | bytearray:
+        handler = ALGORITHM_REGISTRY.bytes_dispatch.get((self.algorithm, operation))
+        if handler is None:
             raise CryptoServiceError(f"Неподдерживаемый алгоритм для бинарных данных: {self.algorithm}")
-        
-        if self.algorithm == "caesar":
-            raise CryptoServiceError("Шифр Цезаря не поддерживается для бинарных данных")
+        try:
+            return handler(self, memoryview(data))
+        except CryptoServiceError:
+            raise
+        except (ValueError, TypeError) as exc:
+            raise CryptoServiceError(str(exc)) from exc
 
-        encryptor, decryptor = lookup[self.algorithm]
-        return encryptor if operation == "encrypt" else decryptor
+    @staticmethod
+    def _open_segmented(cipher: str, key_bytes: bytes, data: memoryview) -> bytearray | None:
+        """
+        Plaintext of a segmented ciphertext (see parallel_cipher), or ``None``
+        when ``data`` is in the single-shot layout. A single-shot ciphertext
+        starts with a random nonce, which matches the segmented header with
+        a probability of about 2**-45.
+        """
+        if parallel_cipher.sealed_with(data) != cipher:
+            return None
+        try:
+            return parallel_cipher.open_sealed(key_bytes, data)
+        except parallel_cipher.ParallelCipherError as exc:
+            raise CryptoServiceError(str(exc)) from exc
 
     # AES (GCM)
     def _aes_encrypt(self, payload: str) -> str:
-        key_bytes = _derive_bytes(self._require_key(), 32)
+        key_bytes = self._key_bytes()
         nonce = _generate_secure_random_bytes(12)
         cipher = AES.new(key_bytes, AES.MODE_GCM, nonce=nonce)
         ciphertext, tag = cipher.encrypt_and_digest(payload.encode("utf-8"))
         return _b64_encode(nonce + tag + ciphertext)
 
     def _aes_decrypt(self, payload: str) -> str:
-        key_bytes = _derive_bytes(self._require_key(), 32)
+        key_bytes = self._key_bytes()
         data = _b64_decode(payload)
         nonce, tag, ciphertext = data[:12], data[12:28], data[28:]
         cipher = AES.new(key_bytes, AES.MODE_GCM, nonce=nonce)
@@ -586,34 +892,71 @@ class CryptoEngine:
 
     # AES (GCM)
     def _aes_encrypt_binary(self, payload: str) -> str:
-        data_bytes = _b64_decode(payload)
-        key_bytes = _derive_bytes(self._require_key(), 32)
-        nonce = _generate_secure_random_bytes(12)
-        cipher = AES.new(key_bytes, AES.MODE_GCM, nonce=nonce)
-        ciphertext, tag = cipher.encrypt_and_digest(data_bytes)
-        return _b64_encode(nonce + tag + ciphertext)
+        return _b64_encode(self._aes_encrypt_raw(memoryview(_b64_decode(payload))))
 
     def _aes_decrypt_binary(self, payload: str) -> str:
-        key_bytes = _derive_bytes(self._require_key(), 32)
-        data = _b64_decode(payload)
-        nonce, tag, ciphertext = data[:12], data[12:28], data[28:]
-        cipher = AES.new(key_bytes, AES.MODE_GCM, nonce=nonce)
+        return _b64_encode(self._aes_decrypt_raw(memoryview(_b64_decode(payload))))
+
+    def _aes_encrypt_raw(self, data: memoryview) -> bytearray:
+        key_bytes = self._key_bytes()
+        if parallel_cipher.applies_to(len(data)):
+            return parallel_cipher.seal("aes-ctr", key_bytes, data)
+        output = bytearray(28 + len(data))
+        view = memoryview(output)
+        view[:12] = _generate_secure_random_bytes(12)
+        cipher = AES.new(key_bytes, AES.MODE_GCM, nonce=view[:12])
+        cipher.encrypt(data, output=view[28:])
+        view[12:28] = cipher.digest()
+        return output
+
+    def _aes_decrypt_raw(self, data: memoryview) -> bytearray:
+        key_bytes = self._key_bytes()
+        segmented = self._open_segmented("aes-ctr", key_bytes, data)
+        if segmented is not None:
+            return segmented
+        if len(data) < 28:
+            raise CryptoServiceError("Неверный ключ или поврежденные данные")
+        output = bytearray(len(data) - 28)
+        cipher = AES.new(key_bytes, AES.MODE_GCM, nonce=data[:12])
+        cipher.decrypt(data[28:], output=output)
         try:
-            plaintext = cipher.decrypt_and_verify(ciphertext, tag)
+            cipher.verify(data[12:28])
         except ValueError as exc:
             raise CryptoServiceError("Неверный ключ или поврежденные данные") from exc
-        return _b64_encode(plaintext)
+        return output
+
+    # Auto AEAD: AES-GCM or ChaCha20-Poly1305, as chosen for this node
+    def _auto_encrypt(self, payload: str) -> str:
+        return _b64_encode(self._auto_encrypt_raw(memoryview(payload.encode("utf-8"))))
+
+    def _auto_decrypt(self, payload: str) -> str:
+        return self._auto_decrypt_raw(memoryview(_b64_decode(payload))).decode("utf-8")
+
+    def _auto_encrypt_binary(self, payload: str) -> str:
+        return _b64_encode(self._auto_encrypt_raw(memoryview(_b64_decode(payload))))
+
+    def _auto_decrypt_binary(self, payload: str) -> str:
+        return _b64_encode(self._auto_decrypt_raw(memoryview(_b64_decode(payload))))
+
+    def _auto_encrypt_raw(self, data: memoryview) -> bytearray:
+        return aead.seal(aead_selector.choice(), self._key_bytes(), data)
+
+    def _auto_decrypt_raw(self, data: memoryview) -> bytearray:
+        try:
+            return aead.open_sealed(self._key_bytes(), data)
+        except aead.AeadError as exc:
+            raise CryptoServiceError(str(exc)) from exc
 
     # ChaCha20
     def _chacha_encrypt(self, payload: str) -> str:
-        key_bytes = _derive_bytes(self._require_key(), 32)
+        key_bytes = self._key_bytes()
         nonce = _generate_secure_random_bytes(12)
         cipher = ChaCha20.new(key=key_bytes, nonce=nonce)
         ciphertext = cipher.encrypt(payload.encode("utf-8"))
         return _b64_encode(nonce + ciphertext)
 
     def _chacha_decrypt(self, payload: str) -> str:
-        key_bytes = _derive_bytes(self._require_key(), 32)
+        key_bytes = self._key_bytes()
         data = _b64_decode(payload)
         nonce, ciphertext = data[:12], data[12:]
         cipher = ChaCha20.new(key=key_bytes, nonce=nonce)
@@ -622,217 +965,378 @@ class CryptoEngine:
 
     # ChaCha20
     def _chacha_encrypt_binary(self, payload: str) -> str:
-        data_bytes = _b64_decode(payload)
-        key_bytes = _derive_bytes(self._require_key(), 32)
-        nonce = _generate_secure_random_bytes(12)
-        cipher = ChaCha20.new(key=key_bytes, nonce=nonce)
-        ciphertext = cipher.encrypt(data_bytes)
-        return _b64_encode(nonce + ciphertext)
+        return _b64_encode(self._chacha_encrypt_raw(memoryview(_b64_decode(payload))))
 
     def _chacha_decrypt_binary(self, payload: str) -> str:
-        key_bytes = _derive_bytes(self._require_key(), 32)
-        data = _b64_decode(payload)
-        nonce, ciphertext = data[:12], data[12:]
-        cipher = ChaCha20.new(key=key_bytes, nonce=nonce)
-        plaintext = cipher.decrypt(ciphertext)
-        return _b64_encode(plaintext)
+        return _b64_encode(self._chacha_decrypt_raw(memoryview(_b64_decode(payload))))
+
+    def _chacha_encrypt_raw(self, data: memoryview) -> bytearray:
+        key_bytes = self._key_bytes()
+        if parallel_cipher.applies_to(len(data)):
+            return parallel_cipher.seal("chacha20", key_bytes, data)
+        output = bytearray(12 + len(data))
+        view = memoryview(output)
+        view[:12] = _generate_secure_random_bytes(12)
+        cipher = ChaCha20.new(key=key_bytes, nonce=view[:12])
+        cipher.encrypt(data, output=view[12:])
+        return output
+
+    def _chacha_decrypt_raw(self, data: memoryview) -> bytearray:
+        key_bytes = self._key_bytes()
+        segmented = self._open_segmented("chacha20", key_bytes, data)
+        if segmented is not None:
+            return segmented
+        output = bytearray(max(len(data) - 12, 0))
+        cipher = ChaCha20.new(key=key_bytes, nonce=data[:12])
+        cipher.decrypt(data[12:], output=output)
+        return output
 
     # Blowfish
     def _blowfish_encrypt(self, payload: str) -> str:
-        key_bytes = _derive_bytes(self._require_key(), 56)
         iv = _generate_secure_random_bytes(Blowfish.block_size)
-        cipher = Blowfish.new(key_bytes, Blowfish.MODE_CBC, iv=iv)
-        ciphertext = cipher.encrypt(pad(payload.encode("utf-8"), Blowfish.block_size))
+        padded = pad(payload.encode("utf-8"), Blowfish.block_size)
+        ciphertext = _blowfish_cbc_encrypt(self._require_key(), iv, padded)
         return _b64_encode(iv + ciphertext)
 
     def _blowfish_decrypt(self, payload: str) -> str:
-        key_bytes = _derive_bytes(self._require_key(), 56)
         data = _b64_decode(payload)
         iv, ciphertext = data[:Blowfish.block_size], data[Blowfish.block_size:]
-        cipher = Blowfish.new(key_bytes, Blowfish.MODE_CBC, iv=iv)
-        plaintext = unpad(cipher.decrypt(ciphertext), Blowfish.block_size)
+        decrypted = _blowfish_cbc_decrypt(self._require_key(), iv, ciphertext)
+        plaintext = unpad(decrypted, Blowfish.block_size)
         return plaintext.decode("utf-8")
 
     # Blowfish
     def _blowfish_encrypt_binary(self, payload: str) -> str:
         data_bytes = _b64_decode(payload)
-        key_bytes = _derive_bytes(self._require_key(), 56)
         iv = _generate_secure_random_bytes(Blowfish.block_size)
-        cipher = Blowfish.new(key_bytes, Blowfish.MODE_CBC, iv=iv)
-        ciphertext = cipher.encrypt(pad(data_bytes, Blowfish.block_size))
+        padded = pad(data_bytes, Blowfish.block_size)
+        ciphertext = _blowfish_cbc_encrypt(self._require_key(), iv, padded)
         return _b64_encode(iv + ciphertext)
 
     def _blowfish_decrypt_binary(self, payload: str) -> str:
-        key_bytes = _derive_bytes(self._require_key(), 56)
         data = _b64_decode(payload)
         iv, ciphertext = data[:Blowfish.block_size], data[Blowfish.block_size:]
-        cipher = Blowfish.new(key_bytes, Blowfish.MODE_CBC, iv=iv)
-        plaintext = unpad(cipher.decrypt(ciphertext), Blowfish.block_size)
+        decrypted = _blowfish_cbc_decrypt(self._require_key(), iv, ciphertext)
+        plaintext = unpad(decrypted, Blowfish.block_size)
         return _b64_encode(plaintext)
 
-    # Twofish
-    def _twofish_encrypt(self, payload: str) -> str:
-        try:
-            key_bytes = _derive_bytes(self._require_key(), 32)
+    def _blowfish_encrypt_raw(self, data: memoryview) -> bytes | bytearray:
+        block_size = Blowfish.block_size
+        iv = _generate_secure_random_bytes(block_size)
+        if len(data) <= _BLOWFISH_CACHED_SCHEDULE_MAX_BYTES:
+            padded = pad(bytes(data), block_size)
+            return iv + _blowfish_cbc_encrypt(self._require_key(), iv, padded)
+
+        full = len(data) - len(data) % block_size
+        output = bytearray(block_size + full + block_size)
+        view = memoryview(output)
+        view[:block_size] = iv
+        cipher = Blowfish.new(self._key_bytes(), Blowfish.MODE_CBC, iv=iv)
+        cipher.encrypt(data[:full], output=view[block_size:block_size + full])
+        cipher.encrypt(pad(bytes(data[full:]), block_size), output=view[block_size + full:])
+        return output
+
+    def _blowfish_decrypt_raw(self, data: memoryview) -> bytes | bytearray:
+        block_size = Blowfish.block_size
+        iv, ciphertext = data[:block_size], data[block_size:]
+        if len(ciphertext) <= _BLOWFISH_CACHED_SCHEDULE_MAX_BYTES:
+            decrypted = _blowfish_cbc_decrypt(self._require_key(), bytes(iv), bytes(ciphertext))
+            return unpad(decrypted, block_size)
+
+        output = bytearray(len(ciphertext))
+        cipher = Blowfish.new(self._key_bytes(), Blowfish.MODE_CBC, iv=iv)
+        cipher.decrypt(ciphertext, output=output)
+        kept = len(unpad(bytes(output[-block_size:]), block_size))
+        del output[len(output) - block_size + kept:]
+        return output
 
-            from Crypto.Cipher import Twofish
+    # Twofish
+    def _twofish_key(self) -> twofish.TwofishKey:
+        source = self._require_key()
+        return derived_key_cache.get_or_create(
+            cache_key("twofish", source),
+            lambda: twofish.TwofishKey(_derive_bytes(source, self.spec.key_length)),
+        )
 
-            iv = _generate_secure_random_bytes(16)
-            cipher = Twofish.new(key_bytes)
-            padded_data = pad(payload.encode("utf-8"), Twofish.block_size)
-            blocks = [padded_data[i:i+16] for i in range(0, len(padded_data), 16)]
-            ciphertext = b""
-            prev = iv
-            
-            for block in blocks:
-                xored = bytes(a ^ b for a, b in zip(block, prev))
-                encrypted = cipher.encrypt(xored)
-                ciphertext += encrypted
-                prev = encrypted
+    def _twofish_mode(self) -> str:
+        mode = (self.params or {}).get("mode", "cbc")
+        if mode not in {"cbc", "ctr"}:
+            raise CryptoServiceError(f"Неподдерживаемый режим Twofish: {mode}")
+        return mode
+
+    def _twofish_encrypt_bytes(self, data: bytes) -> bytes:
+        key = self._twofish_key()
+        if self._twofish_mode() == "ctr":
+            nonce = _generate_secure_random_bytes(twofish.CTR_NONCE_SIZE)
+            return _TWOFISH_CTR_HEADER + nonce + key.ctr_crypt(nonce, data)
+        iv = _generate_secure_random_bytes(twofish.BLOCK_SIZE)
+        return _TWOFISH_CBC_HEADER + iv + key.cbc_encrypt(iv, pad(data, twofish.BLOCK_SIZE))
+
+    def _twofish_decrypt_bytes(self, data: bytes) -> bytes:
+        """
+        The mode comes from the header, not from ``params``. Data without a
+        header is AES-CBC from before Twofish was implemented: IV +
+        ciphertext with the same key derivation. A legacy IV starts with
+        the header by chance only once in 2**32.
+        """
+        header, body = data[:len(_TWOFISH_CBC_HEADER)], data[len(_TWOFISH_CBC_HEADER):]
+        if header == _TWOFISH_CTR_HEADER:
+            nonce, ciphertext = body[:twofish.CTR_NONCE_SIZE], body[twofish.CTR_NONCE_SIZE:]
+            return self._twofish_key().ctr_crypt(nonce, ciphertext)
+        # A CBC body is a whole number of blocks, so a legacy ciphertext
+        # (also whole blocks) can never pass for one with the header.
+        if header == _TWOFISH_CBC_HEADER and len(body) % twofish.BLOCK_SIZE == 0:
+            iv, ciphertext = body[:twofish.BLOCK_SIZE], body[twofish.BLOCK_SIZE:]
+            return unpad(self._twofish_key().cbc_decrypt(iv, ciphertext), twofish.BLOCK_SIZE)
+        key_bytes = self._key_bytes()
+        iv, ciphertext = data[:AES.block_size], data[AES.block_size:]
+        cipher = AES.new(key_bytes, AES.MODE_CBC, iv=iv)
+        return unpad(cipher.decrypt(ciphertext), AES.block_size)
 
-            return _b64_encode(iv + ciphertext)
-            
-        except ImportError:
-            key_bytes = _derive_bytes(self._require_key(), 32)
-            iv = _generate_secure_random_bytes(AES.block_size)
-            cipher = AES.new(key_bytes, AES.MODE_CBC, iv=iv)
-            ciphertext = cipher.encrypt(pad(payload.encode("utf-8"), AES.block_size))
-            return _b64_encode(iv + ciphertext)
+    def _twofish_encrypt(self, payload: str) -> str:
+        return _b64_encode(self._twofish_encrypt_bytes(payload.encode("utf-8")))
 
     def _twofish_decrypt(self, payload: str) -> str:
-        try:
-            key_bytes = _derive_bytes(self._require_key(), 32)
-            
-            from Crypto.Cipher import Twofish
-            
-            data = _b64_decode(payload)
-            iv, ciphertext = data[:16], data[16:]
-            
-            cipher = Twofish.new(key_bytes)
+        return self._twofish_decrypt_bytes(_b64_decode(payload)).decode("utf-8")
 
-            blocks = [ciphertext[i:i+16] for i in range(0, len(ciphertext), 16)]
-            plaintext = b""
-            prev = iv
-            
-            for block in blocks:
-                decrypted = cipher.decrypt(block)
-                xored = bytes(a ^ b for a, b in zip(decrypted, prev))
-                plaintext += xored
-                prev = block
-
-            unpadded = unpad(plaintext, Twofish.block_size)
-            return unpadded.decode("utf-8")
-            
-        except ImportError:
-            key_bytes = _derive_bytes(self._require_key(), 32)
-            data = _b64_decode(payload)
-            iv, ciphertext = data[:AES.block_size], data[AES.block_size:]
-            cipher = AES.new(key_bytes, AES.MODE_CBC, iv=iv)
-            plaintext = unpad(cipher.decrypt(ciphertext), AES.block_size)
-            return plaintext.decode("utf-8")
+    def _twofish_encrypt_raw(self, data: memoryview) -> bytes:
+        return self._twofish_encrypt_bytes(bytes(data))
+
+    def _twofish_decrypt_raw(self, data: memoryview) -> bytes:
+        return self._twofish_decrypt_bytes(bytes(data))
 
     # Twofish
     def _twofish_encrypt_binary(self, payload: str) -> str:
-        data_bytes = _b64_decode(payload)
-        
-        try:
-            key_bytes = _derive_bytes(self._require_key(), 32)
-
-            from Crypto.Cipher import Twofish
-
-            iv = _generate_secure_random_bytes(16)
-            cipher = Twofish.new(key_bytes)
-            padded_data = pad(data_bytes, Twofish.block_size)
-            blocks = [padded_data[i:i+16] for i in range(0, len(padded_data), 16)]
-            ciphertext = b""
-            prev = iv
-            
-            for block in blocks:
-                xored = bytes(a ^ b for a, b in zip(block, prev))
-                encrypted = cipher.encrypt(xored)
-                ciphertext += encrypted
-                prev = encrypted
-
-            return _b64_encode(iv + ciphertext)
-            
-        except ImportError:
-            key_bytes = _derive_bytes(self._require_key(), 32)
-            iv = _generate_secure_random_bytes(AES.block_size)
-            cipher = AES.new(key_bytes, AES.MODE_CBC, iv=iv)
-            ciphertext = cipher.encrypt(pad(data_bytes, AES.block_size))
-            return _b64_encode(iv + ciphertext)
+        return _b64_encode(self._twofish_encrypt_raw(memoryview(_b64_decode(payload))))
 
     def _twofish_decrypt_binary(self, payload: str) -> str:
-        try:
-            key_bytes = _derive_bytes(self._require_key(), 32)
-            
-            from Crypto.Cipher import Twofish
-            
-            data = _b64_decode(payload)
-            iv, ciphertext = data[:16], data[16:]
-            
-            cipher = Twofish.new(key_bytes)
-
-            blocks = [ciphertext[i:i+16] for i in range(0, len(ciphertext), 16)]
-            plaintext = b""
-            prev = iv
-            
-            for block in blocks:
-                decrypted = cipher.decrypt(block)
-                xored = bytes(a ^ b for a, b in zip(decrypted, prev))
-                plaintext += xored
-                prev = block
-
-            unpadded = unpad(plaintext, Twofish.block_size)
-            return _b64_encode(unpadded)
-            
-        except ImportError:
-            key_bytes = _derive_bytes(self._require_key(), 32)
-            data = _b64_decode(payload)
-            iv, ciphertext = data[:AES.block_size], data[AES.block_size:]
-            cipher = AES.new(key_bytes, AES.MODE_CBC, iv=iv)
-            plaintext = unpad(cipher.decrypt(ciphertext), AES.block_size)
-            return _b64_encode(plaintext)
+        return _b64_encode(self._twofish_decrypt_raw(memoryview(_b64_decode(payload))))
 
     # Caesar
+    def _caesar_shift(self) -> int:
+        return int(self._require_key()) % 26
+
     def _caesar_encrypt(self, payload: str) -> str:
-        shift = int(self._require_key()) % 26
-        return "".join(self._shift_char(ch, shift) for ch in payload)
+        return caesar_shift(payload, self._caesar_shift())
 
     def _caesar_decrypt(self, payload: str) -> str:
-        shift = int(self._require_key()) % 26
-        return "".join(self._shift_char(ch, -shift) for ch in payload)
-
-    @staticmethod
-    def _shift_char(char: str, shift: int) -> str:
-        def _shift_range(start: int, end: int, alphabet: int) -> str | None:
-            code = ord(char)
-            if start <= code <= end:
-                base = start
-                return chr(((code - base + shift) % alphabet) + base)
-            return None
-
-        return (
-            _shift_range(65, 90, 26)
-            or _shift_range(97, 122, 26)
-            or _shift_range(1040, 1071, 33)
-            or _shift_range(1072, 1103, 33)
-            or char
-        )
+        return caesar_shift(payload, -self._caesar_shift())
 
     # Base64
-    @staticmethod
-    def _base64_encode(payload: str) -> str:
+    def _base64_encode(self, payload: str) -> str:
         return _b64_encode(payload.encode("utf-8"))
 
-    @staticmethod
-    def _base64_decode(payload: str) -> str:
+    def _base64_decode(self, payload: str) -> str:
         return _b64_decode(payload).decode("utf-8")
 
-    @staticmethod
-    def _base64_encode_binary(payload: str) -> str:
+    def _base64_encode_binary(self, payload: str) -> str:
         return payload
 
-    @staticmethod
-    def _base64_decode_binary(payload: str) -> str:
+    def _base64_decode_binary(self, payload: str) -> str:
         return payload
+
+    def _base64_encode_raw(self, data: memoryview) -> bytes:
+        return binascii.b2a_base64(data, newline=False)
+
+    def _base64_decode_raw(self, data: memoryview) -> bytes:
+        try:
+            return binascii.a2b_base64(data)
+        except binascii.Error as exc:
+            raise CryptoServiceError("Невозможно декодировать Base64 данные") from exc
+
+
+# ---------------------------------------------------------------------------
+# Algorithm registry
+# ---------------------------------------------------------------------------
+
+def _result(method: Callable[[CryptoEngine, str], str]) -> Handler:
+    """Adapt a cipher method returning a string to a ``process`` handler."""
+    def handler(engine: CryptoEngine, payload: str) -> dict:
+        return {"result": method(engine, payload)}
+    return handler
+
+
+def _cipher_handlers(text_encrypt, text_decrypt, binary_encrypt=None, binary_decrypt=None) -> dict:
+    return {
+        "encrypt": (_result(text_encrypt), binary_encrypt and _result(binary_encrypt)),
+        "decrypt": (_result(text_decrypt), binary_decrypt and _result(binary_decrypt)),
+    }
+
+
+def _keypair_handler(engine: CryptoEngine, payload: str) -> dict:
+    return engine._generate_keypair()
+
+
+_HASH_HANDLERS = {
+    "hash": CryptoEngine._hash,
+    "verify": CryptoEngine._verify_hash_request,
+}
+_HASH_PARAMS = (
+    ParamSpec("hash", str, required_for=("verify",), applies_to=("verify",)),
+)
+_SYMMETRIC_OPERATIONS = frozenset({"encrypt", "decrypt"})
+
+ALGORITHM_REGISTRY = AlgorithmRegistry()
+
+ALGORITHM_REGISTRY.register(AlgorithmSpec(
+    name="aes-gcm",
+    capabilities=frozenset({TEXT, BINARY}),
+    handlers=_cipher_handlers(
+        CryptoEngine._aes_encrypt, CryptoEngine._aes_decrypt,
+        CryptoEngine._aes_encrypt_binary, CryptoEngine._aes_decrypt_binary,
+    ),
+    bytes_handlers={"encrypt": CryptoEngine._aes_encrypt_raw, "decrypt": CryptoEngine._aes_decrypt_raw},
+    key_policy=KEY_REQUIRED,
+    key_operations=_SYMMETRIC_OPERATIONS,
+    key_length=32,
+))
+ALGORITHM_REGISTRY.register(AlgorithmSpec(
+    name="auto",
+    capabilities=frozenset({TEXT, BINARY}),
+    handlers=_cipher_handlers(
+        CryptoEngine._auto_encrypt, CryptoEngine._auto_decrypt,
+        CryptoEngine._auto_encrypt_binary, CryptoEngine._auto_decrypt_binary,
+    ),
+    bytes_handlers={"encrypt": CryptoEngine._auto_encrypt_raw, "decrypt": CryptoEngine._auto_decrypt_raw},
+    key_policy=KEY_REQUIRED,
+    key_operations=_SYMMETRIC_OPERATIONS,
+    key_length=32,
+))
+ALGORITHM_REGISTRY.register(AlgorithmSpec(
+    name="chacha20",
+    capabilities=frozenset({TEXT, BINARY}),
+    handlers=_cipher_handlers(
+        CryptoEngine._chacha_encrypt, CryptoEngine._chacha_decrypt,
+        CryptoEngine._chacha_encrypt_binary, CryptoEngine._chacha_decrypt_binary,
+    ),
+    bytes_handlers={"encrypt": CryptoEngine._chacha_encrypt_raw, "decrypt": CryptoEngine._chacha_decrypt_raw},
+    key_policy=KEY_REQUIRED,
+    key_operations=_SYMMETRIC_OPERATIONS,
+    key_length=32,
+))
+ALGORITHM_REGISTRY.register(AlgorithmSpec(
+    name="blowfish",
+    capabilities=frozenset({TEXT, BINARY}),
+    handlers=_cipher_handlers(
+        CryptoEngine._blowfish_encrypt, CryptoEngine._blowfish_decrypt,
+        CryptoEngine._blowfish_encrypt_binary, CryptoEngine._blowfish_decrypt_binary,
+    ),
+    bytes_handlers={"encrypt": CryptoEngine._blowfish_encrypt_raw, "decrypt": CryptoEngine._blowfish_decrypt_raw},
+    key_policy=KEY_REQUIRED,
+    key_operations=_SYMMETRIC_OPERATIONS,
+    key_length=56,
+))
+ALGORITHM_REGISTRY.register(AlgorithmSpec(
+    name="twofish",
+    capabilities=frozenset({TEXT, BINARY}),
+    handlers=_cipher_handlers(
+        CryptoEngine._twofish_encrypt, CryptoEngine._twofish_decrypt,
+        CryptoEngine._twofish_encrypt_binary, CryptoEngine._twofish_decrypt_binary,
+    ),
+    bytes_handlers={"encrypt": CryptoEngine._twofish_encrypt_raw, "decrypt": CryptoEngine._twofish_decrypt_raw},
+    key_policy=KEY_REQUIRED,
+    key_operations=_SYMMETRIC_OPERATIONS,
+    key_length=32,
+    params=(ParamSpec("mode", str, choices=("cbc", "ctr")),),
+))
+ALGORITHM_REGISTRY.register(AlgorithmSpec(
+    name="caesar",
+    capabilities=frozenset({TEXT}),
+    handlers=_cipher_handlers(CryptoEngine._caesar_encrypt, CryptoEngine._caesar_decrypt),
+    key_policy=KEY_DEFAULT,
+    default_key="3",
+))
+ALGORITHM_REGISTRY.register(AlgorithmSpec(
+    name="base64",
+    capabilities=frozenset({TEXT, BINARY}),
+    handlers=_cipher_handlers(
+        CryptoEngine._base64_encode, CryptoEngine._base64_decode,
+        CryptoEngine._base64_encode_binary, CryptoEngine._base64_decode_binary,
+    ),
+    bytes_handlers={"encrypt": CryptoEngine._base64_encode_raw, "decrypt": CryptoEngine._base64_decode_raw},
+))
+ALGORITHM_REGISTRY.register(AlgorithmSpec(
+    name="sha256",
+    capabilities=frozenset({HASH}),
+    handlers=_HASH_HANDLERS,
+    params=_HASH_PARAMS,
+))
+ALGORITHM_REGISTRY.register(AlgorithmSpec(
+    name="sha512",
+    capabilities=frozenset({HASH}),
+    handlers=_HASH_HANDLERS,
+    params=_HASH_PARAMS,
+))
+ALGORITHM_REGISTRY.register(AlgorithmSpec(
+    name="argon2",
+    capabilities=frozenset({HASH}),
+    handlers=_HASH_HANDLERS,
+    params=_HASH_PARAMS + (
+        # Defaults come from the per-host calibration (argon2_calibration).
+        ParamSpec("time_cost", int, applies_to=("hash",)),
+        ParamSpec("memory_cost", int, applies_to=("hash",)),
+        ParamSpec("parallelism", int, applies_to=("hash",)),
+        ParamSpec("hash_len", int, applies_to=("hash",)),
+    ),
+))
+ALGORITHM_REGISTRY.register(AlgorithmSpec(
+    name="ecc",
+    capabilities=frozenset({TEXT, SIGN, KEYGEN}),
+    handlers={
+        "encrypt": CryptoEngine._ecc_crypto,
+        "decrypt": CryptoEngine._ecc_crypto,
+        "sign": CryptoEngine._ecc_operation,
+        "verify": CryptoEngine._ecc_operation,
+        "generate_keypair": _keypair_handler,
+    },
+    key_policy=KEY_REQUIRED,
+    key_operations=frozenset({"encrypt", "decrypt", "sign", "verify"}),
+    params=(
+        ParamSpec("curve", str, applies_to=("generate_keypair",)),
+        ParamSpec("hash_algorithm", str, choices=("SHA256", "SHA512"), applies_to=("sign", "verify")),
+        ParamSpec("signature", str, required_for=("verify",), applies_to=("verify",)),
+        ParamSpec("format", str, choices=("json", "compact"), applies_to=("encrypt",)),
+    ),
+))
+ALGORITHM_REGISTRY.register(AlgorithmSpec(
+    name="rsa",
+    capabilities=frozenset({KEYGEN}),
+    handlers={"generate_keypair": _keypair_handler},
+    params=(ParamSpec("bits", int, applies_to=("generate_keypair",)),),
+))
+
+
+def process_request(data: dict) -> dict:
+    """Run one validated CryptoRequestSerializer payload and build the response body."""
+    engine = CryptoEngine(
+        algorithm=data['algorithm'],
+        key=data.get('key'),
+        is_binary=data.get('is_binary', False),
+        operation=data['operation'],
+        params=data.get('params')
+    )
+    result = engine.process(data.get('payload', ''))
+
+    response_data = {
+        "operation": data['operation'],
+        "algorithm": data['algorithm'],
+        **result
+    }
+    if data.get('is_binary', False):
+        response_data["is_binary"] = True
+    return response_data
+
+
+def runs_in_server_process(data: dict) -> bool:
+    """Batch items that must count against this process's Argon2 memory budget."""
+    return data['algorithm'] == 'argon2'
+
+
+def process_batch_item(data: dict) -> dict:
+    """Worker entry point for batch requests: errors are returned, not raised."""
+    try:
+        return {"ok": True, **process_request(data)}
+    except Argon2BusyError as exc:
+        return {"ok": False, "detail": str(exc), "retry_after": exc.retry_after}
+    except CryptoServiceError as exc:
+        return {"ok": False, "detail": str(exc)}
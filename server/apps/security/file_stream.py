@@ -0,0 +1,210 @@
+"""
+Chunked authenticated encryption for file streams.
+
+The format follows the STREAM construction (Hoang et al., 2015): the input
+is cut into fixed-size chunks and every chunk is sealed separately with
+an AEAD cipher under the nonce ``prefix || counter || last_flag``. The
+counter fixes the order of the chunks and the flag marks the final one,
+so reordering, dropping or truncating chunks fails authentication. The
+header is bound to every chunk as associated data.
+
+Layout::
+
+    header:  magic "DSF1" | algorithm id (1) | chunk size (4, BE) | nonce prefix (7)
+    chunks:  ciphertext (chunk size, shorter for the last chunk) | tag (16)
+
+Memory use is one chunk at a time, regardless of the file size.
+"""
+from __future__ import annotations
+import struct
+from typing import Iterable, Iterator
+from Crypto.Cipher import AES, ChaCha20_Poly1305
+from .crypto_service import CryptoServiceError, _derive_key, _generate_secure_random_bytes
+
+MAGIC = b"DSF1"
+NONCE_PREFIX_SIZE = 7
+TAG_SIZE = 16
+DEFAULT_CHUNK_SIZE = 64 * 1024
+MIN_CHUNK_SIZE = 4 * 1024
+MAX_CHUNK_SIZE = 4 * 1024 * 1024
+
+_HEADER = struct.Struct(f">4sBI{NONCE_PREFIX_SIZE}s")
+HEADER_SIZE = _HEADER.size
+
+ALGORITHM_IDS = {
+    "aes-gcm": 1,
+    "chacha20": 2,
+}
+_ALGORITHM_NAMES = {value: key for key, value in ALGORITHM_IDS.items()}
+
+
+class StreamAuthenticationError(CryptoServiceError):
+    """Raised when a chunk fails authentication or the stream is truncated."""
+
+
+def _new_cipher(algorithm: str, key: bytes, nonce: bytes):
+    if algorithm == "aes-gcm":
+        return AES.new(key, AES.MODE_GCM, nonce=nonce, mac_len=TAG_SIZE)
+    return ChaCha20_Poly1305.new(key=key, nonce=nonce)
+
+
+def _chunk_nonce(prefix: bytes, counter: int, last: bool) -> bytes:
+    if counter >= 1 << 32:
+        raise CryptoServiceError("Слишком большой файл для выбранного размера блока")
+    return prefix + counter.to_bytes(4, "big") + (b"\x01" if last else b"\x00")
+
+
+def make_header(algorithm: str, chunk_size: int, prefix: bytes) -> bytes:
+    return _HEADER.pack(MAGIC, ALGORITHM_IDS[algorithm], chunk_size, prefix)
+
+
+def parse_header(header: bytes) -> tuple[str, int, bytes]:
+    """Return ``(algorithm, chunk_size, nonce_prefix)`` of a stream header."""
+    if len(header) < HEADER_SIZE:
+        raise CryptoServiceError("Файл не является зашифрованным потоком")
+    magic, algorithm_id, chunk_size, prefix = _HEADER.unpack(header[:HEADER_SIZE])
+    if magic != MAGIC or algorithm_id not in _ALGORITHM_NAMES:
+        raise CryptoServiceError("Файл не является зашифрованным потоком")
+    if not MIN_CHUNK_SIZE <= chunk_size <= MAX_CHUNK_SIZE:
+        raise CryptoServiceError("Недопустимый размер блока в заголовке")
+    return _ALGORITHM_NAMES[algorithm_id], chunk_size, prefix
+
+
+def chunk_count(size: int, chunk_size: int) -> int:
+    """
+    Chunks of a ``size``-byte plaintext. The final chunk holds the
+    remainder and is empty when ``size`` is a multiple of the chunk size.
+    """
+    return size // chunk_size + 1
+
+
+def encrypted_size(size: int, chunk_size: int) -> int:
+    return HEADER_SIZE + size + TAG_SIZE * chunk_count(size, chunk_size)
+
+
+def plaintext_size(encrypted: int, chunk_size: int) -> int:
+    """Inverse of ``encrypted_size``; rejects sizes no stream can have."""
+    body = encrypted - HEADER_SIZE - TAG_SIZE
+    if body < 0 or body % (chunk_size + TAG_SIZE) >= chunk_size:
+        raise StreamAuthenticationError("Поврежденный или обрезанный поток")
+    full, remainder = divmod(body, chunk_size + TAG_SIZE)
+    return full * chunk_size + remainder
+
+
+def seal_chunk_into(algorithm: str, key: bytes, header: bytes, counter: int, last: bool,
+                    chunk, output) -> None:
+    """
+    Seal one chunk into ``output`` (a writable buffer of ``len(chunk) +
+    TAG_SIZE`` bytes). Chunks are independent given their counter, so a
+    stream can be sealed in any order, by several workers at once.
+    """
+    prefix = header[HEADER_SIZE - NONCE_PREFIX_SIZE:HEADER_SIZE]
+    cipher = _new_cipher(algorithm, key, _chunk_nonce(prefix, counter, last))
+    cipher.update(header)
+    size = len(chunk)
+    if size:
+        cipher.encrypt(chunk, output=output[:size])
+    output[size:size + TAG_SIZE] = cipher.digest()
+
+
+def open_chunk_into(algorithm: str, key: bytes, header: bytes, counter: int, last: bool,
+                    frame, output) -> None:
+    """Verify one sealed chunk and write its plaintext into ``output``."""
+    prefix = header[HEADER_SIZE - NONCE_PREFIX_SIZE:HEADER_SIZE]
+    cipher = _new_cipher(algorithm, key, _chunk_nonce(prefix, counter, last))
+    cipher.update(header)
+    size = len(frame) - TAG_SIZE
+    if size:
+        cipher.decrypt(frame[:size], output=output[:size])
+    try:
+        cipher.verify(frame[size:])
+    except ValueError as exc:
+        raise StreamAuthenticationError("Неверный ключ или поврежденные данные") from exc
+
+
+def _rechunk(pieces: Iterable[bytes], size: int) -> Iterator[bytes]:
+    """Regroup arbitrary input pieces into exactly ``size``-byte chunks."""
+    buffer = bytearray()
+    for piece in pieces:
+        if not piece:
+            continue
+        if not buffer and len(piece) == size:
+            # Already aligned (the usual case for read(size) loops): pass it
+            # through without copying; bytes() of bytes is a no-op.
+            yield bytes(piece)
+            continue
+        buffer += piece
+        while len(buffer) >= size:
+            yield bytes(buffer[:size])
+            del buffer[:size]
+    yield bytes(buffer)
+
+
+def _with_last_flag(chunks: Iterator[bytes]) -> Iterator[tuple[bytes, bool]]:
+    """Pair each chunk with a flag telling whether it is the final one."""
+    previous = next(chunks, None)
+    if previous is None:
+        return
+    for chunk in chunks:
+        yield previous, False
+        previous = chunk
+    yield previous, True
+
+
+def encrypt_stream(
+    pieces: Iterable[bytes],
+    password: str,
+    algorithm: str = "aes-gcm",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """Yield the header followed by the sealed chunks of ``pieces``."""
+    if algorithm not in ALGORITHM_IDS:
+        raise CryptoServiceError(f"Неподдерживаемый алгоритм для потокового шифрования: {algorithm}")
+    if not MIN_CHUNK_SIZE <= chunk_size <= MAX_CHUNK_SIZE:
+        raise CryptoServiceError("Недопустимый размер блока")
+
+    key = _derive_key(password, 32)
+    prefix = _generate_secure_random_bytes(NONCE_PREFIX_SIZE)
+    header = make_header(algorithm, chunk_size, prefix)
+    yield header
+
+    # _rechunk always yields at least one (possibly empty) chunk, so an
+    # empty input still produces an authenticated final chunk.
+    for counter, (chunk, last) in enumerate(_with_last_flag(_rechunk(pieces, chunk_size))):
+        cipher = _new_cipher(algorithm, key, _chunk_nonce(prefix, counter, last))
+        cipher.update(header)
+        ciphertext, tag = cipher.encrypt_and_digest(chunk)
+        yield ciphertext + tag
+
+
+def decrypt_stream(pieces: Iterable[bytes], password: str) -> Iterator[bytes]:
+    """Verify and yield the plaintext chunks of a stream made by ``encrypt_stream``."""
+    frames = iter(pieces)
+    buffer = bytearray()
+    for piece in frames:
+        buffer += piece
+        if len(buffer) >= HEADER_SIZE:
+            break
+    if len(buffer) < HEADER_SIZE:
+        raise CryptoServiceError("Файл не является зашифрованным потоком")
+
+    header = bytes(buffer[:HEADER_SIZE])
+    algorithm, chunk_size, prefix = parse_header(header)
+    key = _derive_key(password, 32)
+    del buffer[:HEADER_SIZE]
+
+    def _remaining() -> Iterator[bytes]:
+        yield bytes(buffer)
+        yield from frames
+
+    frame_size = chunk_size + TAG_SIZE
+    for counter, (frame, last) in enumerate(_with_last_flag(_rechunk(_remaining(), frame_size))):
+        if len(frame) < TAG_SIZE or (not last and len(frame) != frame_size):
+            raise StreamAuthenticationError("Поврежденный или обрезанный поток")
+        cipher = _new_cipher(algorithm, key, _chunk_nonce(prefix, counter, last))
+        cipher.update(header)
+        try:
+            yield cipher.decrypt_and_verify(frame[:-TAG_SIZE], frame[-TAG_SIZE:])
+        except ValueError as exc:
+            raise StreamAuthenticationError("Неверный ключ или поврежденные данные") from exc
+
@@ -0,0 +1,251 @@
+"""
+Server-side operation history, written behind the crypto responses.
+
+The crypto endpoints hand finished operations to ``record``, which only
+appends a row to an in-process buffer and returns. A background thread
+writes the buffer with one ``bulk_create`` when FLUSH_SIZE rows are
+pending or FLUSH_INTERVAL seconds after the oldest of them arrived, and
+the buffer is flushed once more at interpreter exit (gunicorn workers exit
+through it on a graceful shutdown).
+
+The buffer holds at most MAX_PENDING rows. When the database cannot keep
+up, new rows are dropped and counted instead of making requests wait.
+Long inputs and outputs are packed by ``history_storage`` before they are
+queued, so the bound holds in bytes too.
+
+Clearing a history (``discard``) leaves a mark in the shared cache for
+CLEARED_MARK_TIMEOUT seconds, so every worker drops that user's rows
+queued before the clear instead of writing them after it.
+
+A request opts out with ``?history=false``. Key generation is never
+recorded: its output is a private key.
+"""
+from __future__ import annotations
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from django.core.cache import cache
+from django.db import DatabaseError, IntegrityError, close_old_connections
+from django.utils import timezone
+from .history_storage import row_fields
+from .key_cache import _cache_settings
+
+logger = logging.getLogger(__name__)
+
+RECORDED_OPERATIONS = frozenset({"encrypt", "decrypt", "hash", "sign", "verify"})
+_OPT_OUT = frozenset({"false", "0", "off", "no"})
+# Response keys that hold the result of an operation, by preference.
+_RESULT_KEYS = ("result", "hash", "signature", "encrypted", "decrypted")
+# Long enough for any buffer on any worker to have been flushed.
+CLEARED_MARK_TIMEOUT = 24 * 60 * 60
+
+
+@dataclass(frozen=True)
+class HistoryRecorderStats:
+    enabled: bool
+    pending: int
+    recorded: int
+    written: int
+    dropped: int
+    failed: int
+    flushes: int
+    max_pending: int
+
+
+def wants_history(request) -> bool:
+    return request.query_params.get("history", "true").lower() not in _OPT_OUT
+
+
+def result_text(result: dict) -> str:
+    """Human-readable output of a ``process_request`` result."""
+    for key in _RESULT_KEYS:
+        if key in result:
+            return str(result[key])
+    if "is_valid" in result:
+        return "Верно" if result["is_valid"] else "Неверно"
+    return ""
+
+
+def byte_count(size: int) -> str:
+    return f"{size} байт"
+
+
+def _cleared_key(user_id: int) -> str:
+    return f"security:history:cleared:{user_id}"
+
+
+class HistoryRecorder:
+    def __init__(self, enabled: bool = True, max_pending: int = 10_000, flush_size: int = 200,
+                 flush_interval: float = 1.0):
+        self.enabled = enabled
+        self.max_pending = max(1, max_pending)
+        self.flush_size = max(1, flush_size)
+        self.flush_interval = flush_interval
+        self._pending: deque = deque()
+        self._oldest = 0.0
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        self._recorded = self._written = self._dropped = self._failed = self._flushes = 0
+
+    @classmethod
+    def from_settings(cls, name: str = "CRYPTO_HISTORY_RECORDER") -> "HistoryRecorder":
+        config = _cache_settings(name)
+        return cls(
+            enabled=bool(config.get("ENABLED", True)),
+            max_pending=int(config.get("MAX_PENDING", 10_000)),
+            flush_size=int(config.get("FLUSH_SIZE", 200)),
+            flush_interval=float(config.get("FLUSH_INTERVAL", 1.0)),
+        )
+
+    def record(self, user_id: int, operation_type: str, algorithm: str, input_data: str, output_data: str) -> bool:
+        """Queue one row without touching the database; ``False`` if it was dropped."""
+        if not self.enabled:
+            return False
+        from .models import UserOperationHistory
+        row = UserOperationHistory(
+            user_id=user_id,
+            operation_type=operation_type,
+            algorithm=algorithm,
+            timestamp=timezone.now(),
+            **row_fields(input_data, output_data),
+        )
+        with self._condition:
+            if self._closed or len(self._pending) >= self.max_pending:
+                self._dropped += 1
+                return False
+            if not self._pending:
+                # The writer sleeps until rows arrive; from here it waits FLUSH_INTERVAL at most.
+                self._oldest = time.monotonic()
+                self._condition.notify()
+            self._pending.append(row)
+            self._recorded += 1
+            if len(self._pending) >= self.flush_size:
+                self._condition.notify()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="history-recorder", daemon=True)
+                self._thread.start()
+        return True
+
+    def discard(self, user_id: int) -> None:
+        """
+        Drop the rows of one user queued before now, for a history that is
+        about to be cleared. Waits for a flush in progress, so its rows are
+        written before the clear deletes them, and marks the clear for the
+        other workers. With a cache that is not shared between processes
+        (locmem), rows pending on other workers still appear after the clear.
+        """
+        cache.set(_cleared_key(user_id), timezone.now(), CLEARED_MARK_TIMEOUT)
+        with self._flush_lock, self._condition:
+            self._pending = deque(row for row in self._pending if row.user_id != user_id)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                while not self._closed and len(self._pending) < self.flush_size:
+                    remaining = self._oldest + self.flush_interval - time.monotonic()
+                    if remaining <= 0 or not self._pending:
+                        break
+                    self._condition.wait(remaining)
+                closed = self._closed
+            self.flush()
+            if closed:
+                return
+
+    def flush(self) -> int:
+        """Write everything pending now; returns the number of rows written."""
+        with self._flush_lock:
+            with self._condition:
+                batch = list(self._pending)
+                self._pending.clear()
+            if not batch:
+                return 0
+            close_old_connections()
+            cleared = self._cleared(batch)
+            batch = [row for row in batch if row.user_id not in cleared or row.timestamp > cleared[row.user_id]]
+            written = self._write(batch)
+            self._purge_cleared(batch)
+            with self._condition:
+                self._written += written
+                self._failed += len(batch) - written
+                self._flushes += 1
+            return written
+
+    @staticmethod
+    def _cleared(batch: list) -> dict:
+        """Clear times of the users in ``batch`` whose history was cleared recently, by user id."""
+        keys = {_cleared_key(user_id): user_id for user_id in {row.user_id for row in batch}}
+        return {keys[key]: cleared_at for key, cleared_at in cache.get_many(keys).items()}
+
+    def _purge_cleared(self, batch: list) -> None:
+        """Delete rows of ``batch`` whose history was cleared while they were being written."""
+        from .models import UserOperationHistory
+        try:
+            for user_id, cleared_at in self._cleared(batch).items():
+                UserOperationHistory.objects.filter(user_id=user_id, timestamp__lte=cleared_at).delete()
+        except DatabaseError:
+            logger.exception("Operation history: rows of a cleared history were not deleted")
+
+    def _write(self, batch: list) -> int:
+        from django.contrib.auth import get_user_model
+        from .models import UserOperationHistory
+        try:
+            UserOperationHistory.objects.bulk_create(batch, batch_size=self.flush_size)
+            return len(batch)
+        except IntegrityError:
+            # A user was deleted while their rows were pending; skip those rows.
+            existing = set(
+                get_user_model().objects.filter(pk__in={row.user_id for row in batch}).values_list("pk", flat=True)
+            )
+            batch = [row for row in batch if row.user_id in existing]
+        except DatabaseError:
+            logger.exception("Operation history: %d rows lost", len(batch))
+            return 0
+        try:
+            UserOperationHistory.objects.bulk_create(batch, batch_size=self.flush_size)
+            return len(batch)
+        except DatabaseError:
+            logger.exception("Operation history: %d rows lost", len(batch))
+            return 0
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop the writer thread after a last flush."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self.flush()
+
+    def stats(self) -> HistoryRecorderStats:
+        with self._condition:
+            return HistoryRecorderStats(
+                enabled=self.enabled,
+                pending=len(self._pending),
+                recorded=self._recorded,
+                written=self._written,
+                dropped=self._dropped,
+                failed=self._failed,
+                flushes=self._flushes,
+                max_pending=self.max_pending,
+            )
+
+
+history_recorder = HistoryRecorder.from_settings()
+atexit.register(history_recorder.shutdown)
+
+
+def record(request, operation_type: str, algorithm: str, input_data: str, output_data: str) -> None:
+    """Record one finished operation of ``request`` unless it opted out."""
+    if operation_type not in RECORDED_OPERATIONS or not wants_history(request):
+        return
+    user = request.user
+    if user.is_authenticated:
+        history_recorder.record(user.pk, operation_type, algorithm, input_data, output_data)
@@ -0,0 +1,169 @@
+"""
+Retention of the operation history: a row cap per user, a maximum age and
+batched deletes.
+
+A single DELETE over a large history holds the write lock until every row
+is gone (on SQLite, the lock of the whole database), and every request
+that records history waits behind it. Rows are deleted here BATCH_SIZE at
+a time instead, oldest first along the ``(user, timestamp, id)`` index,
+each batch in its own transaction and followed by a BATCH_PAUSE sleep, so
+a waiting writer gets the lock after one short batch at most.
+
+``prune`` also packs rows written before payloads were compacted (see
+``history_storage``), walking the table by primary key in batches the
+same way.
+"""
+from __future__ import annotations
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.db.models.functions import Length
+from django.utils import timezone
+from . import history, history_storage
+from .key_cache import _cache_settings
+
+_PACKED_FIELDS = (
+    "input_data", "input_digest", "input_body",
+    "output_data", "output_digest", "output_body",
+)
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    # 0 turns a limit off.
+    max_rows_per_user: int = 1000
+    max_age_days: int = 180
+    batch_size: int = 500
+    batch_pause: float = 0.05
+
+    @classmethod
+    def from_settings(cls, name: str = "CRYPTO_HISTORY_RETENTION") -> "RetentionPolicy":
+        config = _cache_settings(name)
+        return cls(
+            max_rows_per_user=max(0, int(config.get("MAX_ROWS_PER_USER", 1000))),
+            max_age_days=max(0, int(config.get("MAX_AGE_DAYS", 180))),
+            batch_size=max(1, int(config.get("BATCH_SIZE", 500))),
+            batch_pause=max(0.0, float(config.get("BATCH_PAUSE", 0.05))),
+        )
+
+
+@dataclass
+class PruneReport:
+    users: int = 0
+    deleted: int = 0
+    compacted: int = 0
+    elapsed_s: float = 0.0
+
+
+def _older_than(timestamp: datetime, pk: int) -> Q:
+    # The redundant bound on timestamp keeps the scan an index range, as in history.page.
+    return (Q(timestamp__lt=timestamp) | Q(timestamp=timestamp, pk__lt=pk)) & Q(timestamp__lte=timestamp)
+
+
+def delete_in_batches(queryset, batch_size: int, pause: float = 0.0) -> int:
+    """
+    Delete the rows of ``queryset`` oldest first, ``batch_size`` rows per
+    transaction; returns the number of rows deleted.
+    """
+    model = queryset.model
+    keys = queryset.order_by("timestamp", "id").values_list("pk", flat=True)
+    deleted = 0
+    while True:
+        # The previous batch is gone, so the next one starts where it ended.
+        pks = list(keys[:batch_size])
+        if not pks:
+            return deleted
+        deleted += model.objects.filter(pk__in=pks).delete()[0]
+        if len(pks) < batch_size:
+            return deleted
+        if pause:
+            time.sleep(pause)
+
+
+def _boundary(queryset, policy: RetentionPolicy, now: datetime) -> tuple[datetime, int] | None:
+    """``(timestamp, id)`` before which the rows of one user's history go, if any do."""
+    boundaries = []
+    if policy.max_age_days:
+        boundaries.append((now - timedelta(days=policy.max_age_days), 0))
+    if policy.max_rows_per_user:
+        keep = policy.max_rows_per_user
+        # The oldest row still kept; one index range scan of max_rows_per_user rows.
+        oldest_kept = list(queryset.order_by(*history.ORDERING).values_list("timestamp", "pk")[keep - 1:keep])
+        if oldest_kept:
+            boundaries.append(oldest_kept[0])
+    return max(boundaries) if boundaries else None
+
+
+def prune_user(user_id: int, policy: RetentionPolicy, now: datetime | None = None) -> int:
+    from .models import UserOperationHistory
+    queryset = UserOperationHistory.objects.filter(user_id=user_id)
+    boundary = _boundary(queryset, policy, now or timezone.now())
+    if boundary is None:
+        return 0
+    return delete_in_batches(queryset.filter(_older_than(*boundary)), policy.batch_size, policy.batch_pause)
+
+
+def clear_user(user_id: int, policy: RetentionPolicy | None = None) -> int:
+    """Delete one user's whole history in batches."""
+    from .models import UserOperationHistory
+    policy = policy or RetentionPolicy.from_settings()
+    return delete_in_batches(
+        UserOperationHistory.objects.filter(user_id=user_id), policy.batch_size, policy.batch_pause,
+    )
+
+
+def compact(policy: RetentionPolicy) -> int:
+    """Pack the payloads of rows stored before compaction; returns the number of rows changed."""
+    from .models import UserOperationHistory
+    threshold = history_storage.compress_threshold()
+    unpacked = UserOperationHistory.objects.alias(
+        input_length=Length("input_data"),
+        output_length=Length("output_data"),
+    ).filter(
+        Q(input_body__isnull=True, input_length__gt=threshold)
+        | Q(output_body__isnull=True, output_length__gt=threshold)
+    ).order_by("pk")
+    compacted = last_pk = 0
+    while True:
+        rows = list(unpacked.filter(pk__gt=last_pk)[:policy.batch_size])
+        if not rows:
+            return compacted
+        for row in rows:
+            for prefix in ("input", "output"):
+                if getattr(row, f"{prefix}_body") is None:
+                    payload = history_storage.pack(getattr(row, f"{prefix}_data"))
+                    setattr(row, f"{prefix}_data", payload.data)
+                    setattr(row, f"{prefix}_digest", payload.digest)
+                    setattr(row, f"{prefix}_body", payload.body)
+        UserOperationHistory.objects.bulk_update(rows, _PACKED_FIELDS)
+        compacted += len(rows)
+        last_pk = rows[-1].pk
+        if len(rows) < policy.batch_size:
+            return compacted
+        if policy.batch_pause:
+            time.sleep(policy.batch_pause)
+
+
+def prune(policy: RetentionPolicy | None = None, compact_payloads: bool = True) -> PruneReport:
+    """Apply ``policy`` to the history of every user, then pack old payloads."""
+    policy = policy or RetentionPolicy.from_settings()
+    report = PruneReport()
+    started = time.perf_counter()
+    now = timezone.now()
+    if policy.max_rows_per_user or policy.max_age_days:
+        users = get_user_model().objects.order_by("pk").values_list("pk", flat=True)
+        last_pk = 0
+        while True:
+            user_ids = list(users.filter(pk__gt=last_pk)[:policy.batch_size])
+            for user_id in user_ids:
+                report.deleted += prune_user(user_id, policy, now)
+            report.users += len(user_ids)
+            if len(user_ids) < policy.batch_size:
+                break
+            last_pk = user_ids[-1]
+    if compact_payloads:
+        report.compacted = compact(policy)
+    report.elapsed_s = round(time.perf_counter() - started, 3)
+    return report
@@ -0,0 +1,79 @@
+"""
+Compact storage of operation history inputs and outputs.
+
+Clients used to store whole ciphertexts and file summaries in the history,
+so every row could be as large as the request that produced it, and every
+history page read all of it back. An input or output longer than
+COMPRESS_THRESHOLD characters is now stored as three parts:
+
+* ``*_data``: a preview of its first PREVIEW_CHARS characters, the only
+  part the history pages read;
+* ``*_digest``: the SHA-256 of the whole payload, so a client can still
+  recognise a ciphertext it holds;
+* ``*_body``: the payload, cut to MAX_BODY_CHARS, compressed with zlib,
+  and read only by the detail endpoint.
+
+Shorter payloads are stored whole in ``*_data`` with no digest or body.
+"""
+from __future__ import annotations
+import hashlib
+import zlib
+from dataclasses import dataclass
+from .key_cache import _cache_settings
+
+_ELLIPSIS = "…"
+
+
+@dataclass(frozen=True)
+class StoredPayload:
+    data: str
+    digest: str = ""
+    body: bytes | None = None
+
+
+def _limits() -> tuple[int, int, int]:
+    """``(compress_threshold, preview_chars, max_body_chars)`` from CRYPTO_HISTORY_STORAGE."""
+    config = _cache_settings("CRYPTO_HISTORY_STORAGE")
+    preview_chars = max(1, int(config.get("PREVIEW_CHARS", 256)))
+    threshold = max(preview_chars, int(config.get("COMPRESS_THRESHOLD", 512)))
+    return threshold, preview_chars, max(1, int(config.get("MAX_BODY_CHARS", 4096)))
+
+
+def compress_threshold() -> int:
+    return _limits()[0]
+
+
+def _cut(text: str, chars: int) -> str:
+    if len(text) <= chars:
+        return text
+    return text[:chars - 1] + _ELLIPSIS
+
+
+def pack(text: str) -> StoredPayload:
+    """Split ``text`` into preview, digest and compressed body once it exceeds the threshold."""
+    threshold, preview_chars, max_body_chars = _limits()
+    if len(text) <= threshold:
+        return StoredPayload(text)
+    return StoredPayload(
+        data=_cut(text, preview_chars),
+        digest=hashlib.sha256(text.encode()).hexdigest(),
+        body=zlib.compress(_cut(text, max_body_chars).encode()),
+    )
+
+
+def unpack(data: str, body: bytes | None) -> str:
+    """The stored payload: the body when there is one, the data otherwise."""
+    if body is None:
+        return data
+    return zlib.decompress(body).decode()
+
+
+def row_fields(input_text: str, output_text: str) -> dict:
+    """Model field values for a UserOperationHistory row with these payloads."""
+    fields = {}
+    for prefix, text in (("input", input_text), ("output", output_text)):
+        payload = pack(text)
+        fields[f"{prefix}_data"] = payload.data
+        fields[f"{prefix}_digest"] = payload.digest
+        fields[f"{prefix}_body"] = payload.body
+    return fields
@@ -0,0 +1,166 @@
+from __future__ import annotations
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+
+def _cache_settings(name: str) -> dict:
+    """Read a cache config dict from Django settings, tolerating plain scripts."""
+    try:
+        return getattr(settings, name, {}) or {}
+    except ImproperlyConfigured:
+        return {}
+
+
+def cache_key(namespace: str, *parts: str | bytes) -> str:
+    """
+    Build a cache key from a digest of the key material, so raw keys
+    are never kept as dictionary keys.
+    """
+    digest = hashlib.sha256(namespace.encode("utf-8"))
+    for part in parts:
+        digest.update(b"\x00")
+        digest.update(part.encode("utf-8") if isinstance(part, str) else part)
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    size: int
+    max_entries: int
+    ttl: float
+    enabled: bool
+
+
+class BoundedTTLCache:
+    """
+    Thread-safe LRU cache with a size bound and per-entry TTL.
+
+    Values are built by the caller-supplied factory outside the lock, so a
+    slow parse never blocks readers of other entries. ``on_evict`` is called
+    for every value that leaves the cache (LRU, TTL or ``clear``).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl: float = 3600.0,
+        enabled: bool = True,
+        on_evict: Callable[[Any], None] | None = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.enabled = enabled
+        self._on_evict = on_evict
+        self._data: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    @classmethod
+    def from_settings(cls, name: str, **defaults) -> "BoundedTTLCache":
+        config = _cache_settings(name)
+        return cls(
+            max_entries=config.get("MAX_ENTRIES", defaults.get("max_entries", 256)),
+            ttl=config.get("TTL", defaults.get("ttl", 3600.0)),
+            enabled=config.get("ENABLED", defaults.get("enabled", True)),
+            on_evict=defaults.get("on_evict"),
+        )
+
+    def get_or_create(self, key: str, factory: Callable[[], Any]) -> Any:
+        if not self.enabled or self.max_entries <= 0:
+            return factory()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._data.move_to_end(key)
+                    self._hits += 1
+                    return value
+                del self._data[key]
+                self._expirations += 1
+                self._discard(value)
+            self._misses += 1
+
+        value = factory()
+
+        with self._lock:
+            existing = self._data.get(key)
+            if existing is not None:
+                # Another thread filled the slot while we were building ours.
+                return existing[0]
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            while len(self._data) > self.max_entries:
+                _, (evicted, _) = self._data.popitem(last=False)
+                self._evictions += 1
+                self._discard(evicted)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            values = [value for value, _ in self._data.values()]
+            self._data.clear()
+            for value in values:
+                self._discard(value)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                size=len(self._data),
+                max_entries=self.max_entries,
+                ttl=self.ttl,
+                enabled=self.enabled,
+            )
+
+    def _discard(self, value: Any) -> None:
+        if self._on_evict is not None:
+            try:
+                self._on_evict(value)
+            except Exception:
+                pass
+
+
+def wipe_secret(value: Any) -> None:
+    """Best-effort zeroing of mutable key material leaving the cache."""
+    if isinstance(value, bytearray):
+        value[:] = bytes(len(value))
+
+
+@dataclass(frozen=True)
+class ParsedKey:
+    """
+    Parsed key object together with a ready-to-use signature scheme
+    (``pss``/``DSS`` signer or verifier) bound to it.
+    """
+    key: Any
+    scheme: Any
+
+
+# Process-wide cache of parsed RSA/ECC keys, see CRYPTO_KEY_CACHE in settings.
+key_object_cache = BoundedTTLCache.from_settings("CRYPTO_KEY_CACHE")
+
+# Derived symmetric keys and reusable cipher key schedules, see
+# CRYPTO_DERIVED_KEY_CACHE in settings.
+derived_key_cache = BoundedTTLCache.from_settings(
+    "CRYPTO_DERIVED_KEY_CACHE",
+    ttl=600.0,
+    on_evict=wipe_secret,
+)
@@ -0,0 +1,288 @@
+"""
+Pool of pre-generated RSA/ECC key pairs and ephemeral ECDH keys.
+
+Generating a 2048-bit RSA key takes hundreds of milliseconds and a 4096-bit
+one several seconds, which is too long to do inside a request when a whole
+class asks for keys at once. The pool keeps a stock of key pairs for each
+configured (algorithm, size/curve) spec and refills it on the shared worker
+process pool whenever the stock drops below the low-water mark.
+
+The worker processes also run interactive work such as ``crypto/batch/``,
+so a refill never floods them: at most MAX_IN_FLIGHT keys (one by default)
+are being generated at any time, and each finished key starts the next
+one. The rest of a refill waits in the pool's own queue, where a batch
+does not have to wait behind it.
+
+Each key pair is removed from the pool when handed out, so it is given to
+exactly one caller. When the stock is empty the caller waits a short while
+for a key that is already being generated and then falls back to inline
+generation. Keys live only in the memory of the server process that owns
+the pool. Inside a worker process (a keygen item of ``crypto/batch/``) the
+pool is not used: keys are generated directly, so a worker never starts a
+pool of its own or refills a stock next to the batch it runs.
+"""
+from __future__ import annotations
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Union
+from . import worker_pool
+from .crypto_service import (
+    ECCKeyPair,
+    ECDHEphemeral,
+    RSAKeyPair,
+    generate_ecc_keypair,
+    generate_ecdh_ephemeral,
+    generate_rsa_keypair,
+)
+from .key_cache import _cache_settings
+
+KeyPair = Union[RSAKeyPair, ECCKeyPair, ECDHEphemeral]
+
+# Module-level functions, so they can be sent to worker processes.
+_GENERATORS = {
+    "rsa": generate_rsa_keypair,
+    "ecc": generate_ecc_keypair,
+    "ecdh": generate_ecdh_ephemeral,
+}
+
+
+@dataclass(frozen=True)
+class KeyPoolStats:
+    spec: str
+    depth: int
+    in_flight: int
+    queued: int
+    low_water: int
+    target: int
+    hits: int
+    misses: int
+    generated: int
+    failures: int
+    wait_avg_ms: float
+    wait_max_ms: float
+
+
+class _SpecPool:
+    def __init__(self, algorithm: str, size: str, low_water: int, target: int, max_wait: float):
+        self.algorithm = algorithm
+        self.size = int(size) if algorithm == "rsa" else size
+        self.low_water = low_water
+        self.target = max(target, low_water)
+        self.max_wait = max_wait
+        self.keys: deque[KeyPair] = deque()
+        # Submitted to an executor / still to be submitted.
+        self.in_flight = 0
+        self.queued = 0
+        self.hits = 0
+        self.misses = 0
+        self.generated = 0
+        self.failures = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.takes = 0
+
+    def record_wait(self, seconds: float) -> None:
+        self.takes += 1
+        self.wait_total += seconds
+        self.wait_max = max(self.wait_max, seconds)
+
+
+def _spec_name(algorithm: str, size) -> str:
+    return f"{algorithm}:{size}"
+
+
+class KeyPool:
+    def __init__(
+        self,
+        specs: dict[str, dict] | None = None,
+        enabled: bool = True,
+        max_wait: float = 0.5,
+        max_in_flight: int = 1,
+    ):
+        self.enabled = enabled
+        self.max_wait = max_wait
+        self.max_in_flight = max(1, max_in_flight)
+        self._in_flight = 0
+        self._turn = 0
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._pools: dict[str, _SpecPool] = {}
+        self._threads: ThreadPoolExecutor | None = None
+        self._local = threading.local()
+        for name, config in (specs or {}).items():
+            algorithm, _, size = name.partition(":")
+            if algorithm not in _GENERATORS:
+                continue
+            self._pools[_spec_name(algorithm, size)] = _SpecPool(
+                algorithm,
+                size,
+                low_water=int(config.get("LOW_WATER", 0)),
+                target=int(config.get("TARGET", 0)),
+                max_wait=float(config.get("MAX_WAIT", max_wait)),
+            )
+
+    @classmethod
+    def from_settings(cls, name: str = "CRYPTO_KEY_POOL") -> "KeyPool":
+        config = _cache_settings(name)
+        return cls(
+            specs=config.get("SPECS", {}),
+            enabled=config.get("ENABLED", True),
+            max_wait=float(config.get("MAX_WAIT", 0.5)),
+            max_in_flight=int(config.get("MAX_IN_FLIGHT", 1)),
+        )
+
+    def acquire(self, algorithm: str, size) -> KeyPair:
+        """
+        Hand out one key pair for ``algorithm`` and ``size`` (RSA bits or
+        ECC curve name). Specs without a pool, and every spec in a worker
+        process, are generated inline.
+        """
+        pool = self._pools.get(_spec_name(algorithm, size)) if self.enabled and not worker_pool.in_worker() else None
+        if pool is None:
+            return _GENERATORS[algorithm](size)
+
+        started = time.perf_counter()
+        with self._lock:
+            deadline = started + pool.max_wait
+            while not pool.keys and pool.in_flight:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._changed.wait(remaining)
+            keypair = pool.keys.popleft() if pool.keys else None
+            if keypair is not None:
+                pool.hits += 1
+                pool.record_wait(time.perf_counter() - started)
+            self._reserve_locked(pool)
+            started_pools = self._dispatch_locked()
+        self._start(started_pools)
+
+        if keypair is not None:
+            return keypair
+
+        keypair = _GENERATORS[algorithm](size)
+        with self._lock:
+            pool.misses += 1
+            pool.record_wait(time.perf_counter() - started)
+        return keypair
+
+    def prewarm(self) -> None:
+        """Start filling every configured spec up to its target."""
+        if not self.enabled or worker_pool.in_worker():
+            return
+        with self._lock:
+            for pool in self._pools.values():
+                self._reserve_locked(pool, force=True)
+            started_pools = self._dispatch_locked()
+        self._start(started_pools)
+
+    def stats(self) -> list[KeyPoolStats]:
+        with self._lock:
+            return [
+                KeyPoolStats(
+                    spec=name,
+                    depth=len(pool.keys),
+                    in_flight=pool.in_flight,
+                    queued=pool.queued,
+                    low_water=pool.low_water,
+                    target=pool.target,
+                    hits=pool.hits,
+                    misses=pool.misses,
+                    generated=pool.generated,
+                    failures=pool.failures,
+                    wait_avg_ms=round(pool.wait_total / pool.takes * 1000, 3) if pool.takes else 0.0,
+                    wait_max_ms=round(pool.wait_max * 1000, 3),
+                )
+                for name, pool in self._pools.items()
+            ]
+
+    def clear(self) -> None:
+        with self._lock:
+            for pool in self._pools.values():
+                pool.keys.clear()
+                pool.queued = 0
+
+    @staticmethod
+    def _reserve_locked(pool: _SpecPool, force: bool = False) -> None:
+        """Queue the keys that bring ``pool`` back up to its target."""
+        stock = len(pool.keys) + pool.in_flight + pool.queued
+        if not force and stock >= pool.low_water:
+            return
+        pool.queued += max(pool.target - stock, 0)
+
+    def _dispatch_locked(self) -> list[_SpecPool]:
+        """Move queued keys in flight, round-robin over the specs, up to max_in_flight."""
+        started = []
+        pools = list(self._pools.values())
+        while self._in_flight < self.max_in_flight and any(pool.queued for pool in pools):
+            pool = pools[self._turn % len(pools)]
+            self._turn += 1
+            if pool.queued:
+                pool.queued -= 1
+                pool.in_flight += 1
+                self._in_flight += 1
+                started.append(pool)
+        return started
+
+    def _start(self, pools: list[_SpecPool]) -> None:
+        local = self._local
+        if getattr(local, "starting", None) is not None:
+            # A future that was already done ran its callback inside
+            # add_done_callback; let the loop below start the next key
+            # instead of recursing once per key.
+            local.starting.extend(pools)
+            return
+        local.starting = list(pools)
+        try:
+            while local.starting:
+                pool = local.starting.pop()
+                try:
+                    future = self._submit(pool)
+                except RuntimeError:
+                    # The interpreter is shutting down; drop the refill.
+                    self._abandon(pool)
+                    continue
+                future.add_done_callback(lambda done, pool=pool: self._on_generated(pool, done))
+        finally:
+            local.starting = None
+
+    def _submit(self, pool: _SpecPool) -> Future:
+        generator = _GENERATORS[pool.algorithm]
+        executor = worker_pool.get_executor()
+        if executor is not None:
+            try:
+                return executor.submit(generator, pool.size)
+            except (BrokenProcessPool, RuntimeError):
+                worker_pool.shutdown(wait=False)
+        # No usable worker processes: generate on one background thread.
+        with self._lock:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(max_workers=1, thread_name_prefix="key-pool")
+        return self._threads.submit(generator, pool.size)
+
+    def _abandon(self, pool: _SpecPool) -> None:
+        with self._lock:
+            pool.in_flight -= 1
+            self._in_flight -= 1
+            pool.queued = 0
+            self._changed.notify_all()
+
+    def _on_generated(self, pool: _SpecPool, future: Future) -> None:
+        with self._lock:
+            pool.in_flight -= 1
+            self._in_flight -= 1
+            if future.cancelled() or future.exception() is not None:
+                pool.failures += 1
+            else:
+                pool.keys.append(future.result())
+                pool.generated += 1
+            self._changed.notify_all()
+            started_pools = self._dispatch_locked()
+        self._start(started_pools)
+
+
+key_pool = KeyPool.from_settings()
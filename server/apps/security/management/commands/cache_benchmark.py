@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from apps.security import cache_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает бэкенды кэша (общий mmap-кэш, locmem, FileBasedCache) при одновременной "
+        "работе нескольких процессов: операций в секунду, доля попаданий, p50/p99 задержки"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--backend", action="append", dest="backends",
+                            choices=sorted(cache_benchmark.BACKENDS),
+                            help="Бэкенд (можно указать несколько раз)")
+        parser.add_argument("--processes", action="append", type=int,
+                            help="Число процессов (можно указать несколько раз)")
+        parser.add_argument("--operations", type=int, default=cache_benchmark.Workload.operations,
+                            help="Операций на процесс")
+        parser.add_argument("--keys", type=int, default=cache_benchmark.Workload.keys,
+                            help="Число различных ключей")
+        parser.add_argument("--value-size", type=int, default=cache_benchmark.Workload.value_size,
+                            help="Размер значения, байт")
+        parser.add_argument("--write-ratio", type=float, default=cache_benchmark.Workload.write_ratio,
+                            help="Доля безусловных записей")
+
+    def handle(self, *args, **options):
+        workload = cache_benchmark.Workload(
+            operations=options["operations"],
+            keys=options["keys"],
+            value_size=options["value_size"],
+            write_ratio=options["write_ratio"],
+        )
+        backends = options["backends"] or list(cache_benchmark.BACKENDS)
+        self.stdout.write(f"{'backend':<8} {'procs':>5} {'ops/s':>11} {'hit rate':>9} {'p50 us':>9} {'p99 us':>9}")
+        for processes in options["processes"] or [1, 4, 8]:
+            for backend in backends:
+                result = cache_benchmark.run(backend, processes, workload)
+                self.stdout.write(
+                    f"{result.backend:<8} {result.processes:>5} {result.ops_per_second:>11.1f} "
+                    f"{result.hit_rate:>9.2%} {result.p50_us:>9.1f} {result.p99_us:>9.1f}"
+                )
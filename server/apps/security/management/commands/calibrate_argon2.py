@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.security.argon2_calibration import argon2_calibrator
+
+
+class Command(BaseCommand):
+    help = (
+        "Подбирает параметры Argon2 (time_cost, memory_cost, parallelism), при которых хэширование "
+        "на этом хосте укладывается в целевое время и память из CRYPTO_ARGON2_CALIBRATION, "
+        "и сохраняет их как параметры по умолчанию"
+    )
+
+    def handle(self, *args, **options):
+        profile = argon2_calibrator.recalibrate()
+        if profile.source == "default":
+            raise CommandError("Argon2 не доступен. Установите argon2-cffi: pip install argon2-cffi")
+        parameters = profile.parameters
+        self.stdout.write(self.style.SUCCESS(
+            f"{profile.host}: time_cost={parameters.time_cost}, memory_cost={parameters.memory_cost} КиБ, "
+            f"parallelism={parameters.parallelism}, hash_len={parameters.hash_len}; "
+            f"{profile.measured_ms} мс при цели {profile.target_ms} мс"
+        ))
@@ -0,0 +1,128 @@
+import json
+from pathlib import Path
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from apps.security import benchmark
+from apps.security.argon2_calibration import DEFAULT_PROFILE
+
+BASELINE_DIR = Path(settings.BASE_DIR) / "benchmarks" / "baselines"
+QUICK_MAX_SIZE = 64 * 1024
+# Fixed Argon2 costs rather than this host's calibrated ones, so that runs
+# stay comparable with baselines recorded elsewhere.
+PINNED_ARGON2 = DEFAULT_PROFILE.parameters
+
+
+class Command(BaseCommand):
+    help = (
+        "Замеряет скорость алгоритмов CryptoEngine по сетке алгоритм × операция × "
+        "режим × размер данных, сохраняет результат в JSON и сравнивает его с базовой линией"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--algorithm", action="append", dest="algorithms",
+                            help="Алгоритм (можно указать несколько раз)")
+        parser.add_argument("--operation", action="append", dest="operations",
+                            help="Операция (можно указать несколько раз)")
+        parser.add_argument("--mode", action="append", dest="modes", choices=benchmark.MODES,
+                            help="Режим данных (можно указать несколько раз)")
+        parser.add_argument("--size", action="append", dest="sizes", type=int,
+                            help="Размер данных в байтах (можно указать несколько раз)")
+        parser.add_argument("--max-size", type=int, help="Не замерять данные больше этого размера")
+        parser.add_argument("--quick", action="store_true",
+                            help=f"Короткий прогон: данные до {QUICK_MAX_SIZE} байт, 0.1 с на ячейку")
+        parser.add_argument("--min-time", type=float, default=0.5, help="Минимальное время замера ячейки, с")
+        parser.add_argument("--min-repeats", type=int, default=5)
+        parser.add_argument("--max-repeats", type=int, default=1000)
+        parser.add_argument("--output", help="Записать результат в JSON-файл")
+        parser.add_argument("--baseline", help="Сравнить с базовой линией (путь или имя в benchmarks/baselines)")
+        parser.add_argument("--confirm", type=int, default=2,
+                            help="Сколько раз перемерить ухудшившиеся ячейки, прежде чем считать ухудшение")
+        parser.add_argument("--threshold", type=float, default=benchmark.DEFAULT_THRESHOLD,
+                            help="Допустимое ухудшение, доля (0.1 = 10%%)")
+
+    def handle(self, *args, **options):
+        baseline = self._load_baseline(options["baseline"]) if options["baseline"] else None
+
+        sizes = options["sizes"] or benchmark.SIZES
+        max_size = options["max_size"]
+        min_time = options["min_time"]
+        if options["quick"]:
+            max_size = min(max_size or QUICK_MAX_SIZE, QUICK_MAX_SIZE)
+            min_time = min(min_time, 0.1)
+        if max_size is not None:
+            sizes = [size for size in sizes if size <= max_size]
+
+        selected = benchmark.cells(options["algorithms"], options["operations"], options["modes"], sizes)
+        if not selected:
+            raise CommandError("Под заданные фильтры не попала ни одна ячейка")
+
+        self.stdout.write(f"{'cell':<40} {'calls':>7} {'p50 ms':>11} {'p99 ms':>11} {'MB/s':>9} {'peak KiB':>10}")
+        results = benchmark.run(
+            selected,
+            min_time=min_time,
+            min_repeats=options["min_repeats"],
+            max_repeats=options["max_repeats"],
+            progress=self._report,
+            argon2_parameters=PINNED_ARGON2,
+        )
+        document = benchmark.to_document(results)
+
+        if baseline is not None:
+            for _ in range(options["confirm"]):
+                regressions = benchmark.compare(baseline, document, options["threshold"])
+                if not regressions:
+                    break
+                recheck = [benchmark.BenchmarkCell.from_key(key) for key in {r.key for r in regressions}]
+                self.stdout.write(f"Перемеряются ячейки с ухудшением: {len(recheck)}")
+                benchmark.keep_best(document, benchmark.run(
+                    recheck,
+                    min_time=min_time,
+                    min_repeats=options["min_repeats"],
+                    max_repeats=options["max_repeats"],
+                    argon2_parameters=PINNED_ARGON2,
+                ))
+
+        if options["output"]:
+            path = Path(options["output"])
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(document, indent=1, ensure_ascii=False) + "\n", encoding="utf-8")
+            self.stdout.write(f"Результат записан в {path}")
+
+        if baseline is not None:
+            self._compare(baseline, document, options["threshold"])
+
+    def _report(self, result: benchmark.BenchmarkResult) -> None:
+        mb_per_s = f"{result.mb_per_s:.1f}" if result.mb_per_s is not None else "-"
+        self.stdout.write(
+            f"{result.key:<40} {result.repeats:>7} {result.p50_ms:>11.4f} {result.p99_ms:>11.4f} "
+            f"{mb_per_s:>9} {result.peak_memory_kib:>10.1f}"
+        )
+
+    @staticmethod
+    def _load_baseline(name: str) -> dict:
+        path = Path(name)
+        if not path.exists() and not path.is_absolute():
+            path = BASELINE_DIR / (name if name.endswith(".json") else f"{name}.json")
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Не удалось прочитать базовую линию {path}: {exc}")
+
+    def _compare(self, baseline: dict, document: dict, threshold: float) -> None:
+        compared = len(baseline["results"].keys() & document["results"].keys())
+        regressions = benchmark.compare(baseline, document, threshold)
+        if baseline.get("environment") != document["environment"]:
+            self.stdout.write(self.style.WARNING(
+                "Базовая линия снята в другом окружении, сравнение может быть неточным"
+            ))
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS(
+                f"Сравнено ячеек: {compared}, ухудшений больше {threshold:.0%} нет"
+            ))
+            return
+        for regression in regressions:
+            self.stdout.write(self.style.ERROR(
+                f"{regression.key} {regression.metric}: {regression.baseline} -> {regression.current} "
+                f"({regression.change:+.0%})"
+            ))
+        raise CommandError(f"Ухудшение больше {threshold:.0%} в {len(regressions)} ячейках из {compared}")
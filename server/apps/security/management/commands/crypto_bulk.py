@@ -0,0 +1,85 @@
+import json
+import os
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+from apps.security import bulk_crypto
+from apps.security.file_stream import ALGORITHM_IDS, DEFAULT_CHUNK_SIZE, MAX_CHUNK_SIZE, MIN_CHUNK_SIZE
+
+KEY_ENVIRONMENT_VARIABLE = "CRYPTO_BULK_KEY"
+
+
+class Command(BaseCommand):
+    help = (
+        "Шифрует или расшифровывает все файлы каталога в потоковом формате сервиса "
+        "(совместимо с files/encrypt и files/decrypt). Большие файлы делятся на сегменты, "
+        "которые обрабатываются параллельно в пуле процессов; результат описывается манифестом "
+        "с хешами и временем обработки каждого файла"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("operation", choices=bulk_crypto.OPERATIONS)
+        parser.add_argument("source", help="Каталог с исходными файлами")
+        parser.add_argument("target", help="Каталог для результата")
+        key = parser.add_mutually_exclusive_group()
+        key.add_argument("--key", help=f"Ключ (по умолчанию из переменной {KEY_ENVIRONMENT_VARIABLE})")
+        key.add_argument("--key-file", help="Файл с ключом")
+        parser.add_argument("--algorithm", choices=sorted(ALGORITHM_IDS), default="aes-gcm",
+                            help="Алгоритм шифрования (для расшифровки берется из заголовка файла)")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                            help=f"Размер блока потока, байт ({MIN_CHUNK_SIZE}–{MAX_CHUNK_SIZE})")
+        parser.add_argument("--segment-size", type=int, default=bulk_crypto.DEFAULT_SEGMENT_SIZE,
+                            help="Файлы больше этого размера делятся на сегменты для параллельной обработки, байт")
+        parser.add_argument("--manifest", help=f"Путь манифеста (по умолчанию target/{bulk_crypto.MANIFEST_NAME})")
+
+    def handle(self, *args, **options):
+        source = Path(options["source"]).resolve()
+        target = Path(options["target"]).resolve()
+        if not source.is_dir():
+            raise CommandError(f"Каталог не найден: {source}")
+        if source == target:
+            raise CommandError("Каталог результата должен отличаться от исходного")
+        if not MIN_CHUNK_SIZE <= options["chunk_size"] <= MAX_CHUNK_SIZE:
+            raise CommandError(f"Размер блока должен быть от {MIN_CHUNK_SIZE} до {MAX_CHUNK_SIZE} байт")
+        if options["segment_size"] < options["chunk_size"]:
+            raise CommandError("Размер сегмента не может быть меньше размера блока")
+
+        target.mkdir(parents=True, exist_ok=True)
+        manifest = bulk_crypto.run(
+            options["operation"],
+            source,
+            target,
+            self._key(options),
+            algorithm=options["algorithm"],
+            chunk_size=options["chunk_size"],
+            segment_size=options["segment_size"],
+        )
+
+        path = Path(options["manifest"]) if options["manifest"] else target / bulk_crypto.MANIFEST_NAME
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(manifest, indent=1, ensure_ascii=False) + "\n", encoding="utf-8")
+
+        for record in manifest["files"]:
+            if record["status"] != "ok":
+                self.stdout.write(self.style.ERROR(f"{record['path']}: {record['error']}"))
+            elif options["verbosity"] >= 2:
+                self.stdout.write(f"{record['path']} -> {record['output']} ({record['elapsed_ms']} мс)")
+        seconds = manifest["elapsed_ms"] / 1000
+        mb_per_s = manifest["bytes_in"] / 1e6 / seconds if seconds else 0.0
+        self.stdout.write(
+            f"Файлов: {manifest['files_total']}, ошибок: {manifest['files_failed']}, "
+            f"{manifest['bytes_in']} байт за {seconds:.2f} с ({mb_per_s:.1f} МБ/с). Манифест: {path}"
+        )
+        if manifest["files_failed"]:
+            raise CommandError(f"Не удалось обработать файлов: {manifest['files_failed']}")
+
+    @staticmethod
+    def _key(options) -> str:
+        if options["key_file"]:
+            try:
+                return Path(options["key_file"]).read_text(encoding="utf-8").strip()
+            except OSError as exc:
+                raise CommandError(f"Не удалось прочитать ключ: {exc}")
+        key = options["key"] or os.getenv(KEY_ENVIRONMENT_VARIABLE)
+        if not key:
+            raise CommandError(f"Укажите --key, --key-file или переменную {KEY_ENVIRONMENT_VARIABLE}")
+        return key
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+from apps.security.crypto_service import ALGORITHM_REGISTRY
+from apps.security.measurements import MeasurementInProgress, measure_host
+
+
+class Command(BaseCommand):
+    help = (
+        "Замеряет скорость реализованных алгоритмов на этом хосте и сохраняет результат "
+        "для сравнения алгоритмов. Перемеряются только устаревшие замеры"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--algorithm", action="append", dest="algorithms",
+                            choices=ALGORITHM_REGISTRY.names(),
+                            help="Алгоритм (можно указать несколько раз)")
+        parser.add_argument("--force", action="store_true", help="Перемерить все ячейки, даже свежие")
+
+    def handle(self, *args, **options):
+        try:
+            report = measure_host(options["algorithms"], force=options["force"])
+        except MeasurementInProgress as exc:
+            raise CommandError(str(exc))
+        for key in report.measured:
+            self.stdout.write(f"замерено  {key}")
+        for key in report.fresh:
+            self.stdout.write(f"актуально {key}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{report.host}: замерено {len(report.measured)}, актуальных {len(report.fresh)}"
+        ))
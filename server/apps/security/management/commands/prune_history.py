@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from apps.security.history_retention import RetentionPolicy, prune
+
+
+class Command(BaseCommand):
+    help = (
+        "Удаляет из истории операций записи сверх лимита на пользователя и старше заданного "
+        "срока (CRYPTO_HISTORY_RETENTION) небольшими пачками, чтобы не блокировать запись истории, "
+        "и сжимает длинные входные данные и результаты старых записей"
+    )
+
+    def add_arguments(self, parser):
+        defaults = RetentionPolicy.from_settings()
+        parser.add_argument("--max-rows", type=int, default=defaults.max_rows_per_user,
+                            help="Сколько последних записей оставить каждому пользователю (0 - без лимита)")
+        parser.add_argument("--max-age-days", type=int, default=defaults.max_age_days,
+                            help="Удалить записи старше стольких дней (0 - без лимита)")
+        parser.add_argument("--batch-size", type=int, default=defaults.batch_size,
+                            help="Строк в одной транзакции")
+        parser.add_argument("--pause", type=float, default=defaults.batch_pause,
+                            help="Пауза между пачками, с")
+        parser.add_argument("--no-compact", action="store_true",
+                            help="Не сжимать данные записей, сохраненных до сжатия")
+
+    def handle(self, *args, **options):
+        policy = RetentionPolicy(
+            max_rows_per_user=max(0, options["max_rows"]),
+            max_age_days=max(0, options["max_age_days"]),
+            batch_size=max(1, options["batch_size"]),
+            batch_pause=max(0.0, options["pause"]),
+        )
+        report = prune(policy, compact_payloads=not options["no_compact"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Пользователей: {report.users}, удалено записей: {report.deleted}, "
+            f"сжато записей: {report.compacted} за {report.elapsed_s:.2f} с"
+        ))
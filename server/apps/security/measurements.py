@@ -0,0 +1,200 @@
+"""
+On-host speed measurements for the algorithm comparison table.
+
+Each algorithm is measured on a small profile of benchmark cells: its main
+operations at a reference payload size, through the raw-bytes path where
+the engine has one. Results are stored per host in AlgorithmMeasurement.
+A run only re-measures stale cells: missing ones, ones older than
+MAX_AGE_HOURS, and ones measured on another CPU or with other library
+versions. Argon2 is measured at the costs requests get on this host, so
+its cells also go stale when the host is recalibrated.
+
+The comparison list reads the measurements through the Django cache; a
+run that stores new numbers drops the cached copy.
+"""
+from __future__ import annotations
+import platform
+import threading
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from . import benchmark
+from .argon2_calibration import argon2_calibrator
+from .crypto_service import ALGORITHM_REGISTRY
+from .key_cache import _cache_settings
+from .models import AlgorithmMeasurement
+
+REFERENCE_SIZE = 1024 * 1024
+# Payload sizes for algorithms whose cost is not about bulk data.
+PROFILE_SIZES = {
+    "argon2": 64,
+    "ecc": 1024,
+    "rsa": 1024,
+}
+PROFILE_OPERATIONS = ("encrypt", "decrypt", "hash", "sign", "verify")
+# Preferred data path per operation: raw bytes where the engine has one.
+_MODE_PREFERENCE = ("raw", "text", "binary")
+CACHE_KEY = "security:algorithm-measurements"
+
+_run_lock = threading.Lock()
+
+
+class MeasurementInProgress(Exception):
+    """Raised when a measurement run is already going on in this process."""
+
+
+@dataclass(frozen=True)
+class MeasurementReport:
+    host: str
+    measured: list[str]
+    fresh: list[str]
+
+
+def host_name() -> str:
+    return platform.node() or "localhost"
+
+
+def library_versions() -> dict:
+    environment = benchmark.environment()
+    return {
+        "python": environment["python"],
+        "pycryptodome": environment["pycryptodome"],
+        "argon2_cffi": environment["argon2_cffi"],
+    }
+
+
+def cell_versions(algorithm: str, versions: dict) -> dict:
+    """What a cell's measurement depends on besides the CPU: library versions, and the costs for Argon2."""
+    if algorithm == "argon2":
+        return {**versions, "argon2_parameters": asdict(argon2_calibrator.parameters())}
+    return versions
+
+
+def profile_cells(algorithms=None) -> list[benchmark.BenchmarkCell]:
+    """One cell per (algorithm, operation) of the profile."""
+    selected = []
+    for algorithm in algorithms or ALGORITHM_REGISTRY.names():
+        size = PROFILE_SIZES.get(algorithm, REFERENCE_SIZE)
+        limit = benchmark.SIZE_LIMITS.get(algorithm)
+        if limit is not None:
+            size = min(size, limit)
+        by_operation = {}
+        for cell in benchmark.cells([algorithm], PROFILE_OPERATIONS, sizes=[size]):
+            by_operation.setdefault(cell.operation, []).append(cell)
+        for operation, candidates in by_operation.items():
+            selected.append(min(candidates, key=lambda cell: _MODE_PREFERENCE.index(cell.mode)))
+    return selected
+
+
+def _is_stale(row: AlgorithmMeasurement | None, cpu_model: str, versions: dict, max_age: timedelta) -> bool:
+    return (
+        row is None
+        or row.measured_at < timezone.now() - max_age
+        or row.cpu_model != cpu_model
+        or row.library_versions != versions
+    )
+
+
+def measure_host(algorithms=None, force: bool = False) -> MeasurementReport:
+    """
+    Measure the stale profile cells of ``algorithms`` (all by default) on
+    this host and store the results. ``force`` re-measures every cell.
+    """
+    if not _run_lock.acquire(blocking=False):
+        raise MeasurementInProgress("Замер скорости уже выполняется")
+    try:
+        config = _cache_settings("CRYPTO_MEASUREMENTS")
+        max_age = timedelta(hours=int(config.get("MAX_AGE_HOURS", 24 * 7)))
+        host = host_name()
+        cpu_model = benchmark.cpu_model()
+        versions = library_versions()
+
+        cells = profile_cells(algorithms)
+        existing = {
+            (row.algorithm, row.operation, row.mode, row.payload_size): row
+            for row in AlgorithmMeasurement.objects.filter(host=host)
+        }
+        stale = [
+            cell for cell in cells
+            if force or _is_stale(
+                existing.get((cell.algorithm, cell.operation, cell.mode, cell.size)),
+                cpu_model, cell_versions(cell.algorithm, versions), max_age,
+            )
+        ]
+        results = benchmark.run(stale, min_time=float(config.get("MIN_TIME", 0.3)))
+
+        measured_at = timezone.now()
+        with transaction.atomic():
+            if results:
+                # Registered ahead of the saves, so the cached numbers are gone
+                # before their post_save hooks invalidate the comparison list.
+                transaction.on_commit(lambda: cache.delete(CACHE_KEY))
+            for result in results:
+                AlgorithmMeasurement.objects.update_or_create(
+                    host=host,
+                    algorithm=result.algorithm,
+                    operation=result.operation,
+                    mode=result.mode,
+                    payload_size=result.size,
+                    defaults={
+                        "ops_per_second": round(1000 / result.p50_ms, 3) if result.p50_ms else 0.0,
+                        "mb_per_second": result.mb_per_s,
+                        "p50_ms": result.p50_ms,
+                        "p99_ms": result.p99_ms,
+                        "cpu_model": cpu_model,
+                        "library_versions": cell_versions(result.algorithm, versions),
+                        "measured_at": measured_at,
+                    },
+                )
+    finally:
+        _run_lock.release()
+
+    measured = {cell.key for cell in stale}
+    return MeasurementReport(
+        host=host,
+        measured=[cell.key for cell in stale],
+        fresh=[cell.key for cell in cells if cell.key not in measured],
+    )
+
+
+def _as_dict(row: AlgorithmMeasurement) -> dict:
+    return {
+        "operation": row.operation,
+        "mode": row.mode,
+        "payload_size": row.payload_size,
+        "ops_per_second": row.ops_per_second,
+        "mb_per_second": row.mb_per_second,
+        "p50_ms": row.p50_ms,
+        "p99_ms": row.p99_ms,
+        "host": row.host,
+        "cpu_model": row.cpu_model,
+        "library_versions": row.library_versions,
+        "measured_at": row.measured_at.isoformat(),
+    }
+
+
+def measured_speeds() -> dict[str, list[dict]]:
+    """
+    Measurements per engine algorithm, from the cache. Numbers of this host
+    are used where it has any; otherwise the latest of any host.
+    """
+    speeds = cache.get(CACHE_KEY)
+    if speeds is not None:
+        return speeds
+
+    host = host_name()
+    rows = AlgorithmMeasurement.objects.filter(host=host)
+    if not rows.exists():
+        rows = AlgorithmMeasurement.objects.all()
+    latest = {}
+    for row in rows.order_by("measured_at"):
+        latest[(row.algorithm, row.operation, row.mode, row.payload_size)] = row
+    speeds = {}
+    for (algorithm, *_), row in sorted(latest.items()):
+        speeds.setdefault(algorithm, []).append(_as_dict(row))
+
+    config = _cache_settings("CRYPTO_MEASUREMENTS")
+    cache.set(CACHE_KEY, speeds, int(config.get("CACHE_TIMEOUT", 300)))
+    return speeds
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:52
+
+from django.db import migrations, models
+
+# Seeded comparison rows and the CryptoEngine algorithm each one describes.
+ENGINE_ALGORITHMS = {
+    'aes-256': 'aes-gcm',
+    'chacha20': 'chacha20',
+    'blowfish': 'blowfish',
+    'twofish': 'twofish',
+    'caesar cipher': 'caesar',
+    'base64': 'base64',
+    'ecc': 'ecc',
+    'argon2': 'argon2',
+    'rsa': 'rsa',
+    'sha-256': 'sha256',
+    'sha-512': 'sha512',
+}
+
+
+def link_engine_algorithms(apps, schema_editor):
+    AlgorithmComparison = apps.get_model('security', 'AlgorithmComparison')
+    for comparison in AlgorithmComparison.objects.filter(engine_algorithm=''):
+        engine_algorithm = ENGINE_ALGORITHMS.get(comparison.name.strip().lower())
+        if engine_algorithm:
+            comparison.engine_algorithm = engine_algorithm
+            comparison.save(update_fields=['engine_algorithm'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('security', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='algorithmcomparison',
+            name='engine_algorithm',
+            field=models.CharField(blank=True, help_text='Имя алгоритма в CryptoEngine для замеров скорости, например aes-gcm', max_length=20, verbose_name='Алгоритм в CryptoEngine'),
+        ),
+        migrations.CreateModel(
+            name='AlgorithmMeasurement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('host', models.CharField(max_length=255, verbose_name='Хост')),
+                ('algorithm', models.CharField(max_length=20, verbose_name='Алгоритм')),
+                ('operation', models.CharField(max_length=20, verbose_name='Операция')),
+                ('mode', models.CharField(max_length=10, verbose_name='Режим данных')),
+                ('payload_size', models.PositiveIntegerField(verbose_name='Размер данных, байт')),
+                ('ops_per_second', models.FloatField(verbose_name='Операций в секунду')),
+                ('mb_per_second', models.FloatField(blank=True, null=True, verbose_name='МБ/с')),
+                ('p50_ms', models.FloatField(verbose_name='Медиана, мс')),
+                ('p99_ms', models.FloatField(verbose_name='99-й перцентиль, мс')),
+                ('cpu_model', models.CharField(max_length=255, verbose_name='Процессор')),
+                ('library_versions', models.JSONField(default=dict, verbose_name='Версии библиотек')),
+                ('measured_at', models.DateTimeField(verbose_name='Время замера')),
+            ],
+            options={
+                'verbose_name': 'Замер скорости алгоритма',
+                'verbose_name_plural': 'Замеры скорости алгоритмов',
+                'ordering': ['algorithm', 'operation'],
+                'constraints': [models.UniqueConstraint(fields=('host', 'algorithm', 'operation', 'mode', 'payload_size'), name='unique_algorithm_measurement')],
+            },
+        ),
+        migrations.RunPython(link_engine_algorithms, migrations.RunPython.noop),
+    ]
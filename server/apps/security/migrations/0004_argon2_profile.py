@@ -0,0 +1,36 @@
+# Generated by Django 5.2.8 on 2026-10-17 07:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('security', '0003_algorithm_measurements'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Argon2Profile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('host', models.CharField(max_length=255, unique=True, verbose_name='Хост')),
+                ('time_cost', models.PositiveIntegerField(verbose_name='Число проходов (time_cost)')),
+                ('memory_cost', models.PositiveIntegerField(verbose_name='Память, КиБ (memory_cost)')),
+                ('parallelism', models.PositiveSmallIntegerField(verbose_name='Параллелизм')),
+                ('hash_len', models.PositiveSmallIntegerField(verbose_name='Длина хэша, байт')),
+                ('measured_ms', models.FloatField(verbose_name='Измеренное время хэширования, мс')),
+                ('target_ms', models.FloatField(verbose_name='Целевое время хэширования, мс')),
+                ('max_memory_kib', models.PositiveIntegerField(verbose_name='Предел памяти, КиБ')),
+                ('cpu_model', models.CharField(max_length=255, verbose_name='Процессор')),
+                ('cpu_count', models.PositiveSmallIntegerField(verbose_name='Число ядер')),
+                ('argon2_version', models.CharField(max_length=20, verbose_name='Версия argon2-cffi')),
+                ('calibrated_at', models.DateTimeField(verbose_name='Время калибровки')),
+            ],
+            options={
+                'verbose_name': 'Профиль Argon2',
+                'verbose_name_plural': 'Профили Argon2',
+                'ordering': ['host'],
+            },
+        ),
+    ]
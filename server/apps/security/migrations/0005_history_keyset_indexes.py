@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-17 07:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('security', '0004_argon2_profile'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='useroperationhistory',
+            index=models.Index(fields=['user', 'timestamp', 'id'], name='security_us_user_id_40eda6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='useroperationhistory',
+            index=models.Index(fields=['user', 'operation_type', 'timestamp', 'id'], name='security_us_user_id_1d825d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='useroperationhistory',
+            index=models.Index(fields=['user', 'algorithm', 'timestamp', 'id'], name='security_us_user_id_9bc0d7_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='useroperationhistory',
+            name='security_us_user_id_3a95ec_idx',
+        ),
+    ]
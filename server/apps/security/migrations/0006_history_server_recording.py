@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-17 07:21
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('security', '0005_history_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='useroperationhistory',
+            name='operation_type',
+            field=models.CharField(choices=[('encrypt', 'Encrypt'), ('decrypt', 'Decrypt'), ('sign', 'Sign'), ('verify', 'Verify'), ('hash', 'Hash')], max_length=20, verbose_name='Тип операции'),
+        ),
+        migrations.AlterField(
+            model_name='useroperationhistory',
+            name='timestamp',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='Время операции'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.8 on 2026-10-17 07:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('security', '0006_history_server_recording'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='useroperationhistory',
+            name='input_body',
+            field=models.BinaryField(blank=True, null=True, verbose_name='Сжатые входные данные'),
+        ),
+        migrations.AddField(
+            model_name='useroperationhistory',
+            name='input_digest',
+            field=models.CharField(blank=True, help_text='Хеш полных входных данных; пусто, если они хранятся целиком', max_length=64, verbose_name='SHA-256 входных данных'),
+        ),
+        migrations.AddField(
+            model_name='useroperationhistory',
+            name='output_body',
+            field=models.BinaryField(blank=True, null=True, verbose_name='Сжатый результат'),
+        ),
+        migrations.AddField(
+            model_name='useroperationhistory',
+            name='output_digest',
+            field=models.CharField(blank=True, help_text='Хеш полного результата; пусто, если он хранится целиком', max_length=64, verbose_name='SHA-256 результата'),
+        ),
+        migrations.AlterField(
+            model_name='useroperationhistory',
+            name='input_data',
+            field=models.TextField(help_text='Входные данные операции или их начало, если они сжаты в input_body', verbose_name='Входные данные'),
+        ),
+        migrations.AlterField(
+            model_name='useroperationhistory',
+            name='output_data',
+            field=models.TextField(help_text='Результат операции или его начало, если он сжат в output_body', verbose_name='Результат'),
+        ),
+    ]
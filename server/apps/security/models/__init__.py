@@ -3,3 +3,5 @@ from .algorithm_comparsion_model import AlgorithmComparison
 from .crypto_category_model import CryptoCategory
 from .crypto_algorithm_model import CryptoAlgorithm
 from .web_implementation_example_model import WebImplementationExample
+from .algorithm_measurement_model import AlgorithmMeasurement
+from .argon2_profile_model import Argon2Profile
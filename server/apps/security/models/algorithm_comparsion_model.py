@@ -41,6 +41,12 @@ class AlgorithmComparison(models.Model):
         verbose_name=_('Применение'),
         help_text=_('Введите способы применения')
     )
+    engine_algorithm = models.CharField(
+        max_length=20,
+        verbose_name=_('Алгоритм в CryptoEngine'),
+        help_text=_('Имя алгоритма в CryptoEngine для замеров скорости, например aes-gcm'),
+        blank=True,
+    )
 
     class Meta:
         indexes = [
@@ -0,0 +1,63 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class AlgorithmMeasurement(models.Model):
+    host = models.CharField(
+        max_length=255,
+        verbose_name=_('Хост'),
+    )
+    algorithm = models.CharField(
+        max_length=20,
+        verbose_name=_('Алгоритм'),
+    )
+    operation = models.CharField(
+        max_length=20,
+        verbose_name=_('Операция'),
+    )
+    mode = models.CharField(
+        max_length=10,
+        verbose_name=_('Режим данных'),
+    )
+    payload_size = models.PositiveIntegerField(
+        verbose_name=_('Размер данных, байт'),
+    )
+    ops_per_second = models.FloatField(
+        verbose_name=_('Операций в секунду'),
+    )
+    mb_per_second = models.FloatField(
+        verbose_name=_('МБ/с'),
+        null=True,
+        blank=True,
+    )
+    p50_ms = models.FloatField(
+        verbose_name=_('Медиана, мс'),
+    )
+    p99_ms = models.FloatField(
+        verbose_name=_('99-й перцентиль, мс'),
+    )
+    cpu_model = models.CharField(
+        max_length=255,
+        verbose_name=_('Процессор'),
+    )
+    library_versions = models.JSONField(
+        verbose_name=_('Версии библиотек'),
+        default=dict,
+    )
+    measured_at = models.DateTimeField(
+        verbose_name=_('Время замера'),
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['host', 'algorithm', 'operation', 'mode', 'payload_size'],
+                name='unique_algorithm_measurement',
+            ),
+        ]
+        verbose_name = _('Замер скорости алгоритма')
+        verbose_name_plural = _('Замеры скорости алгоритмов')
+        ordering = ['algorithm', 'operation']
+
+    def __str__(self):
+        return f'{self.algorithm} {self.operation} ({self.host})'
@@ -0,0 +1,53 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class Argon2Profile(models.Model):
+    host = models.CharField(
+        max_length=255,
+        unique=True,
+        verbose_name=_('Хост'),
+    )
+    time_cost = models.PositiveIntegerField(
+        verbose_name=_('Число проходов (time_cost)'),
+    )
+    memory_cost = models.PositiveIntegerField(
+        verbose_name=_('Память, КиБ (memory_cost)'),
+    )
+    parallelism = models.PositiveSmallIntegerField(
+        verbose_name=_('Параллелизм'),
+    )
+    hash_len = models.PositiveSmallIntegerField(
+        verbose_name=_('Длина хэша, байт'),
+    )
+    measured_ms = models.FloatField(
+        verbose_name=_('Измеренное время хэширования, мс'),
+    )
+    target_ms = models.FloatField(
+        verbose_name=_('Целевое время хэширования, мс'),
+    )
+    max_memory_kib = models.PositiveIntegerField(
+        verbose_name=_('Предел памяти, КиБ'),
+    )
+    cpu_model = models.CharField(
+        max_length=255,
+        verbose_name=_('Процессор'),
+    )
+    cpu_count = models.PositiveSmallIntegerField(
+        verbose_name=_('Число ядер'),
+    )
+    argon2_version = models.CharField(
+        max_length=20,
+        verbose_name=_('Версия argon2-cffi'),
+    )
+    calibrated_at = models.DateTimeField(
+        verbose_name=_('Время калибровки'),
+    )
+
+    class Meta:
+        verbose_name = _('Профиль Argon2')
+        verbose_name_plural = _('Профили Argon2')
+        ordering = ['host']
+
+    def __str__(self):
+        return f'{self.host}: t={self.time_cost}, m={self.memory_cost}, p={self.parallelism}'
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 
@@ -8,6 +9,7 @@ class UserOperationHistory(models.Model):
         ("decrypt", "Decrypt"),
         ("sign", "Sign"),
         ("verify", "Verify"),
+        ("hash", "Hash"),
     )
 
     user = models.ForeignKey(
@@ -26,16 +28,42 @@ class UserOperationHistory(models.Model):
         verbose_name=_('Алгоритм'),
         help_text=_('Название или код алгоритма, использованного в операции'),
     )
+    # Long payloads are kept as preview + digest + zlib body, see
+    # apps/security/history_storage.py.
     input_data = models.TextField(
         verbose_name=_('Входные данные'),
-        help_text=_('Входные данные операции (может быть обрезано на клиенте)'),
+        help_text=_('Входные данные операции или их начало, если они сжаты в input_body'),
+    )
+    input_digest = models.CharField(
+        max_length=64,
+        blank=True,
+        verbose_name=_('SHA-256 входных данных'),
+        help_text=_('Хеш полных входных данных; пусто, если они хранятся целиком'),
+    )
+    input_body = models.BinaryField(
+        null=True,
+        blank=True,
+        verbose_name=_('Сжатые входные данные'),
     )
     output_data = models.TextField(
         verbose_name=_('Результат'),
-        help_text=_('Результат операции (может быть обрезано на клиенте)'),
+        help_text=_('Результат операции или его начало, если он сжат в output_body'),
+    )
+    output_digest = models.CharField(
+        max_length=64,
+        blank=True,
+        verbose_name=_('SHA-256 результата'),
+        help_text=_('Хеш полного результата; пусто, если он хранится целиком'),
+    )
+    output_body = models.BinaryField(
+        null=True,
+        blank=True,
+        verbose_name=_('Сжатый результат'),
     )
+    # Set when the operation happens, not when the write-behind buffer of
+    # history_recorder saves it, so no auto_now_add.
     timestamp = models.DateTimeField(
-        auto_now_add=True,
+        default=timezone.now,
         verbose_name=_('Время операции'),
     )
 
@@ -43,8 +71,12 @@ class UserOperationHistory(models.Model):
         verbose_name = _('История операций пользователя')
         verbose_name_plural = _('История операций пользователей')
         ordering = ['-timestamp']
+        # Keyset pages of apps/security/history.py: newest first per user,
+        # optionally narrowed to one operation type or algorithm.
         indexes = [
-            models.Index(fields=['user', 'timestamp']),
+            models.Index(fields=['user', 'timestamp', 'id']),
+            models.Index(fields=['user', 'operation_type', 'timestamp', 'id']),
+            models.Index(fields=['user', 'algorithm', 'timestamp', 'id']),
             models.Index(fields=['operation_type']),
         ]
 
@@ -0,0 +1,187 @@
+"""
+Segmented encryption of large payloads over several cores.
+
+AES-CTR and ChaCha20 can start the keystream at any block, so a payload
+cut into fixed-size segments can be encrypted segment by segment in any
+order: AES-CTR starts each segment at its block index through
+``initial_value``, and ChaCha20 seeks to the segment offset. Worker threads
+encrypt the segments straight into their slices of one preallocated output
+buffer. pycryptodome's C code and hashlib release the GIL on large inputs,
+so threads give real parallelism without copying data between processes.
+
+Each worker also computes an HMAC-SHA256 of its ciphertext segment, keyed
+with a separate MAC key and bound to the segment index. A single tag over
+the header and all segment MACs, in order, authenticates the result
+(encrypt-then-MAC). The segment size is fixed and written into the header,
+so the output does not depend on how many workers produced it.
+
+Layout::
+
+    magic "DSP1" (4) | cipher id (1) | log2 segment size (1) | nonce (12) | tag (32) | ciphertext
+
+The first 18 bytes are the header.
+"""
+from __future__ import annotations
+import hmac
+import os
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from Crypto.Cipher import AES, ChaCha20
+from .key_cache import _cache_settings
+
+MAGIC = b"DSP1"
+CIPHERS = {
+    "aes-ctr": 1,
+    "chacha20": 2,
+}
+_CIPHER_NAMES = {value: name for name, value in CIPHERS.items()}
+NONCE_SIZE = 12
+TAG_SIZE = 32
+_HEADER = struct.Struct(f">4sBB{NONCE_SIZE}s")
+HEADER_SIZE = _HEADER.size
+OVERHEAD = HEADER_SIZE + TAG_SIZE
+# Segments must hold whole AES (16 B) and ChaCha20 (64 B) blocks.
+MIN_SEGMENT_BITS = 16
+MAX_SEGMENT_BITS = 26
+
+_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+
+
+class ParallelCipherError(ValueError):
+    """Raised for malformed or unauthentic segmented ciphertexts."""
+
+
+def _settings() -> dict:
+    config = _cache_settings("CRYPTO_PARALLEL_CIPHER")
+    return {
+        "threshold": int(config.get("THRESHOLD", 0)),
+        "segment_size": int(config.get("SEGMENT_SIZE", 1024 * 1024)),
+        "max_workers": int(config.get("MAX_WORKERS", min(8, os.cpu_count() or 1))),
+    }
+
+
+def applies_to(size: int) -> bool:
+    """Whether a payload of ``size`` bytes is encrypted in segments."""
+    threshold = _settings()["threshold"]
+    return 0 < threshold <= size
+
+
+def _segment_bits(segment_size: int) -> int:
+    bits = max(segment_size, 1).bit_length() - 1
+    return min(max(bits, MIN_SEGMENT_BITS), MAX_SEGMENT_BITS)
+
+
+def _subkeys(key: bytes) -> tuple[bytes, bytes]:
+    """Independent encryption and MAC keys from one engine key."""
+    return (
+        hmac.digest(key, b"parallel-cipher encryption", "sha256"),
+        hmac.digest(key, b"parallel-cipher authentication", "sha256"),
+    )
+
+
+def _keystream(cipher_id: int, key: bytes, nonce, offset: int):
+    if cipher_id == CIPHERS["aes-ctr"]:
+        return AES.new(key, AES.MODE_CTR, nonce=nonce, initial_value=offset // AES.block_size)
+    cipher = ChaCha20.new(key=key, nonce=nonce)
+    if offset:
+        cipher.seek(offset)
+    return cipher
+
+
+def _segment_mac(mac_key: bytes, index: int, ciphertext) -> bytes:
+    mac = hmac.new(mac_key, b"\x00" + index.to_bytes(8, "big"), "sha256")
+    mac.update(ciphertext)
+    return mac.digest()
+
+
+def _final_tag(mac_key: bytes, header, segment_macs: list[bytes]) -> bytes:
+    mac = hmac.new(mac_key, b"\x01", "sha256")
+    mac.update(header)
+    mac.update(len(segment_macs).to_bytes(8, "big"))
+    mac.update(b"".join(segment_macs))
+    return mac.digest()
+
+
+def _get_executor(max_workers: int) -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="parallel-cipher")
+    return _executor
+
+
+def _map_segments(func, count: int) -> list[bytes]:
+    """``func(index)`` for every segment, spread over the thread pool."""
+    max_workers = _settings()["max_workers"]
+    if max_workers <= 1 or count <= 1:
+        return [func(index) for index in range(count)]
+    return list(_get_executor(max_workers).map(func, range(count)))
+
+
+def seal(cipher: str, key: bytes, data, segment_size: int | None = None) -> bytearray:
+    """Encrypt ``data`` segment by segment into one preallocated buffer."""
+    cipher_id = CIPHERS[cipher]
+    bits = _segment_bits(segment_size or _settings()["segment_size"])
+    segment = 1 << bits
+    data = memoryview(data)
+    encryption_key, mac_key = _subkeys(key)
+
+    output = bytearray(OVERHEAD + len(data))
+    view = memoryview(output)
+    nonce = os.urandom(NONCE_SIZE)
+    _HEADER.pack_into(view, 0, MAGIC, cipher_id, bits, nonce)
+    body = view[OVERHEAD:]
+
+    def encrypt_segment(index: int) -> bytes:
+        start = index * segment
+        target = body[start:start + segment]
+        _keystream(cipher_id, encryption_key, nonce, start).encrypt(data[start:start + segment], output=target)
+        return _segment_mac(mac_key, index, target)
+
+    count = max(1, -(-len(data) // segment))
+    segment_macs = _map_segments(encrypt_segment, count)
+    view[HEADER_SIZE:OVERHEAD] = _final_tag(mac_key, view[:HEADER_SIZE], segment_macs)
+    return output
+
+
+def sealed_with(data) -> str | None:
+    """Cipher name of a segmented ciphertext, ``None`` for anything else."""
+    if len(data) < OVERHEAD:
+        return None
+    magic, cipher_id, bits, _ = _HEADER.unpack_from(data)
+    if magic != MAGIC or cipher_id not in _CIPHER_NAMES or not MIN_SEGMENT_BITS <= bits <= MAX_SEGMENT_BITS:
+        return None
+    return _CIPHER_NAMES[cipher_id]
+
+
+def open_sealed(key: bytes, data) -> bytearray:
+    """
+    Verify and decrypt a ciphertext produced by ``seal``. Segments are
+    MACed and decrypted in the same pass; the plaintext is only returned
+    once the tag over all of them checks out.
+    """
+    data = memoryview(data)
+    if sealed_with(data) is None:
+        raise ParallelCipherError("Неверный ключ или поврежденные данные")
+    _, cipher_id, bits, nonce = _HEADER.unpack_from(data)
+    segment = 1 << bits
+    encryption_key, mac_key = _subkeys(key)
+    body = data[OVERHEAD:]
+    output = bytearray(len(body))
+    target = memoryview(output)
+
+    def decrypt_segment(index: int) -> bytes:
+        start = index * segment
+        ciphertext = body[start:start + segment]
+        mac = _segment_mac(mac_key, index, ciphertext)
+        _keystream(cipher_id, encryption_key, nonce, start).decrypt(ciphertext, output=target[start:start + segment])
+        return mac
+
+    count = max(1, -(-len(body) // segment))
+    segment_macs = _map_segments(decrypt_segment, count)
+    if not hmac.compare_digest(_final_tag(mac_key, data[:HEADER_SIZE], segment_macs), data[HEADER_SIZE:OVERHEAD]):
+        raise ParallelCipherError("Неверный ключ или поврежденные данные")
+    return output
@@ -0,0 +1,152 @@
+"""
+Registry of the algorithms served by CryptoEngine.
+
+Every algorithm is described once: the operations it supports and their
+handlers, its capabilities, how it gets its key and which ``params`` it
+accepts. The dispatch table keyed by ``(algorithm, operation, is_binary)``
+is compiled from these specs when the registry is sealed, so dispatch
+is one dict lookup. The request serializers validate against the same
+specs.
+"""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+# Capabilities.
+TEXT = "text"        # encrypt/decrypt of text payloads
+BINARY = "binary"    # encrypt/decrypt of Base64 payloads and raw bytes
+HASH = "hash"
+SIGN = "sign"
+KEYGEN = "keygen"
+
+# Key policies.
+KEY_NONE = "none"          # the algorithm takes no key
+KEY_DEFAULT = "default"    # a default key is used when none is given
+KEY_REQUIRED = "required"  # the listed operations need a key
+
+Handler = Callable[[Any, str], dict]
+
+
+@dataclass(frozen=True)
+class ParamSpec:
+    """One accepted entry of ``params``."""
+    name: str
+    type: type
+    default: Any = None
+    choices: tuple | None = None
+    required_for: tuple[str, ...] = ()
+    applies_to: tuple[str, ...] = ()
+
+    def check(self, value) -> str | None:
+        """Return an error message for ``value`` or ``None`` when it is valid."""
+        if self.type is int and (isinstance(value, bool) or not isinstance(value, int)):
+            return f"Параметр {self.name} должен быть целым числом"
+        if self.type is str and not isinstance(value, str):
+            return f"Параметр {self.name} должен быть строкой"
+        if self.choices is not None and value not in self.choices:
+            allowed = ", ".join(str(choice) for choice in self.choices)
+            return f"Параметр {self.name} должен быть одним из: {allowed}"
+        return None
+
+
+@dataclass(frozen=True)
+class AlgorithmSpec:
+    name: str
+    capabilities: frozenset[str]
+    # operation -> handler, or operation -> (text handler, binary handler)
+    handlers: dict[str, Handler | tuple[Handler | None, Handler | None]]
+    # operation -> raw-bytes handler (encrypt_bytes/decrypt_bytes)
+    bytes_handlers: dict[str, Callable] = field(default_factory=dict)
+    key_policy: str = KEY_NONE
+    key_operations: frozenset[str] = frozenset()
+    default_key: str | None = None
+    key_length: int | None = None
+    params: tuple[ParamSpec, ...] = ()
+
+    @property
+    def operations(self) -> frozenset[str]:
+        return frozenset(self.handlers)
+
+    def needs_key(self, operation: str) -> bool:
+        return self.key_policy == KEY_REQUIRED and operation in self.key_operations
+
+    def supports_binary(self, operation: str) -> bool:
+        handler = self.handlers.get(operation)
+        return not isinstance(handler, tuple) or handler[1] is not None
+
+
+class AlgorithmRegistry:
+    def __init__(self):
+        self._specs: dict[str, AlgorithmSpec] = {}
+        self.dispatch: dict[tuple[str, str, bool], Handler] = {}
+        self.bytes_dispatch: dict[tuple[str, str], Callable] = {}
+
+    def register(self, spec: AlgorithmSpec) -> AlgorithmSpec:
+        self._specs[spec.name] = spec
+        for operation, handler in spec.handlers.items():
+            text, binary = handler if isinstance(handler, tuple) else (handler, handler)
+            if text is not None:
+                self.dispatch[(spec.name, operation, False)] = text
+            if binary is not None:
+                self.dispatch[(spec.name, operation, True)] = binary
+        for operation, handler in spec.bytes_handlers.items():
+            self.bytes_dispatch[(spec.name, operation)] = handler
+        return spec
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._specs
+
+    def __getitem__(self, name: str) -> AlgorithmSpec:
+        return self._specs[name]
+
+    def get(self, name: str) -> AlgorithmSpec | None:
+        return self._specs.get(name)
+
+    def names(self, capability: str | None = None) -> tuple[str, ...]:
+        return tuple(
+            name for name, spec in self._specs.items()
+            if capability is None or capability in spec.capabilities
+        )
+
+    def operations(self) -> tuple[str, ...]:
+        seen = {}
+        for spec in self._specs.values():
+            for operation in spec.handlers:
+                seen.setdefault(operation, None)
+        return tuple(seen)
+
+    def validate_request(self, algorithm: str, operation: str, key: str | None,
+                         is_binary: bool, params: dict | None) -> tuple[list[str], dict | None]:
+        """
+        Check a request against the spec of ``algorithm``. Returns the list
+        of errors and ``params`` completed with defaults where the spec
+        declares them for this operation.
+        """
+        spec = self._specs.get(algorithm)
+        if spec is None:
+            return [f"Неподдерживаемый алгоритм: {algorithm}"], params
+        if operation not in spec.handlers:
+            supporting = ", ".join(
+                name for name, other in self._specs.items() if operation in other.handlers
+            )
+            return [f"Операция {operation} поддерживается только для: {supporting}"], params
+        if is_binary and not spec.supports_binary(operation):
+            return [f"Алгоритм {algorithm} не поддерживается для бинарных данных"], params
+        if spec.needs_key(operation) and not key:
+            return ["Необходим ключ для выбранного алгоритма"], params
+
+        errors = []
+        completed = dict(params) if params else {}
+        for param in spec.params:
+            if param.applies_to and operation not in param.applies_to:
+                continue
+            if param.name not in completed:
+                if operation in param.required_for:
+                    errors.append(f"Для операции {operation} необходим параметр {param.name}")
+                elif param.default is not None:
+                    completed[param.name] = param.default
+                continue
+            error = param.check(completed[param.name])
+            if error:
+                errors.append(error)
+        return errors, (completed or params)
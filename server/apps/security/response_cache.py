@@ -0,0 +1,136 @@
+"""
+Pre-rendered, ETag-validated responses for the knowledge-base lists and details.
+
+The lists only change when an admin edits them, yet every page load used
+to query them and run the serializer over every row. The first request
+renders the JSON body once and stores it, with its strong ETag, in the
+Django cache; later requests get the stored bytes, or a 304 when the
+client's ``If-None-Match`` still matches, without any ORM or serializer
+work.
+
+Entries are keyed by a per-list generation number. ``post_save`` and
+``post_delete`` of a model the list is built from bump the generation
+once the transaction commits, so a response rendered from the old rows
+is stored under the old generation and never served.
+"""
+from __future__ import annotations
+import hashlib
+import time
+from django.apps import apps
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from rest_framework.renderers import JSONRenderer
+from .key_cache import _cache_settings, cache_key
+
+# Cached lists and the models their responses are built from.
+DEPENDENCIES = {
+    "algorithm-comparison": ("security.AlgorithmComparison", "security.AlgorithmMeasurement"),
+    "crypto-categories": ("security.CryptoCategory",),
+    "crypto-algorithms": ("security.CryptoAlgorithm", "security.CryptoCategory"),
+    "web-implementations": ("security.WebImplementationExample",),
+}
+_PREFIX = "security:response"
+
+
+def _generation_key(name: str) -> str:
+    return f"{_PREFIX}:{name}:generation"
+
+
+def _generation(name: str) -> int:
+    key = _generation_key(name)
+    generation = cache.get(key)
+    if generation is None:
+        # A lost counter must not restart at a number older entries were
+        # stored under, so it restarts at the clock.
+        cache.add(key, time.time_ns(), None)
+        generation = cache.get(key, 0)
+    return generation
+
+
+def invalidate(name: str) -> None:
+    key = _generation_key(name)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def _invalidate_dependents(sender, **kwargs) -> None:
+    names = [name for name, models in DEPENDENCIES.items() if sender._meta.label in models]
+
+    def bump():
+        for name in names:
+            invalidate(name)
+
+    transaction.on_commit(bump)
+
+
+def connect_signals() -> None:
+    """Invalidate the cached lists on changes to their models; called from AppConfig.ready()."""
+    labels = {label for models in DEPENDENCIES.values() for label in models}
+    for label in labels:
+        model = apps.get_model(label)
+        post_save.connect(_invalidate_dependents, sender=model, dispatch_uid=f"{_PREFIX}:{label}:save")
+        post_delete.connect(_invalidate_dependents, sender=model, dispatch_uid=f"{_PREFIX}:{label}:delete")
+
+
+def _response(request, body: bytes, etag: str) -> HttpResponse:
+    response = HttpResponse(body, content_type="application/json")
+    response["ETag"] = etag
+    # Private: the lists are behind authentication. no-cache: revalidate
+    # with the ETag on every use, so edits show up right away.
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ("Accept",))
+    return get_conditional_response(request, etag=etag, response=response)
+
+
+def cached_response(request, name: str, render):
+    """
+    The response of ``request`` to list ``name``: the stored body, or
+    ``render()`` (the response data) rendered and stored on a miss.
+    """
+    generation = _generation(name)
+    # Query parameters (?fields=, ?cursor=) and the host in pagination links
+    # change the body, so the full URL is part of the key.
+    key = f"{_PREFIX}:{name}:{generation}:{cache_key(_PREFIX, request.build_absolute_uri())}"
+    entry = cache.get(key)
+    if entry is None:
+        body = JSONRenderer().render(render())
+        entry = (f'"{hashlib.sha256(body).hexdigest()[:32]}"', body)
+        timeout = int(_cache_settings("KNOWLEDGE_BASE_CACHE").get("TIMEOUT", 24 * 3600))
+        cache.set(key, entry, timeout)
+    etag, body = entry
+    return _response(request, body, etag)
+
+
+def _enabled(request) -> bool:
+    # Other formats, such as the browsable API, are rendered as usual.
+    return (
+        _cache_settings("KNOWLEDGE_BASE_CACHE").get("ENABLED", True)
+        and isinstance(request.accepted_renderer, JSONRenderer)
+    )
+
+
+class CachedListMixin:
+    """For ListAPIView: serve JSON from ``cached_response`` under ``cache_name``, a key of DEPENDENCIES."""
+    cache_name: str = ""
+
+    def list(self, request, *args, **kwargs):
+        render = super().list
+        if not _enabled(request):
+            return render(request, *args, **kwargs)
+        return cached_response(request, self.cache_name, lambda: render(request, *args, **kwargs).data)
+
+
+class CachedRetrieveMixin:
+    """The same for RetrieveAPIView; details share the generation of their list."""
+    cache_name: str = ""
+
+    def retrieve(self, request, *args, **kwargs):
+        render = super().retrieve
+        if not _enabled(request):
+            return render(request, *args, **kwargs)
+        return cached_response(request, self.cache_name, lambda: render(request, *args, **kwargs).data)
@@ -1,4 +1,5 @@
 from .algorithm_comparison_serializer import AlgorithmComparisonSerializer
+from .algorithm_measurement_serializer import AlgorithmMeasurementRequestSerializer
 from .rsa_serializers import (
     RSASignRequestSerializer,
     RSASignResponseSerializer,
@@ -6,8 +7,16 @@ from .rsa_serializers import (
     RSAVerifyResponseSerializer,
     RSAGenerateKeyPairResponseSerializer
 )
+from .bulk_verify_serializer import BulkVerifyRequestSerializer
 from .crypto_request_serializer import CryptoRequestSerializer
+from .crypto_batch_serializer import CryptoBatchRequestSerializer
+from .file_caesar_serializer import FileCaesarRequestSerializer
+from .file_crypto_serializer import FileCryptoRequestSerializer
+from .file_hash_serializer import FileHashRequestSerializer
+from .raw_crypto_serializer import RawCryptoRequestSerializer
 from .crypto_algorithm_serializer import CryptoAlgorithmSerializer
 from .crypto_category_serializer import CryptoCategorySerializer
 from .user_operation_history_serializer import UserOperationHistorySerializer
+from .user_operation_history_query_serializer import UserOperationHistoryQuerySerializer
+from .user_operation_history_detail_serializer import UserOperationHistoryDetailSerializer
 from .web_implementation_example_serializer import WebImplementationExampleSerializer
@@ -1,10 +1,14 @@
-from drf_spectacular.utils import extend_schema_serializer
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema_field, extend_schema_serializer
 from rest_framework import serializers
 from apps.security.models import AlgorithmComparison
+from .sparse_fields_serializer import SparseFieldsSerializer
 
 
 @extend_schema_serializer(component_name='AlgorithmComparison')
-class AlgorithmComparisonSerializer(serializers.ModelSerializer):
+class AlgorithmComparisonSerializer(SparseFieldsSerializer):
+    measured = serializers.SerializerMethodField()
+
     class Meta:
         model = AlgorithmComparison
         fields = [
@@ -16,6 +20,15 @@ class AlgorithmComparisonSerializer(serializers.ModelSerializer):
             'type',
             'year',
             'explanation',
-            'use_case'
+            'use_case',
+            'engine_algorithm',
+            'measured',
         ]
         read_only_fields = fields
+        # Model fields read by computed fields, for ?fields=/?omit=.
+        computed_sources = {'measured': ('engine_algorithm',)}
+
+    @extend_schema_field(OpenApiTypes.OBJECT)
+    def get_measured(self, obj):
+        """Speed measured on the server (manage.py measure_algorithms), if any."""
+        return self.context.get('measurements', {}).get(obj.engine_algorithm, [])
@@ -0,0 +1,16 @@
+from rest_framework import serializers
+from apps.security.crypto_service import ALGORITHM_REGISTRY
+
+
+class AlgorithmMeasurementRequestSerializer(serializers.Serializer):
+    algorithms = serializers.ListField(
+        child=serializers.ChoiceField(choices=[(name, name) for name in ALGORITHM_REGISTRY.names()]),
+        required=False,
+        allow_empty=False,
+        help_text="Алгоритмы для замера (по умолчанию все)",
+    )
+    force = serializers.BooleanField(
+        default=False,
+        required=False,
+        help_text="Перемерить все ячейки, даже свежие",
+    )
@@ -0,0 +1,43 @@
+from django.conf import settings
+from rest_framework import serializers
+from apps.security.bulk_verify import ALGORITHMS, HASH_ALGORITHMS
+
+_ITEM_FIELDS = ("message", "signature", "public_key")
+
+
+class BulkVerifyRequestSerializer(serializers.Serializer):
+    algorithm = serializers.ChoiceField(choices=[(name, name) for name in ALGORITHMS])
+    hash_algorithm = serializers.ChoiceField(
+        choices=[(name, name) for name in HASH_ALGORITHMS],
+        default="SHA256",
+        required=False,
+        help_text="Хэш-функция подписи (для RSA-PSS всегда SHA256)",
+    )
+    items = serializers.ListField(
+        allow_empty=False,
+        help_text="Список объектов {message, signature, public_key}",
+    )
+
+    def validate(self, attrs):
+        if attrs["algorithm"] == "rsa-pss" and attrs["hash_algorithm"] != "SHA256":
+            raise serializers.ValidationError("RSA-PSS поддерживает только SHA256")
+        return attrs
+
+    def validate_items(self, items):
+        """
+        Check the shape of every item with plain type checks: a nested
+        serializer costs more than the verification itself at this scale.
+        Returns ``(triples, errors)``; malformed items become ``None``.
+        """
+        if len(items) > settings.CRYPTO_BULK_VERIFY_MAX_ITEMS:
+            raise serializers.ValidationError(
+                f"Не более {settings.CRYPTO_BULK_VERIFY_MAX_ITEMS} подписей в одном запросе"
+            )
+        triples, errors = [], {}
+        for index, item in enumerate(items):
+            if isinstance(item, dict) and all(isinstance(item.get(name), str) for name in _ITEM_FIELDS):
+                triples.append((item["message"], item["signature"], item["public_key"]))
+            else:
+                triples.append(None)
+                errors[index] = "Ожидается объект с полями message, signature и public_key"
+        return triples, errors
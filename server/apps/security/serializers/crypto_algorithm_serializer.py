@@ -1,8 +1,9 @@
 from rest_framework import serializers
 from apps.security.models import CryptoAlgorithm
+from .sparse_fields_serializer import SparseFieldsSerializer
 
 
-class CryptoAlgorithmSerializer(serializers.ModelSerializer):
+class CryptoAlgorithmSerializer(SparseFieldsSerializer):
     category_key = serializers.CharField(source='category.key', read_only=True)
 
     class Meta:
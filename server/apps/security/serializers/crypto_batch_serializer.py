@@ -0,0 +1,26 @@
+from django.conf import settings
+from rest_framework import serializers
+from .crypto_request_serializer import CryptoRequestSerializer
+
+
+class CryptoBatchRequestSerializer(serializers.Serializer):
+    items = serializers.ListField(child=serializers.DictField(), allow_empty=False)
+
+    def validate_items(self, items):
+        """
+        Validate every item with one shared CryptoRequestSerializer.
+        Returns ``(validated_data, None)`` or ``(None, errors)`` per item,
+        so a bad item does not reject the whole batch.
+        """
+        if len(items) > settings.CRYPTO_BATCH_MAX_ITEMS:
+            raise serializers.ValidationError(
+                f"Не более {settings.CRYPTO_BATCH_MAX_ITEMS} операций в одном запросе"
+            )
+        child = CryptoRequestSerializer()
+        checked = []
+        for item in items:
+            try:
+                checked.append((child.run_validation(item), None))
+            except serializers.ValidationError as exc:
+                checked.append((None, exc.detail))
+        return checked
@@ -1,8 +1,8 @@
-from rest_framework import serializers
 from apps.security.models import CryptoCategory
+from .sparse_fields_serializer import SparseFieldsSerializer
 
 
-class CryptoCategorySerializer(serializers.ModelSerializer):
+class CryptoCategorySerializer(SparseFieldsSerializer):
     class Meta:
         model = CryptoCategory
         fields = [
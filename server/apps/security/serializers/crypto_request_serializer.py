@@ -1,28 +1,13 @@
+from dataclasses import asdict
 from rest_framework import serializers
+from apps.security.argon2_calibration import argon2_calibrator
+from apps.security.crypto_service import ALGORITHM_REGISTRY, HashingError, check_argon2_params
+from .fixed_fields_serializer import FixedFieldsSerializer
 
-class CryptoRequestSerializer(serializers.Serializer):
-    OPERATION_CHOICES = (
-        ("encrypt", "encrypt"),
-        ("decrypt", "decrypt"),
-        ("hash", "hash"),
-        ("sign", "sign"),
-        ("verify", "verify"),
-        ("generate_keypair", "generate_keypair"),
-    )
 
-    ALGORITHM_CHOICES = (
-        ("aes-gcm", "aes-gcm"),
-        ("chacha20", "chacha20"),
-        ("blowfish", "blowfish"),
-        ("twofish", "twofish"),
-        ("caesar", "caesar"),
-        ("base64", "base64"),
-        ("sha256", "sha256"),
-        ("sha512", "sha512"),
-        ("argon2", "argon2"),
-        ("ecc", "ecc"),
-        ("rsa", "rsa"),
-    )
+class CryptoRequestSerializer(FixedFieldsSerializer):
+    OPERATION_CHOICES = tuple((name, name) for name in ALGORITHM_REGISTRY.operations())
+    ALGORITHM_CHOICES = tuple((name, name) for name in ALGORITHM_REGISTRY.names())
 
     operation = serializers.ChoiceField(choices=OPERATION_CHOICES)
     algorithm = serializers.ChoiceField(choices=ALGORITHM_CHOICES)
@@ -35,43 +20,30 @@ class CryptoRequestSerializer(serializers.Serializer):
     def validate(self, attrs):
         algorithm = attrs["algorithm"]
         operation = attrs["operation"]
-        key = attrs.get("key", "")
-        is_binary = attrs.get("is_binary", False)
-        
-        if algorithm == "caesar" and is_binary:
-            raise serializers.ValidationError(
-                "Шифр Цезаря не поддерживается для бинарных файлов"
-            )
-        
-        if operation == "hash":
-            if algorithm not in ["sha256", "sha512", "argon2"]:
-                raise serializers.ValidationError(
-                    "Для операции хэширования поддерживаются только sha256, sha512 и argon2"
-                )
-            if algorithm == "argon2":
-                if "params" not in attrs:
-                    attrs["params"] = {
-                        "time_cost": 2,
-                        "memory_cost": 512,
-                        "parallelism": 2,
-                        "hash_len": 32
-                    }
-        
-        if algorithm == "ecc":
-            if operation in ["sign", "verify"] and not key:
-                raise serializers.ValidationError("Для ECC операций необходим ключ")
-        
-        if operation == "generate_keypair":
-            if algorithm not in ["ecc", "rsa"]:
-                raise serializers.ValidationError(
-                    "Генерация ключевых пар поддерживается только для ECC и RSA"
+        params = attrs.get("params")
+        if params is not None and not isinstance(params, dict):
+            raise serializers.ValidationError("Параметры должны быть объектом")
+
+        errors, params = ALGORITHM_REGISTRY.validate_request(
+            algorithm, operation, attrs.get("key", ""), attrs.get("is_binary", False), params,
+        )
+        if errors:
+            raise serializers.ValidationError(errors)
+        if params is not None:
+            attrs["params"] = params
+
+        if algorithm == "argon2" and operation == "hash":
+            params = {**asdict(argon2_calibrator.parameters()), **(params or {})}
+            attrs["params"] = params
+            try:
+                check_argon2_params(
+                    params["time_cost"], params["memory_cost"], params["parallelism"], params["hash_len"],
                 )
-        
-        if operation in ["encrypt", "decrypt"]:
-            if algorithm not in {"base64"} and algorithm != "caesar" and not key:
-                raise serializers.ValidationError("Необходим ключ для выбранного алгоритма")
-            
-            if algorithm == "caesar" and not key:
-                attrs["key"] = "3"
-        
+            except HashingError as exc:
+                raise serializers.ValidationError(str(exc))
+
+        spec = ALGORITHM_REGISTRY[algorithm]
+        if spec.default_key is not None and not attrs.get("key"):
+            attrs["key"] = spec.default_key
+
         return attrs
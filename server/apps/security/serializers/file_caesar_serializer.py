@@ -0,0 +1,25 @@
+from rest_framework import serializers
+from apps.security.file_stream import DEFAULT_CHUNK_SIZE, MAX_CHUNK_SIZE, MIN_CHUNK_SIZE
+
+
+class FileCaesarRequestSerializer(serializers.Serializer):
+    OPERATION_CHOICES = (
+        ("encrypt", "encrypt"),
+        ("decrypt", "decrypt"),
+    )
+
+    key = serializers.IntegerField(
+        help_text="Сдвиг. Поле формы 'key' или заголовок X-Crypto-Key",
+    )
+    operation = serializers.ChoiceField(
+        choices=OPERATION_CHOICES,
+        default="encrypt",
+        required=False,
+    )
+    chunk_size = serializers.IntegerField(
+        min_value=MIN_CHUNK_SIZE,
+        max_value=MAX_CHUNK_SIZE,
+        default=DEFAULT_CHUNK_SIZE,
+        required=False,
+        help_text="Размер читаемого блока в байтах",
+    )
@@ -0,0 +1,26 @@
+from rest_framework import serializers
+from apps.security.file_stream import (
+    ALGORITHM_IDS,
+    DEFAULT_CHUNK_SIZE,
+    MAX_CHUNK_SIZE,
+    MIN_CHUNK_SIZE,
+)
+
+
+class FileCryptoRequestSerializer(serializers.Serializer):
+    key = serializers.CharField(
+        help_text="Ключ (пароль). Поле формы 'key' или заголовок X-Crypto-Key",
+    )
+    algorithm = serializers.ChoiceField(
+        choices=[(name, name) for name in ALGORITHM_IDS],
+        default="aes-gcm",
+        required=False,
+        help_text="Алгоритм AEAD для шифрования (при расшифровке берется из заголовка файла)",
+    )
+    chunk_size = serializers.IntegerField(
+        min_value=MIN_CHUNK_SIZE,
+        max_value=MAX_CHUNK_SIZE,
+        default=DEFAULT_CHUNK_SIZE,
+        required=False,
+        help_text="Размер блока открытого текста в байтах",
+    )
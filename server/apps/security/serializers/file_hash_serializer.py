@@ -0,0 +1,33 @@
+from rest_framework import serializers
+from apps.security.stream_hash import (
+    ALGORITHMS,
+    DEFAULT_LEAF_SIZE,
+    MAX_LEAF_SIZE,
+    MIN_LEAF_SIZE,
+)
+
+
+class FileHashRequestSerializer(serializers.Serializer):
+    MODE_CHOICES = (
+        ("flat", "flat"),
+        ("tree", "tree"),
+    )
+
+    algorithm = serializers.ChoiceField(
+        choices=[(name, name) for name in ALGORITHMS],
+        default="sha256",
+        required=False,
+    )
+    mode = serializers.ChoiceField(
+        choices=MODE_CHOICES,
+        default="flat",
+        required=False,
+        help_text="flat - обычный хэш файла, tree - корень дерева Меркла по листьям leaf_size",
+    )
+    leaf_size = serializers.IntegerField(
+        min_value=MIN_LEAF_SIZE,
+        max_value=MAX_LEAF_SIZE,
+        default=DEFAULT_LEAF_SIZE,
+        required=False,
+        help_text="Размер листа в байтах для режима tree",
+    )
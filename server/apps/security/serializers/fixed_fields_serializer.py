@@ -0,0 +1,29 @@
+import copy
+from rest_framework import serializers
+
+
+def _owns_children(field) -> bool:
+    # ListField/DictField bind their child and nested serializers their
+    # fields to themselves; a shallow copy would share those.
+    return isinstance(field, serializers.BaseSerializer) or hasattr(field, 'child') or hasattr(field, 'child_relation')
+
+
+class FixedFieldsSerializer(serializers.Serializer):
+    """
+    Serializer for hot request paths whose declared fields are plain and
+    never changed after import. DRF deep-copies every declared field for
+    each serializer instance, which rebuilds the field from its arguments:
+    for ChoiceFields that means re-copying and re-indexing all choices, and
+    the whole copy costs more than the validation itself.
+
+    Plain fields are copied with ``copy.copy`` instead. Binding a field only
+    assigns attributes on the copy, and the containers it shares with the
+    declared field (choices, validators, error messages) are never mutated.
+    Fields that own bound children still get DRF's deep copy.
+    """
+
+    def get_fields(self):
+        return {
+            name: copy.deepcopy(field) if _owns_children(field) else copy.copy(field)
+            for name, field in self._declared_fields.items()
+        }
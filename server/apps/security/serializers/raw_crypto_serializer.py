@@ -0,0 +1,29 @@
+from rest_framework import serializers
+from apps.security.crypto_service import ALGORITHM_REGISTRY
+from apps.security.registry import BINARY
+from .fixed_fields_serializer import FixedFieldsSerializer
+
+
+class RawCryptoRequestSerializer(FixedFieldsSerializer):
+    OPERATION_CHOICES = (
+        ("encrypt", "encrypt"),
+        ("decrypt", "decrypt"),
+    )
+
+    ALGORITHM_CHOICES = tuple((name, name) for name in ALGORITHM_REGISTRY.names(BINARY))
+
+    ENCODING_CHOICES = (
+        ("raw", "raw"),
+        ("base64", "base64"),
+    )
+
+    operation = serializers.ChoiceField(choices=OPERATION_CHOICES)
+    algorithm = serializers.ChoiceField(choices=ALGORITHM_CHOICES)
+    key = serializers.CharField(required=False, allow_blank=True)
+    mode = serializers.ChoiceField(choices=(("cbc", "cbc"), ("ctr", "ctr")), required=False)
+    encoding = serializers.ChoiceField(choices=ENCODING_CHOICES, default="raw", required=False)
+
+    def validate(self, attrs):
+        if ALGORITHM_REGISTRY[attrs["algorithm"]].needs_key(attrs["operation"]) and not attrs.get("key"):
+            raise serializers.ValidationError("Необходим ключ для выбранного алгоритма")
+        return attrs
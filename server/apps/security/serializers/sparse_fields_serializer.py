@@ -0,0 +1,17 @@
+from rest_framework import serializers
+
+
+class SparseFieldsSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer that renders only the fields named in
+    ``context['fields']`` (all of them when it is absent). The views fill it
+    in from ``?fields=``/``?omit=`` through SparseFieldsMixin, which also
+    restricts the queryset to the columns those fields read.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selected = self.context.get('fields')
+        if selected is None:
+            return fields
+        return {name: field for name, field in fields.items() if name in selected}
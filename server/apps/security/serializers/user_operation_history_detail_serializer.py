@@ -0,0 +1,19 @@
+from drf_spectacular.utils import extend_schema_serializer
+from rest_framework import serializers
+from apps.security import history_storage
+from .user_operation_history_serializer import UserOperationHistorySerializer
+
+
+@extend_schema_serializer(component_name='UserOperationHistoryDetail')
+class UserOperationHistoryDetailSerializer(UserOperationHistorySerializer):
+    """Операция истории с полными (распакованными) входными данными и результатом."""
+    input = serializers.SerializerMethodField()
+    output = serializers.SerializerMethodField()
+
+    @staticmethod
+    def get_input(obj) -> str:
+        return history_storage.unpack(obj.input_data, obj.input_body)
+
+    @staticmethod
+    def get_output(obj) -> str:
+        return history_storage.unpack(obj.output_data, obj.output_body)
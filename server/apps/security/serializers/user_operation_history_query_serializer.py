@@ -0,0 +1,39 @@
+from rest_framework import serializers
+from apps.security.history import DEFAULT_LIMIT, MAX_LIMIT
+from apps.security.models import UserOperationHistory
+
+
+class UserOperationHistoryQuerySerializer(serializers.Serializer):
+    operation_type = serializers.ChoiceField(
+        choices=UserOperationHistory.OPERATION_TYPE_CHOICES,
+        required=False,
+    )
+    algorithm = serializers.CharField(
+        max_length=100,
+        required=False,
+    )
+    since = serializers.DateTimeField(
+        required=False,
+        help_text="Операции начиная с этого момента (включительно)",
+    )
+    until = serializers.DateTimeField(
+        required=False,
+        help_text="Операции до этого момента (не включая его)",
+    )
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=MAX_LIMIT,
+        default=DEFAULT_LIMIT,
+        required=False,
+        help_text="Размер страницы; с limit или cursor ответ приходит постранично",
+    )
+    cursor = serializers.CharField(
+        required=False,
+        help_text="next_cursor из предыдущей страницы",
+    )
+
+    def validate(self, attrs):
+        since, until = attrs.get('since'), attrs.get('until')
+        if since is not None and until is not None and since >= until:
+            raise serializers.ValidationError({'until': 'Должно быть позже since'})
+        return attrs
@@ -1,10 +1,16 @@
 from drf_spectacular.utils import extend_schema_serializer
 from rest_framework import serializers
+from apps.security import history_storage
 from apps.security.models import UserOperationHistory
 
 
 @extend_schema_serializer(component_name='UserOperationHistory')
 class UserOperationHistorySerializer(serializers.ModelSerializer):
+    """
+    Операция истории. Длинные input/output отдаются началом (превью);
+    input_digest/output_digest - SHA-256 полных данных, полностью данные
+    отдает history/<id>/.
+    """
     type = serializers.CharField(source='operation_type')
     input = serializers.CharField(source='input_data')
     output = serializers.CharField(source='output_data')
@@ -16,7 +22,16 @@ class UserOperationHistorySerializer(serializers.ModelSerializer):
             'type',
             'algorithm',
             'input',
+            'input_digest',
             'output',
+            'output_digest',
             'timestamp',
         ]
-        read_only_fields = ['id', 'timestamp']
+        read_only_fields = ['id', 'input_digest', 'output_digest', 'timestamp']
+
+    def create(self, validated_data):
+        validated_data.update(history_storage.row_fields(
+            validated_data.pop('input_data'),
+            validated_data.pop('output_data'),
+        ))
+        return super().create(validated_data)
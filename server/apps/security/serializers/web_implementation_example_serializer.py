@@ -1,8 +1,8 @@
-from rest_framework import serializers
 from apps.security.models import WebImplementationExample
+from .sparse_fields_serializer import SparseFieldsSerializer
 
 
-class WebImplementationExampleSerializer(serializers.ModelSerializer):
+class WebImplementationExampleSerializer(SparseFieldsSerializer):
     class Meta:
         model = WebImplementationExample
         fields = [
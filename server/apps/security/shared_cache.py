@@ -0,0 +1,430 @@
+"""
+Django cache backend in a memory-mapped file shared by all workers of a node.
+
+Every worker process maps the same file (in /dev/shm by default, so it
+never touches a disk), so an entry cached by one gunicorn worker is a hit
+for all of them, without an external service. Without a LOCATION, the file
+name is derived from the settings module and BASE_DIR, so two deployments
+on one host (staging next to production, a second checkout) never share
+entries.
+
+The file is split into stripes; a key belongs to the stripe its hash
+selects. Each stripe has its own lock, an ``fcntl`` byte-range lock on the
+file for other processes plus a thread lock within the process, so
+operations on different stripes never wait for each other. A stripe is
+laid out as::
+
+    header (128) | slot table (SLOTS x 40) | heap
+
+The slot table is an open-addressing hash index into the heap, where key
+and pickled value are appended. When the heap or the table fills up,
+expired entries are dropped, then the least recently used ones until a
+tenth of the stripe is free, and the survivors are compacted to the start
+of the heap. Recency is the last access time kept per slot, so eviction is
+LRU within a stripe.
+
+Each stripe counts hits, misses, sets, deletes, evictions, expirations and
+compactions; ``stats()`` adds them up over the whole file.
+
+Options (``CACHES[...]["OPTIONS"]``): SIZE of the file in bytes, STRIPES,
+and SLOTS per stripe. The layout is part of the file name, so a process
+started with other values (a one-off ``manage.py`` command, the next
+release during a rolling deploy) gets a file of its own. A mapped file is
+never truncated: processes still using it would die with SIGBUS. Files of
+layouts no longer in use are left in place and can be removed once no
+process maps them. A process that finds a file it cannot use at its path
+logs a warning and caches in a private file instead.
+"""
+from __future__ import annotations
+import fcntl
+import hashlib
+import logging
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from django.conf import settings
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+MAGIC = b"DJSC"
+VERSION = 1
+DEFAULT_SIZE = 128 * 1024 * 1024
+DEFAULT_STRIPES = 32
+DEFAULT_SLOTS = 4096
+
+_FILE_HEADER = struct.Struct(">4sIIIQ")
+FILE_HEADER_SIZE = 64
+# heap top, live entries, used slots (live + deleted), then the counters.
+_STRIPE_HEADER = struct.Struct(">III4x7Q")
+STRIPE_HEADER_SIZE = 128
+_COUNTERS = ("hits", "misses", "sets", "deletes", "evictions", "expirations", "compactions")
+# key hash, heap offset, key length, state, value length, expiry, last access.
+_SLOT = struct.Struct(">QIHHI4xdd")
+_EMPTY, _LIVE, _DELETED = 0, 1, 2
+# A table fuller than this is rebuilt before the next insert.
+MAX_LOAD = 0.75
+# Share of a stripe's heap that eviction frees beyond what the new entry needs.
+EVICTION_HEADROOM = 0.1
+MAX_KEY_BYTES = 0xFFFF
+
+logger = logging.getLogger(__name__)
+
+
+def default_location() -> str:
+    """A path in shared memory of its own for this project."""
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    project = f"{settings.SETTINGS_MODULE}:{getattr(settings, 'BASE_DIR', '')}"
+    return os.path.join(directory, f"django-shared-cache-{hashlib.blake2b(project.encode(), digest_size=6).hexdigest()}")
+
+
+class SharedMemoryCache(BaseCache):
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self._size = int(options.get("SIZE", DEFAULT_SIZE))
+        self._stripes = int(options.get("STRIPES", DEFAULT_STRIPES))
+        self._slots = int(options.get("SLOTS", DEFAULT_SLOTS))
+        self._path = f"{location or default_location()}.v{VERSION}-{self._size}-{self._stripes}-{self._slots}"
+        self._stripe_size = (self._size - FILE_HEADER_SIZE) // self._stripes // 8 * 8
+        self._heap_size = self._stripe_size - STRIPE_HEADER_SIZE - self._slots * _SLOT.size
+        if self._heap_size <= 0:
+            raise ValueError("SIZE is too small for the number of STRIPES and SLOTS")
+        self._max_used = int(self._slots * MAX_LOAD)
+        self._open_lock = threading.Lock()
+        self._pid = None
+        self._shared = True
+        self._fd = None
+        self._map = None
+        self._thread_locks = []
+
+    # -- file and locking -------------------------------------------------
+
+    def _ensure_open(self) -> mmap.mmap:
+        """Map the file once per process; a forked worker maps it anew."""
+        if self._pid == os.getpid():
+            return self._map
+        with self._open_lock:
+            if self._pid != os.getpid():
+                os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+                fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o600)
+                fcntl.lockf(fd, fcntl.LOCK_EX, 1, 0)
+                try:
+                    # Only a file nobody has sized yet, hence nobody maps, is initialised.
+                    if os.fstat(fd).st_size == 0:
+                        self._initialise(fd)
+                    shared = self._has_layout(fd)
+                    if shared:
+                        mapped = mmap.mmap(fd, self._size)
+                finally:
+                    fcntl.lockf(fd, fcntl.LOCK_UN, 1, 0)
+                if not shared:
+                    os.close(fd)
+                    logger.warning(
+                        "Shared cache: %s has another layout or is not a cache file; "
+                        "this process uses a private cache", self._path,
+                    )
+                    fd, private = tempfile.mkstemp(prefix="django-shared-cache-", dir=os.path.dirname(self._path) or None)
+                    os.unlink(private)
+                    self._initialise(fd)
+                    mapped = mmap.mmap(fd, self._size)
+                self._fd, self._map, self._shared = fd, mapped, shared
+                self._thread_locks = [threading.Lock() for _ in range(self._stripes)]
+                self._pid = os.getpid()
+        return self._map
+
+    def _initialise(self, fd: int) -> None:
+        os.ftruncate(fd, self._size)
+        os.pwrite(fd, _FILE_HEADER.pack(MAGIC, VERSION, self._stripes, self._slots, self._size), 0)
+
+    def _has_layout(self, fd: int) -> bool:
+        if os.fstat(fd).st_size != self._size:
+            return False
+        header = os.pread(fd, _FILE_HEADER.size, 0)
+        return header == _FILE_HEADER.pack(MAGIC, VERSION, self._stripes, self._slots, self._size)
+
+    @contextmanager
+    def _locked(self, stripe: int):
+        self._ensure_open()
+        with self._thread_locks[stripe]:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, 1, 1 + stripe)
+            try:
+                yield self._map
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, 1 + stripe)
+
+    def _locate(self, key: str) -> tuple[bytes, int, int]:
+        """``(encoded key, key hash, stripe)``."""
+        encoded = key.encode("utf-8")
+        if len(encoded) > MAX_KEY_BYTES:
+            raise ValueError("Cache key is too long for the shared cache")
+        digest = int.from_bytes(hashlib.blake2b(encoded, digest_size=8).digest(), "big")
+        return encoded, digest, digest % self._stripes
+
+    # -- stripe internals (stripe lock held) ------------------------------
+
+    def _base(self, stripe: int) -> int:
+        return FILE_HEADER_SIZE + stripe * self._stripe_size
+
+    def _slot_offset(self, stripe: int, index: int) -> int:
+        return self._base(stripe) + STRIPE_HEADER_SIZE + index * _SLOT.size
+
+    def _heap(self, stripe: int) -> int:
+        return self._base(stripe) + STRIPE_HEADER_SIZE + self._slots * _SLOT.size
+
+    def _header(self, mapped, stripe: int) -> list:
+        return list(_STRIPE_HEADER.unpack_from(mapped, self._base(stripe)))
+
+    def _write_header(self, mapped, stripe: int, header: list) -> None:
+        _STRIPE_HEADER.pack_into(mapped, self._base(stripe), *header)
+
+    def _count(self, header: list, counter: str, amount: int = 1) -> None:
+        header[3 + _COUNTERS.index(counter)] += amount
+
+    def _find(self, mapped, stripe: int, encoded: bytes, digest: int) -> tuple[int, int]:
+        """``(slot of the key or -1, first slot a new entry can take)``."""
+        heap = self._heap(stripe)
+        index = (digest // self._stripes) % self._slots
+        free = -1
+        for _ in range(self._slots):
+            slot_hash, offset, key_len, state, _, _, _ = _SLOT.unpack_from(mapped, self._slot_offset(stripe, index))
+            if state == _EMPTY:
+                return -1, (index if free < 0 else free)
+            if state == _DELETED:
+                if free < 0:
+                    free = index
+            elif slot_hash == digest and key_len == len(encoded) and \
+                    mapped[heap + offset:heap + offset + key_len] == encoded:
+                return index, free
+            index = (index + 1) % self._slots
+        return -1, free
+
+    def _remove(self, mapped, stripe: int, index: int, header: list) -> None:
+        offset = self._slot_offset(stripe, index)
+        _SLOT.pack_into(mapped, offset, *(_SLOT.unpack_from(mapped, offset)[:3] + (_DELETED, 0, 0.0, 0.0)))
+        header[1] -= 1
+
+    def _live_entry(self, mapped, stripe: int, encoded: bytes, digest: int, header: list, now: float):
+        """Slot index and fields of a live, unexpired entry, or ``None``."""
+        index, _ = self._find(mapped, stripe, encoded, digest)
+        if index < 0:
+            return None
+        fields = _SLOT.unpack_from(mapped, self._slot_offset(stripe, index))
+        expires = fields[5]
+        if expires and expires <= now:
+            self._remove(mapped, stripe, index, header)
+            self._count(header, "expirations")
+            return None
+        return index, fields
+
+    def _read_value(self, mapped, stripe: int, fields) -> bytes:
+        _, offset, key_len, _, value_len, _, _ = fields
+        start = self._heap(stripe) + offset + key_len
+        return mapped[start:start + value_len]
+
+    def _touch_slot(self, mapped, stripe: int, index: int, fields, expires=None, now: float = 0.0) -> None:
+        new_expires = fields[5] if expires is None else expires
+        _SLOT.pack_into(mapped, self._slot_offset(stripe, index), *fields[:5], new_expires, now or fields[6])
+
+    def _store(self, mapped, stripe: int, encoded: bytes, digest: int, value: bytes, expires: float,
+               header: list, now: float) -> bool:
+        index, _ = self._find(mapped, stripe, encoded, digest)
+        if index >= 0:
+            self._remove(mapped, stripe, index, header)
+        need = len(encoded) + len(value)
+        if need > self._heap_size // 2:
+            return False
+        if header[0] + need > self._heap_size or header[2] + 1 > self._max_used:
+            self._make_room(mapped, stripe, need, header, now)
+
+        _, free = self._find(mapped, stripe, encoded, digest)
+        heap = self._heap(stripe)
+        offset = header[0]
+        mapped[heap + offset:heap + offset + len(encoded)] = encoded
+        mapped[heap + offset + len(encoded):heap + offset + need] = value
+        state = _SLOT.unpack_from(mapped, self._slot_offset(stripe, free))[3]
+        _SLOT.pack_into(mapped, self._slot_offset(stripe, free),
+                        digest, offset, len(encoded), _LIVE, len(value), expires, now)
+        header[0] += need
+        header[1] += 1
+        if state == _EMPTY:
+            header[2] += 1
+        self._count(header, "sets")
+        return True
+
+    def _make_room(self, mapped, stripe: int, need: int, header: list, now: float) -> None:
+        """Drop expired and least recently used entries, then compact the stripe."""
+        entries = []
+        for index in range(self._slots):
+            fields = _SLOT.unpack_from(mapped, self._slot_offset(stripe, index))
+            if fields[3] != _LIVE:
+                continue
+            if fields[5] and fields[5] <= now:
+                self._count(header, "expirations")
+                continue
+            entries.append(fields)
+
+        budget = int((self._heap_size - need) * (1 - EVICTION_HEADROOM))
+        max_entries = int(self._max_used * (1 - EVICTION_HEADROOM))
+        used = sum(fields[2] + fields[4] for fields in entries)
+        entries.sort(key=lambda fields: fields[6], reverse=True)
+        while entries and (used > budget or len(entries) >= max_entries):
+            evicted = entries.pop()
+            used -= evicted[2] + evicted[4]
+            self._count(header, "evictions")
+
+        # Compact in heap order: every record moves down, never over one
+        # that is still to be moved.
+        heap = self._heap(stripe)
+        entries.sort(key=lambda fields: fields[1])
+        table_start = self._slot_offset(stripe, 0)
+        mapped[table_start:table_start + self._slots * _SLOT.size] = bytes(self._slots * _SLOT.size)
+        top = 0
+        for digest, offset, key_len, _, value_len, expires, accessed in entries:
+            size = key_len + value_len
+            if offset != top:
+                mapped.move(heap + top, heap + offset, size)
+            index = (digest // self._stripes) % self._slots
+            while _SLOT.unpack_from(mapped, self._slot_offset(stripe, index))[3] != _EMPTY:
+                index = (index + 1) % self._slots
+            _SLOT.pack_into(mapped, self._slot_offset(stripe, index),
+                            digest, top, key_len, _LIVE, value_len, expires, accessed)
+            top += size
+        header[0], header[1], header[2] = top, len(entries), len(entries)
+        self._count(header, "compactions")
+
+    # -- Django cache API -------------------------------------------------
+
+    def _expiry(self, timeout) -> float:
+        expires = self.get_backend_timeout(timeout)
+        return 0.0 if expires is None else expires
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        pickled = pickle.dumps(value, self.pickle_protocol)
+        encoded, digest, stripe = self._locate(key)
+        now = time.time()
+        with self._locked(stripe) as mapped:
+            header = self._header(mapped, stripe)
+            added = False
+            if self._live_entry(mapped, stripe, encoded, digest, header, now) is None:
+                added = self._store(mapped, stripe, encoded, digest, pickled, self._expiry(timeout), header, now)
+            self._write_header(mapped, stripe, header)
+        return added
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        encoded, digest, stripe = self._locate(key)
+        now = time.time()
+        with self._locked(stripe) as mapped:
+            header = self._header(mapped, stripe)
+            entry = self._live_entry(mapped, stripe, encoded, digest, header, now)
+            if entry is None:
+                self._count(header, "misses")
+                pickled = None
+            else:
+                index, fields = entry
+                pickled = self._read_value(mapped, stripe, fields)
+                self._touch_slot(mapped, stripe, index, fields, now=now)
+                self._count(header, "hits")
+            self._write_header(mapped, stripe, header)
+        return default if pickled is None else pickle.loads(pickled)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        pickled = pickle.dumps(value, self.pickle_protocol)
+        encoded, digest, stripe = self._locate(key)
+        now = time.time()
+        with self._locked(stripe) as mapped:
+            header = self._header(mapped, stripe)
+            self._store(mapped, stripe, encoded, digest, pickled, self._expiry(timeout), header, now)
+            self._write_header(mapped, stripe, header)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        encoded, digest, stripe = self._locate(key)
+        now = time.time()
+        with self._locked(stripe) as mapped:
+            header = self._header(mapped, stripe)
+            entry = self._live_entry(mapped, stripe, encoded, digest, header, now)
+            if entry is not None:
+                index, fields = entry
+                self._touch_slot(mapped, stripe, index, fields, expires=self._expiry(timeout), now=now)
+            self._write_header(mapped, stripe, header)
+        return entry is not None
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        encoded, digest, stripe = self._locate(key)
+        now = time.time()
+        with self._locked(stripe) as mapped:
+            header = self._header(mapped, stripe)
+            entry = self._live_entry(mapped, stripe, encoded, digest, header, now)
+            if entry is None:
+                self._write_header(mapped, stripe, header)
+                raise ValueError("Key '%s' not found" % key)
+            _, fields = entry
+            new_value = pickle.loads(self._read_value(mapped, stripe, fields)) + delta
+            self._store(mapped, stripe, encoded, digest, pickle.dumps(new_value, self.pickle_protocol),
+                        fields[5], header, now)
+            self._write_header(mapped, stripe, header)
+        return new_value
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        encoded, digest, stripe = self._locate(key)
+        with self._locked(stripe) as mapped:
+            header = self._header(mapped, stripe)
+            found = self._live_entry(mapped, stripe, encoded, digest, header, time.time()) is not None
+            self._write_header(mapped, stripe, header)
+        return found
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        encoded, digest, stripe = self._locate(key)
+        with self._locked(stripe) as mapped:
+            header = self._header(mapped, stripe)
+            index, _ = self._find(mapped, stripe, encoded, digest)
+            if index >= 0:
+                self._remove(mapped, stripe, index, header)
+                self._count(header, "deletes")
+            self._write_header(mapped, stripe, header)
+        return index >= 0
+
+    def clear(self):
+        table = bytes(STRIPE_HEADER_SIZE + self._slots * _SLOT.size)
+        for stripe in range(self._stripes):
+            with self._locked(stripe) as mapped:
+                base = self._base(stripe)
+                mapped[base:base + len(table)] = table
+
+    def stats(self) -> dict:
+        """Counters and fill level summed over all stripes."""
+        totals = dict.fromkeys(_COUNTERS, 0)
+        entries = heap_used = 0
+        for stripe in range(self._stripes):
+            with self._locked(stripe) as mapped:
+                header = self._header(mapped, stripe)
+            heap_used += header[0]
+            entries += header[1]
+            for name, value in zip(_COUNTERS, header[3:]):
+                totals[name] += value
+        lookups = totals["hits"] + totals["misses"]
+        return {
+            "backend": "shared-memory",
+            "location": self._path,
+            "shared": self._shared,
+            "size": self._size,
+            "stripes": self._stripes,
+            "slots_per_stripe": self._slots,
+            "entries": entries,
+            "heap_used": heap_used,
+            "heap_capacity": self._heap_size * self._stripes,
+            "hit_rate": round(totals["hits"] / lookups, 4) if lookups else None,
+            **totals,
+        }
@@ -0,0 +1,130 @@
+"""
+Sparse fieldsets and opt-in cursor pagination for the catalog lists.
+
+``?fields=name,security`` renders only the listed fields, ``?omit=description``
+all but the listed ones. The selection is pushed down to the query: the
+queryset is restricted with ``.only()`` to the columns the selected fields
+read (plus the primary key), and joins for related fields that are not
+selected are dropped, so long text and JSON columns are never fetched for a
+list that does not show them.
+
+Lists stay unpaginated by default. Passing ``page_size`` or ``cursor``
+switches to cursor pagination over ``id``.
+"""
+from __future__ import annotations
+from django.core.exceptions import FieldDoesNotExist
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
+
+# Query parameters of SparseFieldsMixin views, for extend_schema.
+PARAMETERS = [
+    OpenApiParameter('fields', OpenApiTypes.STR, description='Только эти поля, через запятую'),
+    OpenApiParameter('omit', OpenApiTypes.STR, description='Все поля, кроме этих, через запятую'),
+]
+
+
+def _names(value: str) -> list[str]:
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def selected_fields(query_params, available) -> tuple[str, ...] | None:
+    """
+    Field names selected by ``fields``/``omit`` out of ``available``, in
+    serializer order; ``None`` when neither parameter is given.
+    """
+    fields, omit = query_params.get('fields'), query_params.get('omit')
+    if fields is None and omit is None:
+        return None
+    if fields is not None and omit is not None:
+        raise ValidationError({'fields': ['Укажите либо fields, либо omit, но не оба параметра']})
+    names = _names(fields if fields is not None else omit)
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise ValidationError({
+            'fields' if fields is not None else 'omit': [f'Неизвестные поля: {", ".join(unknown)}'],
+        })
+    if fields is not None:
+        return tuple(name for name in available if name in names)
+    return tuple(name for name in available if name not in names)
+
+
+def _column(model, field) -> str | None:
+    """ORM path read by a serializer field, or None for computed ones."""
+    if isinstance(field, serializers.SerializerMethodField) or field.source == '*':
+        return None
+    path = field.source.replace('.', '__')
+    try:
+        model._meta.get_field(path.split('__')[0])
+    except FieldDoesNotExist:
+        return None
+    return path
+
+
+def project(queryset, serializer, names) -> object:
+    """
+    Restrict ``queryset`` to the columns read by the fields ``names`` of
+    ``serializer``. Computed fields declare the model fields they read in
+    ``Meta.computed_sources``.
+    """
+    model = queryset.model
+    computed = getattr(serializer.Meta, 'computed_sources', {})
+    columns = {model._meta.pk.name}
+    for name in names:
+        column = _column(model, serializer.fields[name])
+        if column is not None:
+            columns.add(column)
+        columns.update(computed.get(name, ()))
+    related = sorted({column.split('__')[0] for column in columns if '__' in column})
+    # A deferred foreign key cannot be followed by select_related.
+    queryset = queryset.select_related(None)
+    if related:
+        queryset = queryset.select_related(*related)
+    return queryset.only(*columns)
+
+
+class SparseFieldsMixin:
+    """
+    For generic views over a SparseFieldsSerializer: apply ``?fields=`` and
+    ``?omit=`` to the serializer and push them down to the queryset.
+    """
+
+    def selected_fields(self) -> tuple[str, ...] | None:
+        if not hasattr(self, '_selected_fields'):
+            self._selected_fields = selected_fields(self.request.query_params, self._serializer().fields)
+        return self._selected_fields
+
+    def renders(self, name: str) -> bool:
+        selected = self.selected_fields()
+        return selected is None or name in selected
+
+    def _serializer(self):
+        return self.get_serializer_class()(context={})
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        selected = self.selected_fields()
+        if selected is None:
+            return queryset
+        return project(queryset, self._serializer(), selected)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'] = self.selected_fields()
+        return context
+
+
+class CatalogCursorPagination(CursorPagination):
+    """Cursor pagination over ``id``, used only when the client asks for it."""
+    ordering = 'id'
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
@@ -0,0 +1,139 @@
+"""
+Streaming and tree hashing for large inputs.
+
+``hash_stream`` feeds the input chunk by chunk into one incremental
+hasher. ``tree_hash`` cuts the input into fixed-size leaves, hashes the
+leaves on a thread pool and combines them into a Merkle root. hashlib
+releases the GIL while hashing buffers larger than 2 KiB, so leaves are
+hashed on several cores at once without copying them to other processes.
+
+Tree layout (domain-separated as in RFC 6962)::
+
+    leaf  = H(0x00 || leaf bytes)
+    node  = H(0x01 || left || right)
+
+Levels are combined pairwise; an odd node at the end of a level moves up
+unchanged. An empty input is a single empty leaf. Only a bounded window
+of leaves is in memory at a time.
+"""
+from __future__ import annotations
+import hashlib
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable
+from .crypto_service import HashingError
+from .file_stream import _rechunk
+from .key_cache import _cache_settings
+
+ALGORITHMS = {
+    "sha256": hashlib.sha256,
+    "sha512": hashlib.sha512,
+}
+DEFAULT_LEAF_SIZE = 1024 * 1024
+MIN_LEAF_SIZE = 4 * 1024
+MAX_LEAF_SIZE = 64 * 1024 * 1024
+
+_LEAF_PREFIX = b"\x00"
+_NODE_PREFIX = b"\x01"
+
+_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+
+
+@dataclass(frozen=True)
+class StreamDigest:
+    algorithm: str
+    mode: str
+    digest: str
+    size: int
+    leaf_size: int | None = None
+    leaves: int | None = None
+
+
+def _hash_workers() -> int:
+    config = _cache_settings("CRYPTO_HASH_TREE")
+    return max(1, int(config.get("MAX_WORKERS", os.cpu_count() or 1)))
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=_hash_workers(), thread_name_prefix="tree-hash")
+        return _executor
+
+
+def _constructor(algorithm: str):
+    if algorithm not in ALGORITHMS:
+        raise HashingError(f"Неподдерживаемый алгоритм хэширования: {algorithm}")
+    return ALGORITHMS[algorithm]
+
+
+def hash_stream(pieces: Iterable[bytes], algorithm: str = "sha256") -> StreamDigest:
+    """Hash ``pieces`` incrementally; memory use is one piece at a time."""
+    hasher = _constructor(algorithm)()
+    size = 0
+    for piece in pieces:
+        hasher.update(piece)
+        size += len(piece)
+    return StreamDigest(algorithm=algorithm, mode="flat", digest=hasher.hexdigest(), size=size)
+
+
+def _leaf_digest(constructor, leaf: bytes) -> bytes:
+    hasher = constructor(_LEAF_PREFIX)
+    hasher.update(leaf)
+    return hasher.digest()
+
+
+def merkle_root(digests: list[bytes], constructor) -> bytes:
+    """Combine leaf digests level by level into the root digest."""
+    level = digests
+    while len(level) > 1:
+        paired = [
+            constructor(_NODE_PREFIX + level[index] + level[index + 1]).digest()
+            for index in range(0, len(level) - 1, 2)
+        ]
+        if len(level) % 2:
+            paired.append(level[-1])
+        level = paired
+    return level[0]
+
+
+def tree_hash(
+    pieces: Iterable[bytes],
+    algorithm: str = "sha256",
+    leaf_size: int = DEFAULT_LEAF_SIZE,
+) -> StreamDigest:
+    """Hash ``pieces`` as a Merkle tree of ``leaf_size``-byte leaves."""
+    constructor = _constructor(algorithm)
+    if not MIN_LEAF_SIZE <= leaf_size <= MAX_LEAF_SIZE:
+        raise HashingError("Недопустимый размер листа")
+
+    executor = _get_executor()
+    # Two leaves per worker keep every core busy while the next leaf is read.
+    window_size = 2 * _hash_workers()
+    window = deque()
+    digests: list[bytes] = []
+    size = 0
+    for leaf in _rechunk(pieces, leaf_size):
+        # _rechunk ends with the remainder, which is empty for inputs that
+        # are a multiple of the leaf size; keep it only for empty input.
+        if not leaf and size:
+            break
+        size += len(leaf)
+        window.append(executor.submit(_leaf_digest, constructor, leaf))
+        if len(window) >= window_size:
+            digests.append(window.popleft().result())
+    digests.extend(future.result() for future in window)
+
+    return StreamDigest(
+        algorithm=algorithm,
+        mode="tree",
+        digest=merkle_root(digests, constructor).hex(),
+        size=size,
+        leaf_size=leaf_size,
+        leaves=len(digests),
+    )
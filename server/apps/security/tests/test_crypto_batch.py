@@ -0,0 +1,112 @@
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from apps.security import worker_pool
+from apps.security.argon2_executor import argon2_executor
+from apps.security.crypto_service import generate_ecc_keypair, hash_sha256
+
+# Enough items for map_ordered to send the batch to the worker processes.
+PARALLEL_ITEMS = 8
+
+
+@override_settings(CRYPTO_WORKER_POOL={'MAX_WORKERS': 2, 'START_METHOD': 'spawn', 'MIN_PARALLEL_ITEMS': PARALLEL_ITEMS})
+class CryptoBatchParallelTests(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        worker_pool.shutdown()
+
+    @classmethod
+    def tearDownClass(cls):
+        worker_pool.shutdown()
+        super().tearDownClass()
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(email='batch@example.com', password='password')
+        self.client.force_authenticate(user)
+
+    def post_batch(self, items):
+        response = self.client.post(f"{reverse('crypto-batch')}?history=false", {'items': items}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['failed'], 0, response.data['results'])
+        self.assertEqual([item['index'] for item in response.data['results']], list(range(len(items))))
+        return response.data['results']
+
+    def test_encrypt_and_decrypt(self):
+        key = '0123456789abcdef0123456789abcdef'
+        encrypted = self.post_batch([
+            {'operation': 'encrypt', 'algorithm': 'aes-gcm', 'payload': f'message {i}', 'key': key}
+            for i in range(PARALLEL_ITEMS)
+        ])
+        decrypted = self.post_batch([
+            {'operation': 'decrypt', 'algorithm': 'aes-gcm', 'payload': item['result'], 'key': key}
+            for item in encrypted
+        ])
+        self.assertEqual([item['result'] for item in decrypted], [f'message {i}' for i in range(PARALLEL_ITEMS)])
+
+    def test_hash_and_verify(self):
+        hashed = self.post_batch([
+            {'operation': 'hash', 'algorithm': 'sha256', 'payload': f'message {i}'}
+            for i in range(PARALLEL_ITEMS)
+        ])
+        self.assertEqual([item['hash'] for item in hashed], [hash_sha256(f'message {i}') for i in range(PARALLEL_ITEMS)])
+        # The batch went through the worker processes.
+        self.assertIsNotNone(worker_pool._executor)
+        verified = self.post_batch([
+            {'operation': 'verify', 'algorithm': 'sha256', 'payload': f'message {i}', 'params': {'hash': item['hash']}}
+            for i, item in enumerate(hashed)
+        ] + [{'operation': 'verify', 'algorithm': 'sha256', 'payload': 'other', 'params': {'hash': hashed[0]['hash']}}])
+        self.assertEqual([item['is_valid'] for item in verified], [True] * PARALLEL_ITEMS + [False])
+
+    def test_sign_and_verify(self):
+        keypair = generate_ecc_keypair()
+        signed = self.post_batch([
+            {'operation': 'sign', 'algorithm': 'ecc', 'payload': f'message {i}', 'key': keypair.private_key_b64}
+            for i in range(PARALLEL_ITEMS)
+        ])
+        verified = self.post_batch([
+            {
+                'operation': 'verify', 'algorithm': 'ecc', 'payload': f'message {i}',
+                'key': keypair.public_key_b64, 'params': {'signature': item['signature']},
+            }
+            for i, item in enumerate(signed)
+        ])
+        self.assertTrue(all(item['is_valid'] for item in verified))
+
+    def test_argon2_hash(self):
+        params = {'time_cost': 1, 'memory_cost': 1024, 'parallelism': 1, 'hash_len': 16}
+        submitted = argon2_executor.stats().submitted
+        results = self.post_batch([
+            {'operation': 'hash', 'algorithm': 'argon2', 'payload': f'secret {i}', 'params': params}
+            for i in range(PARALLEL_ITEMS + 1)
+        ])
+        self.assertTrue(all(item['hash'].startswith('$argon2id$v=19$m=1024,t=1,p=1$') for item in results))
+        # Hashed under this process's memory budget, not in the workers.
+        self.assertEqual(argon2_executor.stats().submitted - submitted, PARALLEL_ITEMS + 1)
+
+    def test_argon2_verify_next_to_pool_items(self):
+        params = {'time_cost': 1, 'memory_cost': 1024, 'parallelism': 1, 'hash_len': 16}
+        hashed = self.post_batch([{'operation': 'hash', 'algorithm': 'argon2', 'payload': 'secret', 'params': params}])
+        items = [
+            {'operation': 'verify', 'algorithm': 'argon2', 'payload': 'secret', 'params': {'hash': hashed[0]['hash']}},
+            {'operation': 'hash', 'algorithm': 'sha512', 'payload': 'secret'},
+        ] * PARALLEL_ITEMS
+        results = self.post_batch(items)
+        self.assertTrue(all(item['is_valid'] for item in results[::2]))
+        self.assertEqual(len({item['hash'] for item in results[1::2]}), 1)
+
+    def test_keypair_generation_in_workers_bypasses_key_pool(self):
+        results = self.post_batch([
+            {'operation': 'generate_keypair', 'algorithm': 'ecc', 'params': {'curve': 'P-256'}}
+            for _ in range(PARALLEL_ITEMS)
+        ])
+        self.assertEqual(len({item['public_key'] for item in results}), PARALLEL_ITEMS)
+        # Each worker generated its keys directly; none filled a stock of its own.
+        stocks = worker_pool.get_executor().map(_key_pool_stock, range(4))
+        self.assertEqual(set(stocks), {0})
+
+
+def _key_pool_stock(_) -> int:
+    from apps.security.key_pool import key_pool
+    return sum(stats.depth + stats.in_flight + stats.queued for stats in key_pool.stats())
@@ -0,0 +1,35 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from apps.security.classical import caesar_shift, caesar_shift_utf8_stream
+
+
+class CaesarStreamTests(APITestCase):
+    TEXT = 'Съешь же ещё этих мягких французских булок. The quick brown fox. ' * 2000
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(email='caesar@example.com', password='password')
+        self.client.force_authenticate(user)
+
+    def post_file(self, body: bytes, operation: str):
+        return self.client.post(
+            f"{reverse('file-caesar')}?history=false&operation={operation}&chunk_size=4096",
+            body, content_type='application/octet-stream', HTTP_X_CRYPTO_KEY='5',
+        )
+
+    def test_chunks_split_inside_characters(self):
+        encoded = self.TEXT.encode()
+        chunks = [encoded[offset:offset + 7] for offset in range(0, len(encoded), 7)]
+        self.assertEqual(b''.join(caesar_shift_utf8_stream(chunks, 5)).decode(), caesar_shift(self.TEXT, 5))
+
+    def test_file_round_trip(self):
+        response = self.post_file(self.TEXT.encode(), 'encrypt')
+        self.assertEqual(response.status_code, 200)
+        encrypted = b''.join(response.streaming_content)
+        self.assertEqual(encrypted.decode(), caesar_shift(self.TEXT, 5))
+
+        response = self.post_file(encrypted, 'decrypt')
+        self.assertEqual(b''.join(response.streaming_content).decode(), self.TEXT)
+
+    def test_rejects_binary_file(self):
+        self.assertEqual(self.post_file(b'\xff\xfe' * 10, 'encrypt').status_code, 400)
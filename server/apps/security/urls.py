@@ -1,25 +1,57 @@
 from django.urls import path
 from apps.security.views import (
     AlgorithmComparisonListView,
+    AlgorithmMeasurementView,
     CryptoProcessView,
+    CryptoBatchView,
+    RawCryptoView,
+    FileEncryptView,
+    FileDecryptView,
+    FileHashView,
+    FileCaesarView,
     RSAGenerateKeyPairView,
+    KeyPoolStatsView,
+    Argon2StatsView,
+    Argon2ProfileView,
+    CacheStatsView,
+    HistoryRecorderStatsView,
+    AutoAeadCalibrationView,
     RSASignView,
     RSAVerifyView,
+    BulkVerifyView,
     UserOperationHistoryView,
+    UserOperationHistoryDetailView,
     WebImplementationExampleListView,
     CryptoCategoryListView,
-    CryptoAlgorithmListView
+    CryptoAlgorithmListView,
+    CryptoAlgorithmDetailView,
 )
 
 
 urlpatterns = [
     path('algorithm-comparison/', AlgorithmComparisonListView.as_view(), name='algorithm-comparison'),
+    path('algorithm-comparison/measurements/', AlgorithmMeasurementView.as_view(), name='algorithm-measurements'),
     path('crypto/', CryptoProcessView.as_view(), name='crypto-process'),
+    path('crypto/batch/', CryptoBatchView.as_view(), name='crypto-batch'),
+    path('crypto/raw/', RawCryptoView.as_view(), name='crypto-raw'),
+    path('crypto/auto/calibration/', AutoAeadCalibrationView.as_view(), name='crypto-auto-calibration'),
+    path('files/encrypt/', FileEncryptView.as_view(), name='file-encrypt'),
+    path('files/decrypt/', FileDecryptView.as_view(), name='file-decrypt'),
+    path('files/hash/', FileHashView.as_view(), name='file-hash'),
+    path('files/caesar/', FileCaesarView.as_view(), name='file-caesar'),
     path('rsa/keypair/', RSAGenerateKeyPairView.as_view(), name='rsa-keypair'),
+    path('rsa/key-pool/', KeyPoolStatsView.as_view(), name='rsa-key-pool'),
     path('rsa/sign/', RSASignView.as_view(), name='rsa-sign'),
     path('rsa/verify/', RSAVerifyView.as_view(), name='rsa-verify'),
+    path('argon2/stats/', Argon2StatsView.as_view(), name='argon2-stats'),
+    path('argon2/profile/', Argon2ProfileView.as_view(), name='argon2-profile'),
+    path('cache/stats/', CacheStatsView.as_view(), name='cache-stats'),
+    path('signatures/verify-bulk/', BulkVerifyView.as_view(), name='signatures-verify-bulk'),
     path('history/', UserOperationHistoryView.as_view(), name='user-operation-history'),
+    path('history/<int:pk>/', UserOperationHistoryDetailView.as_view(), name='user-operation-history-detail'),
+    path('history/recorder/', HistoryRecorderStatsView.as_view(), name='history-recorder'),
     path('web-implementations/', WebImplementationExampleListView.as_view(), name='web-implementations'),
     path('crypto-categories/', CryptoCategoryListView.as_view(), name='crypto-categories'),
     path('crypto-algorithms/', CryptoAlgorithmListView.as_view(), name='crypto-algorithms'),
+    path('crypto-algorithms/<int:pk>/', CryptoAlgorithmDetailView.as_view(), name='crypto-algorithm-detail'),
 ]
@@ -1,9 +1,22 @@
 from .crypto_category_view import CryptoCategoryListView
 from .crypto_process_view import CryptoProcessView
-from .crypto_algorithm_view import CryptoAlgorithmListView
+from .crypto_batch_view import CryptoBatchView
+from .file_crypto_view import FileEncryptView, FileDecryptView, FileHashView, FileCaesarView
+from .raw_crypto_view import RawCryptoView
+from .crypto_algorithm_view import CryptoAlgorithmListView, CryptoAlgorithmDetailView
 from .algorithm_comparison_view import AlgorithmComparisonListView
-from .user_operation_history_view import UserOperationHistoryView
+from .algorithm_measurement_view import AlgorithmMeasurementView
+from .user_operation_history_view import UserOperationHistoryView, UserOperationHistoryDetailView
 from .web_implementation_view import WebImplementationExampleListView
+from .metrics_views import (
+    Argon2ProfileView,
+    Argon2StatsView,
+    AutoAeadCalibrationView,
+    CacheStatsView,
+    HistoryRecorderStatsView,
+    KeyPoolStatsView,
+)
+from .signature_views import BulkVerifyView
 from .rsa_views import (
     RSAVerifyView,
     RSASignView,
@@ -1,12 +1,22 @@
 from drf_spectacular.utils import extend_schema
 from rest_framework import permissions
 from rest_framework.generics import ListAPIView
+from apps.security.measurements import measured_speeds
 from apps.security.serializers import AlgorithmComparisonSerializer
 from apps.security.models import AlgorithmComparison
+from apps.security.response_cache import CachedListMixin
+from apps.security.sparse_fields import PARAMETERS, CatalogCursorPagination, SparseFieldsMixin
 
 
-@extend_schema(tags=['Алгоритмы для сравнения'])
-class AlgorithmComparisonListView(ListAPIView):
+@extend_schema(tags=['Алгоритмы для сравнения'], parameters=PARAMETERS)
+class AlgorithmComparisonListView(CachedListMixin, SparseFieldsMixin, ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
+    cache_name = 'algorithm-comparison'
+    pagination_class = CatalogCursorPagination
     serializer_class = AlgorithmComparisonSerializer
     queryset = AlgorithmComparison.objects.all()
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['measurements'] = measured_speeds() if self.renders('measured') else {}
+        return context
@@ -0,0 +1,44 @@
+from dataclasses import asdict
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from rest_framework.views import APIView
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from apps.security.measurements import MeasurementInProgress, host_name, measure_host, measured_speeds
+from apps.security.serializers import AlgorithmMeasurementRequestSerializer
+
+
+@extend_schema(
+    tags=['Алгоритмы для сравнения'],
+    summary='Замеры скорости алгоритмов на сервере',
+    request=AlgorithmMeasurementRequestSerializer,
+    responses={200: OpenApiTypes.OBJECT},
+)
+class AlgorithmMeasurementView(APIView):
+    """
+    Speed of the implemented algorithms measured on the server.
+
+    - GET: current measurements per algorithm
+    - POST: measure on the host serving the request; only stale entries
+      are re-measured unless ``force`` is set. Blocks for a few seconds
+      per measured algorithm.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    @staticmethod
+    def get(request):
+        return Response({
+            "host": host_name(),
+            "measurements": measured_speeds(),
+        }, status=status.HTTP_200_OK)
+
+    @staticmethod
+    def post(request):
+        serializer = AlgorithmMeasurementRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        try:
+            report = measure_host(data.get('algorithms'), force=data['force'])
+        except MeasurementInProgress as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_409_CONFLICT)
+        return Response(asdict(report), status=status.HTTP_200_OK)
@@ -1,15 +1,38 @@
 from drf_spectacular.utils import extend_schema
 from rest_framework import permissions
-from rest_framework.generics import ListAPIView
+from rest_framework.generics import ListAPIView, RetrieveAPIView
 from apps.security.models import CryptoAlgorithm
 from apps.security.serializers import CryptoAlgorithmSerializer
+from apps.security.response_cache import CachedListMixin, CachedRetrieveMixin
+from apps.security.sparse_fields import PARAMETERS, CatalogCursorPagination, SparseFieldsMixin
 
 
 @extend_schema(
     tags=['Обучающие материалы'],
     summary='Список криптоалгоритмов для базы знаний',
+    parameters=PARAMETERS,
 )
-class CryptoAlgorithmListView(ListAPIView):
+class CryptoAlgorithmListView(CachedListMixin, SparseFieldsMixin, ListAPIView):
+    """
+    Для списков достаточно легких полей, например
+    ``?fields=id,category_key,name,key_size,security,speed``; длинные тексты
+    и списки отдает CryptoAlgorithmDetailView.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    cache_name = 'crypto-algorithms'
+    pagination_class = CatalogCursorPagination
+    serializer_class = CryptoAlgorithmSerializer
+    queryset = CryptoAlgorithm.objects.select_related('category').all()
+
+
+@extend_schema(
+    tags=['Обучающие материалы'],
+    summary='Криптоалгоритм базы знаний со всеми описаниями',
+    parameters=PARAMETERS,
+)
+class CryptoAlgorithmDetailView(CachedRetrieveMixin, SparseFieldsMixin, RetrieveAPIView):
     permission_classes = [permissions.IsAuthenticated]
+    cache_name = 'crypto-algorithms'
     serializer_class = CryptoAlgorithmSerializer
     queryset = CryptoAlgorithm.objects.select_related('category').all()
@@ -0,0 +1,52 @@
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from rest_framework.views import APIView
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from apps.security.argon2_executor import argon2_executor
+from apps.security.crypto_service import process_batch_item, runs_in_server_process
+from apps.security.history_recorder import record, result_text
+from apps.security.serializers import CryptoBatchRequestSerializer
+from apps.security.worker_pool import map_ordered
+
+
+@extend_schema(
+    tags=['Криптооперации'],
+    summary='Пакетное выполнение криптоопераций',
+    request=CryptoBatchRequestSerializer,
+    responses={200: OpenApiTypes.OBJECT},
+)
+class CryptoBatchView(APIView):
+    """
+    Runs many crypto operations in one request. Accepts ``{"items": [...]}``
+    or a bare list of items in the CryptoRequestSerializer format. Valid
+    items are spread over the worker process pool; results come back in
+    input order, each with ``ok`` and either the result or ``detail``.
+    Argon2 items stay in this process, under its Argon2 memory budget.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    @staticmethod
+    def post(request):
+        body = {"items": request.data} if isinstance(request.data, list) else request.data
+        serializer = CryptoBatchRequestSerializer(data=body)
+        serializer.is_valid(raise_exception=True)
+        checked = serializer.validated_data['items']
+
+        valid = [data for data, errors in checked if errors is None]
+        processed = iter(map_ordered(
+            process_batch_item, valid, local=runs_in_server_process, local_threads=argon2_executor.max_workers,
+        ))
+
+        results = []
+        for index, (data, errors) in enumerate(checked):
+            item = next(processed) if errors is None else {"ok": False, "detail": errors}
+            if item["ok"]:
+                record(request, data['operation'], data['algorithm'], data.get('payload', ''), result_text(item))
+            results.append({"index": index, **item})
+
+        return Response({
+            "count": len(results),
+            "failed": sum(not item["ok"] for item in results),
+            "results": results,
+        }, status=status.HTTP_200_OK)
@@ -3,13 +3,18 @@ from rest_framework import permissions
 from rest_framework.generics import ListAPIView
 from apps.security.models import CryptoCategory
 from apps.security.serializers import CryptoCategorySerializer
+from apps.security.response_cache import CachedListMixin
+from apps.security.sparse_fields import PARAMETERS, CatalogCursorPagination, SparseFieldsMixin
 
 
 @extend_schema(
     tags=['Обучающие материалы'],
     summary='Список категорий криптографии для базы знаний',
+    parameters=PARAMETERS,
 )
-class CryptoCategoryListView(ListAPIView):
+class CryptoCategoryListView(CachedListMixin, SparseFieldsMixin, ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
+    cache_name = 'crypto-categories'
+    pagination_class = CatalogCursorPagination
     serializer_class = CryptoCategorySerializer
     queryset = CryptoCategory.objects.all()
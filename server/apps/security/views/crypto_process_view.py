@@ -1,8 +1,10 @@
 from drf_spectacular.utils import extend_schema
 from rest_framework.views import APIView
 from rest_framework import permissions, status
+from rest_framework.exceptions import Throttled
 from rest_framework.response import Response
-from apps.security.crypto_service import CryptoEngine, CryptoServiceError
+from apps.security.crypto_service import Argon2BusyError, CryptoServiceError, process_request
+from apps.security.history_recorder import record, result_text
 from apps.security.serializers import CryptoRequestSerializer
 
 
@@ -13,7 +15,8 @@ from apps.security.serializers import CryptoRequestSerializer
 )
 class CryptoProcessView(APIView):
     """
-    Unified endpoint for all cryptographic operations.
+    Unified endpoint for all cryptographic operations. Finished operations
+    are added to the user's history unless ``?history=false``.
     """
     permission_classes = [permissions.IsAuthenticated]
 
@@ -21,30 +24,14 @@ class CryptoProcessView(APIView):
     def post(request):
         serializer = CryptoRequestSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        data = serializer.validated_data
-        
-        engine = CryptoEngine(
-            algorithm=data['algorithm'], 
-            key=data.get('key'),
-            is_binary=data.get('is_binary', False),
-            operation=data['operation'],
-            params=data.get('params')
-        )
 
+        data = serializer.validated_data
         try:
-            payload = data.get('payload', '')
-            result = engine.process(payload)
-            
-            response_data = {
-                "operation": data['operation'],
-                "algorithm": data['algorithm'],
-                **result
-            }
-            
-            if data.get('is_binary', False):
-                response_data["is_binary"] = True
-            
-            return Response(response_data, status=status.HTTP_200_OK)
-            
+            result = process_request(data)
+        except Argon2BusyError as exc:
+            raise Throttled(wait=exc.retry_after, detail=str(exc))
         except CryptoServiceError as exc:
             return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        record(request, data['operation'], data['algorithm'], data.get('payload', ''), result_text(result))
+        return Response(result, status=status.HTTP_200_OK)
@@ -0,0 +1,235 @@
+import itertools
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from django.http import StreamingHttpResponse
+from django.utils.http import content_disposition_header
+from rest_framework.views import APIView
+from rest_framework import permissions, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
+from apps.security.classical import caesar_shift_utf8_stream
+from apps.security.crypto_service import CryptoServiceError
+from apps.security.file_stream import HEADER_SIZE, decrypt_stream, encrypt_stream, parse_header
+from apps.security.history_recorder import byte_count, record
+from apps.security.serializers import (
+    FileCaesarRequestSerializer,
+    FileCryptoRequestSerializer,
+    FileHashRequestSerializer,
+)
+from apps.security.stream_hash import hash_stream, tree_hash
+
+KEY_IN_QUERY_MESSAGE = 'Ключ нельзя передавать в строке запроса: используйте заголовок X-Crypto-Key'
+
+
+def _read_body(request, chunk_size: int):
+    stream = request.stream
+    if stream is None:
+        return
+    while True:
+        piece = stream.read(chunk_size)
+        if not piece:
+            return
+        yield piece
+
+
+def _open_input(request, serializer_class=FileCryptoRequestSerializer, size_field='chunk_size'):
+    """
+    Return validated options, the input as an iterator of byte chunks and
+    the original file name. Accepts multipart/form-data with a ``file``
+    field or the raw request body. Chunks are ``size_field`` bytes long.
+    The key comes from the multipart form or the X-Crypto-Key header, never
+    from the query string, which ends up in access and proxy logs.
+    """
+    if 'key' in request.query_params:
+        raise ValidationError({'key': [KEY_IN_QUERY_MESSAGE]})
+    options = request.query_params.dict()
+    multipart = request.content_type.startswith('multipart/form-data')
+    if multipart:
+        options.update({name: value for name, value in request.data.items() if name != 'file'})
+    if 'key' not in options and 'X-Crypto-Key' in request.headers:
+        options['key'] = request.headers['X-Crypto-Key']
+
+    serializer = serializer_class(data=options)
+    serializer.is_valid(raise_exception=True)
+    data = serializer.validated_data
+
+    if multipart:
+        upload = request.FILES.get('file')
+        if upload is None:
+            raise ValidationError({"file": "Необходимо передать файл"})
+        return data, upload.chunks(data[size_field]), upload.name
+    return data, _read_body(request, data[size_field]), request.headers.get('X-File-Name', 'file')
+
+
+class _Tally:
+    """Total size and leading bytes of a chunk stream passed through ``count``."""
+
+    def __init__(self):
+        self.size = 0
+        self.head = b""
+
+    def count(self, chunks):
+        for chunk in chunks:
+            if len(self.head) < HEADER_SIZE:
+                self.head += chunk[:HEADER_SIZE - len(self.head)]
+            self.size += len(chunk)
+            yield chunk
+
+
+def _then(chunks, callback):
+    """Yield ``chunks``, then call ``callback`` once all of them went out."""
+    yield from chunks
+    callback()
+
+
+def _streaming_response(chunks, filename: str) -> StreamingHttpResponse:
+    # Pull the first chunk eagerly: format errors and a wrong key surface
+    # as a 400 instead of a broken download.
+    first = next(chunks)
+    response = StreamingHttpResponse(
+        itertools.chain([first], chunks),
+        content_type='application/octet-stream',
+    )
+    response['Content-Disposition'] = content_disposition_header(True, filename)
+    return response
+
+
+@extend_schema(
+    tags=['Криптооперации'],
+    summary='Потоковое шифрование файла (AES-GCM / ChaCha20-Poly1305, блочное AEAD)',
+    request={
+        'multipart/form-data': OpenApiTypes.OBJECT,
+        'application/octet-stream': OpenApiTypes.BINARY,
+    },
+    responses={(200, 'application/octet-stream'): OpenApiTypes.BINARY},
+)
+class FileEncryptView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    @staticmethod
+    def post(request):
+        data, chunks, filename = _open_input(request)
+        try:
+            source, output = _Tally(), _Tally()
+            encrypted = output.count(encrypt_stream(
+                source.count(chunks),
+                data['key'],
+                algorithm=data['algorithm'],
+                chunk_size=data['chunk_size'],
+            ))
+            encrypted = _then(encrypted, lambda: record(
+                request, 'encrypt', data['algorithm'],
+                f"{filename}, {byte_count(source.size)}", byte_count(output.size),
+            ))
+            return _streaming_response(encrypted, f"{filename}.enc")
+        except CryptoServiceError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+@extend_schema(
+    tags=['Криптооперации'],
+    summary='Потоковая расшифровка файла, зашифрованного через files/encrypt/',
+    request={
+        'multipart/form-data': OpenApiTypes.OBJECT,
+        'application/octet-stream': OpenApiTypes.BINARY,
+    },
+    responses={(200, 'application/octet-stream'): OpenApiTypes.BINARY},
+)
+class FileDecryptView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    @staticmethod
+    def post(request):
+        data, chunks, filename = _open_input(request)
+        if filename.endswith('.enc'):
+            filename = filename[:-len('.enc')]
+        try:
+            source, output = _Tally(), _Tally()
+            decrypted = output.count(decrypt_stream(source.count(chunks), data['key']))
+            decrypted = _then(decrypted, lambda: record(
+                request, 'decrypt', parse_header(source.head)[0],
+                f"{filename}, {byte_count(source.size)}", byte_count(output.size),
+            ))
+            return _streaming_response(decrypted, filename)
+        except CryptoServiceError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+@extend_schema(
+    tags=['Криптооперации'],
+    summary='Потоковое хэширование файла (SHA-256 / SHA-512, опционально дерево Меркла)',
+    request={
+        'multipart/form-data': OpenApiTypes.OBJECT,
+        'application/octet-stream': OpenApiTypes.BINARY,
+    },
+    responses={200: OpenApiTypes.OBJECT},
+)
+class FileHashView(APIView):
+    """
+    Hashes the upload as it is read, in constant memory. ``mode=tree``
+    hashes ``leaf_size`` leaves in parallel and returns the Merkle root.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    @staticmethod
+    def post(request):
+        data, chunks, filename = _open_input(request, FileHashRequestSerializer, size_field='leaf_size')
+        try:
+            if data['mode'] == 'tree':
+                digest = tree_hash(chunks, data['algorithm'], data['leaf_size'])
+            else:
+                digest = hash_stream(chunks, data['algorithm'])
+        except CryptoServiceError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        record(request, 'hash', digest.algorithm, f"{filename}, {byte_count(digest.size)}", digest.digest)
+        response_data = {
+            "algorithm": digest.algorithm,
+            "mode": digest.mode,
+            "hash": digest.digest,
+            "size": digest.size,
+            "file_name": filename,
+        }
+        if digest.mode == 'tree':
+            response_data["leaf_size"] = digest.leaf_size
+            response_data["leaves"] = digest.leaves
+        return Response(response_data, status=status.HTTP_200_OK)
+
+
+@extend_schema(
+    tags=['Криптооперации'],
+    summary='Потоковое шифрование текстового файла шифром Цезаря',
+    request={
+        'multipart/form-data': OpenApiTypes.OBJECT,
+        'application/octet-stream': OpenApiTypes.BINARY,
+    },
+    responses={(200, 'application/octet-stream'): OpenApiTypes.BINARY},
+)
+class FileCaesarView(APIView):
+    """
+    Shifts a UTF-8 text file as it is read, one chunk at a time, so a
+    book-sized text never has to fit into a request body field.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    @staticmethod
+    def post(request):
+        data, chunks, filename = _open_input(request, FileCaesarRequestSerializer)
+        shift = data['key'] % 26
+        if data['operation'] == 'decrypt':
+            shift = -shift
+        try:
+            source, output = _Tally(), _Tally()
+            shifted = output.count(caesar_shift_utf8_stream(source.count(chunks), shift))
+            shifted = _then(shifted, lambda: record(
+                request, data['operation'], 'caesar',
+                f"{filename}, {byte_count(source.size)}", byte_count(output.size),
+            ))
+            return _streaming_response(shifted, filename)
+        except UnicodeDecodeError:
+            return Response({"detail": "Файл должен быть текстом в кодировке UTF-8"}, status=status.HTTP_400_BAD_REQUEST)
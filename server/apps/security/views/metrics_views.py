@@ -0,0 +1,130 @@
+from dataclasses import asdict
+from django.core.cache import cache
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from rest_framework.views import APIView
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from apps.security.aead import aead_selector
+from apps.security.argon2_calibration import argon2_calibrator
+from apps.security.argon2_executor import argon2_executor
+from apps.security.history_recorder import history_recorder
+from apps.security.key_pool import key_pool
+
+
+@extend_schema(
+    tags=['Цифровые подписи'],
+    summary='Состояние пула заранее сгенерированных ключей',
+    responses={200: OpenApiTypes.OBJECT},
+)
+class KeyPoolStatsView(APIView):
+    """
+    Depth, refill and wait-time counters of the key-pair pool per spec,
+    for sizing LOW_WATER/TARGET before a class starts.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    @staticmethod
+    def get(request):
+        return Response({
+            "enabled": key_pool.enabled,
+            "specs": [asdict(item) for item in key_pool.stats()],
+        }, status=status.HTTP_200_OK)
+
+
+@extend_schema(
+    tags=['Криптооперации'],
+    summary='Статистика общего кэша: попадания, промахи, вытеснения, заполненность',
+    responses={200: OpenApiTypes.OBJECT},
+)
+class CacheStatsView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    @staticmethod
+    def get(request):
+        if not hasattr(cache, 'stats'):
+            return Response({"backend": type(cache).__name__}, status=status.HTTP_200_OK)
+        return Response(cache.stats(), status=status.HTTP_200_OK)
+
+
+@extend_schema(
+    tags=['Криптооперации'],
+    summary='Загрузка исполнителя Argon2: очередь, память, время ожидания и выполнения',
+    responses={200: OpenApiTypes.OBJECT},
+)
+class Argon2StatsView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    @staticmethod
+    def get(request):
+        return Response(asdict(argon2_executor.stats()), status=status.HTTP_200_OK)
+
+
+@extend_schema(
+    tags=['Криптооперации'],
+    summary='Выбор AEAD для алгоритма auto на этом сервере: возможности CPU и калибровка',
+    responses={200: OpenApiTypes.OBJECT},
+)
+class AutoAeadCalibrationView(APIView):
+    """
+    Which AEAD ``auto`` encrypts with on the node serving the request, and
+    why: the CPU features found and the speed measured for each cipher.
+    Staff can POST to re-run the calibration.
+    """
+
+    def get_permissions(self):
+        if self.request.method == 'POST':
+            return [permissions.IsAdminUser()]
+        return [permissions.IsAuthenticated()]
+
+    @staticmethod
+    def get(request):
+        return Response(asdict(aead_selector.calibration()), status=status.HTTP_200_OK)
+
+    @staticmethod
+    def post(request):
+        return Response(asdict(aead_selector.recalibrate()), status=status.HTTP_200_OK)
+
+
+@extend_schema(
+    tags=['Криптооперации'],
+    summary='Параметры Argon2 по умолчанию, откалиброванные под этот сервер',
+    responses={200: OpenApiTypes.OBJECT},
+)
+class Argon2ProfileView(APIView):
+    """
+    The time_cost/memory_cost/parallelism that Argon2 hashes get by default
+    on the node serving the request, with the latency measured for them and
+    the targets they were calibrated to. Staff can POST to re-run the
+    calibration.
+    """
+
+    def get_permissions(self):
+        if self.request.method == 'POST':
+            return [permissions.IsAdminUser()]
+        return [permissions.IsAuthenticated()]
+
+    @staticmethod
+    def get(request):
+        return Response(argon2_calibrator.profile().as_dict(), status=status.HTTP_200_OK)
+
+    @staticmethod
+    def post(request):
+        return Response(argon2_calibrator.recalibrate().as_dict(), status=status.HTTP_200_OK)
+
+
+@extend_schema(
+    tags=['История операций'],
+    summary='Состояние буфера записи истории операций',
+    responses={200: OpenApiTypes.OBJECT},
+)
+class HistoryRecorderStatsView(APIView):
+    """
+    Rows pending, written, dropped because the buffer was full, and lost to
+    database errors, in this worker process.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    @staticmethod
+    def get(request):
+        return Response(asdict(history_recorder.stats()), status=status.HTTP_200_OK)
@@ -0,0 +1,93 @@
+import base64
+from django.conf import settings
+from django.http import HttpResponse
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from rest_framework.views import APIView
+from rest_framework import permissions, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from apps.security.crypto_service import CryptoEngine, CryptoServiceError
+from apps.security.history_recorder import byte_count, record
+from apps.security.serializers import RawCryptoRequestSerializer
+from .file_crypto_view import KEY_IN_QUERY_MESSAGE
+
+_READ_SIZE = 1024 * 1024
+
+
+def _read_payload(request, length: int) -> bytearray:
+    """Read the request body into one preallocated buffer."""
+    buffer = bytearray(length)
+    view = memoryview(buffer)
+    filled = 0
+    stream = request.stream
+    while stream is not None and filled < length:
+        piece = stream.read(min(length - filled, _READ_SIZE))
+        if not piece:
+            break
+        view[filled:filled + len(piece)] = piece
+        filled += len(piece)
+    view.release()
+    del buffer[filled:]
+    return buffer
+
+
+@extend_schema(
+    tags=['Криптооперации'],
+    summary='Шифрование и расшифровка двоичных данных без Base64 (application/octet-stream)',
+    request={'application/octet-stream': OpenApiTypes.BINARY},
+    responses={(200, 'application/octet-stream'): OpenApiTypes.BINARY},
+)
+class RawCryptoView(APIView):
+    """
+    Bytes-native variant of the crypto endpoint. Parameters go in the query
+    string, the key in the X-Crypto-Key header and the data in the body.
+    The result is returned as raw bytes unless ``encoding=base64``.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = []
+
+    @staticmethod
+    def post(request):
+        # Query strings end up in access and proxy logs.
+        if 'key' in request.query_params:
+            raise ValidationError({'key': [KEY_IN_QUERY_MESSAGE]})
+        options = request.query_params.dict()
+        if 'X-Crypto-Key' in request.headers:
+            options['key'] = request.headers['X-Crypto-Key']
+        serializer = RawCryptoRequestSerializer(data=options)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        try:
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            length = 0
+        if length > settings.CRYPTO_RAW_MAX_BYTES:
+            return Response(
+                {"detail": "Слишком большой объем данных"},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+
+        engine = CryptoEngine(
+            algorithm=data['algorithm'],
+            key=data.get('key'),
+            is_binary=True,
+            operation=data['operation'],
+            params={"mode": data['mode']} if 'mode' in data else None,
+        )
+
+        try:
+            payload = _read_payload(request, length)
+            if data['operation'] == 'encrypt':
+                result = engine.encrypt_bytes(payload)
+            else:
+                result = engine.decrypt_bytes(payload)
+        except CryptoServiceError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        record(request, data['operation'], data['algorithm'], byte_count(len(payload)), byte_count(len(result)))
+        if data['encoding'] == 'base64':
+            return HttpResponse(base64.b64encode(result), content_type='text/plain; charset=utf-8')
+        # HttpResponse iterates a bytearray item by item; hand it a memoryview.
+        return HttpResponse(memoryview(result), content_type='application/octet-stream')
@@ -5,10 +5,11 @@ from rest_framework.response import Response
 from apps.security.crypto_service import (
     RSAKeyPair,
     RSASignatureError,
-    generate_rsa_keypair,
     sign_message_rsa_pss,
     verify_message_rsa_pss,
 )
+from apps.security.history_recorder import record
+from apps.security.key_pool import key_pool
 from apps.security.serializers import (
     RSAGenerateKeyPairResponseSerializer,
     RSASignRequestSerializer,
@@ -28,7 +29,7 @@ class RSAGenerateKeyPairView(APIView):
 
     @staticmethod
     def post(request):
-        keypair: RSAKeyPair = generate_rsa_keypair()
+        keypair: RSAKeyPair = key_pool.acquire("rsa", 2048)
         data = {
             "public_key": keypair.public_key_b64,
             "private_key": keypair.private_key_b64,
@@ -61,6 +62,7 @@ class RSASignView(APIView):
         except RSASignatureError as exc:
             return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
+        record(request, 'sign', 'rsa-pss', data["message"], signature_b64)
         response_serializer = RSASignResponseSerializer(data={"signature": signature_b64})
         response_serializer.is_valid(raise_exception=True)
         return Response(response_serializer.data, status=status.HTTP_200_OK)
@@ -90,6 +92,7 @@ class RSAVerifyView(APIView):
         except RSASignatureError as exc:
             return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
+        record(request, 'verify', 'rsa-pss', data["message"], "Верно" if is_valid else "Неверно")
         response_serializer = RSAVerifyResponseSerializer(data={"is_valid": is_valid})
         response_serializer.is_valid(raise_exception=True)
         return Response(response_serializer.data, status=status.HTTP_200_OK)
@@ -0,0 +1,46 @@
+import base64
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from rest_framework.views import APIView
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from apps.security.bulk_verify import bulk_verify
+from apps.security.history_recorder import record
+from apps.security.serializers import BulkVerifyRequestSerializer
+
+
+@extend_schema(
+    tags=['Цифровые подписи'],
+    summary='Пакетная проверка подписей RSA-PSS / ECDSA',
+    request=BulkVerifyRequestSerializer,
+    responses={200: OpenApiTypes.OBJECT},
+)
+class BulkVerifyView(APIView):
+    """
+    Verifies many signatures at once. ``bitmap`` is Base64 of one bit per
+    item, most significant bit first: bit ``i`` is set when item ``i`` has a
+    valid signature. ``errors`` lists items that could not be checked.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    @staticmethod
+    def post(request):
+        serializer = BulkVerifyRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        triples, errors = data['items']
+
+        result = bulk_verify(data['algorithm'], triples, data['hash_algorithm'], errors)
+        record(
+            request, 'verify', data['algorithm'],
+            f"Подписей: {result.count}", f"Верных: {result.valid_count} из {result.count}",
+        )
+        return Response({
+            "count": result.count,
+            "valid_count": result.valid_count,
+            "bitmap": base64.b64encode(result.bitmap).decode('ascii'),
+            "errors": [
+                {"index": index, "detail": detail}
+                for index, detail in sorted(result.errors.items())
+            ],
+        }, status=status.HTTP_200_OK)
@@ -1,9 +1,17 @@
+from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema
 from rest_framework.views import APIView
 from rest_framework import permissions, status
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
+from apps.security import history, history_retention
+from apps.security.history_recorder import history_recorder
 from apps.security.models import UserOperationHistory
-from apps.security.serializers import UserOperationHistorySerializer
+from apps.security.serializers import (
+    UserOperationHistoryDetailSerializer,
+    UserOperationHistoryQuerySerializer,
+    UserOperationHistorySerializer,
+)
 
 
 @extend_schema(
@@ -14,21 +22,46 @@ class UserOperationHistoryView(APIView):
     """
     Просмотр и управление историей криптографических операций текущего пользователя.
 
-    - GET: вернуть последние N операций (по умолчанию 100)
-    - POST: добавить новую операцию
-    - DELETE: полностью очистить историю пользователя
+    - GET: последние операции, новые первыми; фильтры operation_type,
+      algorithm, since, until. С параметром limit или cursor ответ
+      постраничный: {"results": [...], "next_cursor": ...}, без них -
+      список из последних 100 операций. Длинные входные данные и результаты
+      отдаются началом и SHA-256 (input_digest, output_digest); целиком их
+      отдает history/<id>/
+    - POST: добавить операцию вручную (криптографические эндпоинты
+      записывают свои операции сами)
+    - DELETE: полностью очистить историю пользователя (удаляется пачками,
+      чтобы не блокировать запись истории другим запросам)
     """
     permission_classes = [permissions.IsAuthenticated]
 
     @staticmethod
     def get(request):
-        limit = 100
-        queryset = (
-            UserOperationHistory.objects.filter(user=request.user)
-            .order_by('-timestamp')[:limit]
+        query = UserOperationHistoryQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        # Operations recorded by this worker show up without waiting for the timer.
+        history_recorder.flush()
+        params = query.validated_data
+        queryset = history.filtered(
+            # Pages show previews; the compressed bodies are read only by history/<id>/.
+            UserOperationHistory.objects.filter(user=request.user).defer('input_body', 'output_body'),
+            operation_type=params.get('operation_type'),
+            algorithm=params.get('algorithm'),
+            since=params.get('since'),
+            until=params.get('until'),
         )
-        serializer = UserOperationHistorySerializer(queryset, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        if 'limit' not in request.query_params and 'cursor' not in params:
+            serializer = UserOperationHistorySerializer(queryset[:history.DEFAULT_LIMIT], many=True)
+            return Response(serializer.data, status=status.HTTP_200_OK)
+
+        try:
+            rows, next_cursor = history.page(queryset, params['limit'], params.get('cursor'))
+        except history.InvalidCursor as exc:
+            raise ValidationError({'cursor': [str(exc)]})
+        return Response({
+            'results': UserOperationHistorySerializer(rows, many=True).data,
+            'next_cursor': next_cursor,
+        }, status=status.HTTP_200_OK)
 
     @staticmethod
     def post(request):
@@ -39,5 +72,24 @@ class UserOperationHistoryView(APIView):
 
     @staticmethod
     def delete(request):
-        UserOperationHistory.objects.filter(user=request.user).delete()
+        history_recorder.discard(request.user.pk)
+        history_retention.clear_user(request.user.pk)
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+@extend_schema(
+    tags=['История операций'],
+    summary='Операция из истории с полными данными',
+)
+class UserOperationHistoryDetailView(APIView):
+    """
+    Одна операция текущего пользователя с полными входными данными и
+    результатом (распакованными, до CRYPTO_HISTORY_MAX_BODY_CHARS символов).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = UserOperationHistoryDetailSerializer
+
+    @staticmethod
+    def get(request, pk):
+        row = get_object_or_404(UserOperationHistory, pk=pk, user=request.user)
+        return Response(UserOperationHistoryDetailSerializer(row).data, status=status.HTTP_200_OK)
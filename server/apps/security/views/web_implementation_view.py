@@ -3,17 +3,22 @@ from rest_framework import permissions
 from rest_framework.generics import ListAPIView
 from apps.security.models import WebImplementationExample
 from apps.security.serializers import WebImplementationExampleSerializer
+from apps.security.response_cache import CachedListMixin
+from apps.security.sparse_fields import PARAMETERS, CatalogCursorPagination, SparseFieldsMixin
 
 
 @extend_schema(
     tags=['Обучающие материалы'],
     summary='Примеры веб-реализации криптографии',
+    parameters=PARAMETERS,
 )
-class WebImplementationExampleListView(ListAPIView):
+class WebImplementationExampleListView(CachedListMixin, SparseFieldsMixin, ListAPIView):
     """
     Список примеров веб-реализаций (раздел WebImplementation).
     """
 
     permission_classes = [permissions.IsAuthenticated]
+    cache_name = 'web-implementations'
+    pagination_class = CatalogCursorPagination
     serializer_class = WebImplementationExampleSerializer
     queryset = WebImplementationExample.objects.all()
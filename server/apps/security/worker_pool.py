@@ -0,0 +1,153 @@
+"""
+Shared process pool for CPU-bound crypto work.
+
+pycryptodome holds the GIL for most of its work, so threads do not help;
+batches are spread over worker processes instead. The pool is created
+lazily on first use and shut down at interpreter exit. Workers
+start with ``spawn`` by default, because forking a threaded server process
+can copy held locks into the child.
+
+Small jobs are not worth the inter-process round trip and run inline, as
+does everything when ``MAX_WORKERS`` is 0. Argon2 is the exception the
+other way round: argon2-cffi releases the GIL, and every hash has to count
+against the memory budget of this process's ``argon2_executor``. A child
+has an executor and a budget of its own, so Argon2 items sent to the pool
+could use up to MAX_WORKERS times CRYPTO_ARGON2["MEMORY_BUDGET_KIB"];
+``map_ordered`` keeps them here instead (its ``local`` argument). A spawned worker starts with no
+Django apps loaded, so each one runs ``django.setup()`` first; work can
+check ``in_worker()`` to skip what only the server process should do.
+
+Every web worker process owns a pool of its own, with its own key caches
+in each child. ``MAX_WORKERS`` therefore defaults to the cores divided by
+the number of web workers (gunicorn's ``WEB_CONCURRENCY``), so that a node
+runs about one pool process per core in total.
+"""
+from __future__ import annotations
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Iterable, TypeVar
+from django.core.exceptions import ImproperlyConfigured
+from .key_cache import _cache_settings
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_lock = threading.Lock()
+_executor: ProcessPoolExecutor | None = None
+_in_worker = False
+
+
+def in_worker() -> bool:
+    """Whether this process is one of the pool's worker processes."""
+    return _in_worker
+
+
+def _init_worker() -> None:
+    global _in_worker
+    _in_worker = True
+    import django
+    try:
+        django.setup()
+    except ImproperlyConfigured:
+        # A plain script without Django settings; nothing to load.
+        pass
+
+
+def default_max_workers() -> int:
+    """One pool process per core for the whole node, split between the web workers."""
+    try:
+        web_workers = max(1, int(os.getenv("WEB_CONCURRENCY", 1)))
+    except ValueError:
+        web_workers = 1
+    return max(1, (os.cpu_count() or 1) // web_workers)
+
+
+def _pool_settings() -> dict:
+    config = _cache_settings("CRYPTO_WORKER_POOL")
+    return {
+        "max_workers": int(config.get("MAX_WORKERS", default_max_workers())),
+        "start_method": config.get("START_METHOD", "spawn"),
+        "min_parallel_items": int(config.get("MIN_PARALLEL_ITEMS", 8)),
+    }
+
+
+def get_executor() -> ProcessPoolExecutor | None:
+    """Return the shared pool, or ``None`` when the pool is disabled."""
+    global _executor
+    if _executor is not None:
+        return _executor
+    config = _pool_settings()
+    if config["max_workers"] <= 0:
+        return None
+    with _lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=config["max_workers"],
+                mp_context=multiprocessing.get_context(config["start_method"]),
+                initializer=_init_worker,
+            )
+    return _executor
+
+
+def shutdown(wait: bool = True) -> None:
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait, cancel_futures=True)
+
+
+atexit.register(shutdown, wait=False)
+
+
+def map_ordered(func: Callable[[T], R], items: Iterable[T],
+                local: Callable[[T], bool] | None = None, local_threads: int = 1) -> list[R]:
+    """
+    Apply ``func`` to every item and return the results in input order.
+
+    ``func`` must be a picklable module-level function. Items are sent in
+    chunks so each worker gets a contiguous slice, which keeps its key
+    caches warm for batches that reuse the same key. If a worker dies the
+    pool is recreated and the batch is finished inline.
+
+    Items for which ``local`` is true never leave this process: they run on
+    up to ``local_threads`` threads while the pool works on the rest.
+    """
+    items = list(items)
+    config = _pool_settings()
+    here = [index for index, item in enumerate(items) if local is not None and local(item)]
+    kept = set(here)
+    remote = [index for index in range(len(items)) if index not in kept]
+    results: list = [None] * len(items)
+
+    pending = None
+    if config["max_workers"] > 0 and len(remote) >= config["min_parallel_items"]:
+        chunksize = max(1, -(-len(remote) // (config["max_workers"] * 4)))
+        try:
+            # map() submits every chunk at once, so the local items run meanwhile.
+            pending = get_executor().map(func, [items[index] for index in remote], chunksize=chunksize)
+        except BrokenProcessPool:
+            shutdown(wait=False)
+
+    if len(here) > 1 and local_threads > 1:
+        with ThreadPoolExecutor(max_workers=min(local_threads, len(here)), thread_name_prefix="map-local") as threads:
+            local_results = list(threads.map(func, [items[index] for index in here]))
+    else:
+        local_results = [func(items[index]) for index in here]
+    for index, result in zip(here, local_results):
+        results[index] = result
+
+    if pending is not None:
+        try:
+            for index, result in zip(remote, pending):
+                results[index] = result
+            return results
+        except BrokenProcessPool:
+            shutdown(wait=False)
+    for index in remote:
+        results[index] = func(items[index])
+    return results
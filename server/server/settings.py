@@ -93,6 +93,25 @@ DATABASES = {
     }
 }
 
+# One cache for all worker processes of a node, in a memory-mapped file
+# (apps/security/shared_cache.py). Without a LOCATION the file is named after
+# this project, and SIZE/STRIPES/SLOTS become part of the name. It needs
+# fcntl, so other platforms fall back to a per-process locmem cache.
+CACHES = {
+    'default': {
+        'BACKEND': (
+            'apps.security.shared_cache.SharedMemoryCache' if os.name == 'posix'
+            else 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('SHARED_CACHE_LOCATION', ''),
+        'OPTIONS': {
+            'SIZE': int(os.getenv('SHARED_CACHE_SIZE', 128 * 1024 * 1024)),
+            'STRIPES': int(os.getenv('SHARED_CACHE_STRIPES', 32)),
+            'SLOTS': int(os.getenv('SHARED_CACHE_SLOTS', 4096)),
+        } if os.name == 'posix' else {},
+    }
+}
+
 AUTH_USER_MODEL = 'user.User'
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -154,3 +173,178 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+CRYPTO_KEY_CACHE = {
+    'ENABLED': os.getenv('CRYPTO_KEY_CACHE_ENABLED', 'true').lower() == 'true',
+    'MAX_ENTRIES': int(os.getenv('CRYPTO_KEY_CACHE_MAX_ENTRIES', 256)),
+    'TTL': int(os.getenv('CRYPTO_KEY_CACHE_TTL', 3600)),
+}
+
+CRYPTO_DERIVED_KEY_CACHE = {
+    'ENABLED': os.getenv('CRYPTO_DERIVED_KEY_CACHE_ENABLED', 'true').lower() == 'true',
+    'MAX_ENTRIES': int(os.getenv('CRYPTO_DERIVED_KEY_CACHE_MAX_ENTRIES', 512)),
+    'TTL': int(os.getenv('CRYPTO_DERIVED_KEY_CACHE_TTL', 600)),
+}
+
+# Upper bound for request bodies of the application/octet-stream crypto endpoint.
+CRYPTO_RAW_MAX_BYTES = int(os.getenv('CRYPTO_RAW_MAX_BYTES', 64 * 1024 * 1024))
+
+# Each web worker process has its own crypto worker pool. The default splits
+# the cores between gunicorn's WEB_CONCURRENCY workers; when setting
+# CRYPTO_WORKER_POOL_MAX_WORKERS, size it against the web worker count too
+# (web workers x MAX_WORKERS processes run on the node).
+CRYPTO_WORKER_POOL = {
+    'MAX_WORKERS': int(os.getenv(
+        'CRYPTO_WORKER_POOL_MAX_WORKERS',
+        max(1, (os.cpu_count() or 1) // max(1, int(os.getenv('WEB_CONCURRENCY', 1)))),
+    )),
+    'START_METHOD': os.getenv('CRYPTO_WORKER_POOL_START_METHOD', 'spawn'),
+    'MIN_PARALLEL_ITEMS': int(os.getenv('CRYPTO_WORKER_POOL_MIN_PARALLEL_ITEMS', 8)),
+}
+
+CRYPTO_BATCH_MAX_ITEMS = int(os.getenv('CRYPTO_BATCH_MAX_ITEMS', 500))
+
+# Pre-generated key pairs per "algorithm:size" spec. A spec is refilled up
+# to TARGET once its stock (ready + in flight) drops below LOW_WATER. An
+# empty spec waits up to MAX_WAIT seconds for an in-flight key before
+# generating one inline.
+CRYPTO_KEY_POOL = {
+    'ENABLED': os.getenv('CRYPTO_KEY_POOL_ENABLED', 'true').lower() == 'true',
+    'PREWARM': os.getenv('CRYPTO_KEY_POOL_PREWARM', 'false').lower() == 'true',
+    'MAX_WAIT': float(os.getenv('CRYPTO_KEY_POOL_MAX_WAIT', 0.5)),
+    # Keys generated at the same time on the shared worker pool; the rest of
+    # a refill waits, so crypto/batch/ never queues behind a whole refill.
+    'MAX_IN_FLIGHT': int(os.getenv('CRYPTO_KEY_POOL_MAX_IN_FLIGHT', 1)),
+    'SPECS': {
+        'rsa:2048': {
+            'LOW_WATER': int(os.getenv('CRYPTO_KEY_POOL_RSA2048_LOW_WATER', 32)),
+            'TARGET': int(os.getenv('CRYPTO_KEY_POOL_RSA2048_TARGET', 64)),
+        },
+        'rsa:4096': {
+            'LOW_WATER': int(os.getenv('CRYPTO_KEY_POOL_RSA4096_LOW_WATER', 2)),
+            'TARGET': int(os.getenv('CRYPTO_KEY_POOL_RSA4096_TARGET', 4)),
+        },
+        'ecc:P-256': {
+            'LOW_WATER': int(os.getenv('CRYPTO_KEY_POOL_P256_LOW_WATER', 32)),
+            'TARGET': int(os.getenv('CRYPTO_KEY_POOL_P256_TARGET', 64)),
+            # Inline P-256 generation takes about a millisecond; never wait.
+            'MAX_WAIT': 0,
+        },
+        # Ephemeral keys for the compact ECC envelope.
+        'ecdh:P-256': {
+            'LOW_WATER': int(os.getenv('CRYPTO_KEY_POOL_ECDH_P256_LOW_WATER', 64)),
+            'TARGET': int(os.getenv('CRYPTO_KEY_POOL_ECDH_P256_TARGET', 256)),
+            'MAX_WAIT': 0,
+        },
+    },
+}
+
+# Argon2 runs on a bounded executor: jobs start only while the sum of their
+# memory_cost (KiB) stays within MEMORY_BUDGET_KIB; past MAX_QUEUE waiting
+# jobs or QUEUE_TIMEOUT seconds of waiting the API answers 429. The budget
+# is per web worker; crypto/batch/ keeps Argon2 items out of the worker pool
+# so they count against it too.
+CRYPTO_ARGON2 = {
+    'MAX_TIME_COST': int(os.getenv('CRYPTO_ARGON2_MAX_TIME_COST', 10)),
+    'MAX_MEMORY_COST': int(os.getenv('CRYPTO_ARGON2_MAX_MEMORY_COST', 256 * 1024)),
+    'MAX_PARALLELISM': int(os.getenv('CRYPTO_ARGON2_MAX_PARALLELISM', 8)),
+    'MAX_HASH_LEN': int(os.getenv('CRYPTO_ARGON2_MAX_HASH_LEN', 64)),
+    'MAX_WORKERS': int(os.getenv('CRYPTO_ARGON2_MAX_WORKERS', 4)),
+    'MEMORY_BUDGET_KIB': int(os.getenv('CRYPTO_ARGON2_MEMORY_BUDGET_KIB', 1024 * 1024)),
+    'MAX_QUEUE': int(os.getenv('CRYPTO_ARGON2_MAX_QUEUE', 32)),
+    'QUEUE_TIMEOUT': float(os.getenv('CRYPTO_ARGON2_QUEUE_TIMEOUT', 10)),
+}
+
+# Default Argon2 costs per host: the largest time_cost/memory_cost that keep
+# one hash within TARGET_MS, using at most MAX_MEMORY_KIB and
+# MAX_PARALLELISM lanes (apps/security/argon2_calibration.py). The profile
+# is stored per host and measured at startup when none matches the hardware
+# and targets (one process of the node at a time), or by
+# `manage.py calibrate_argon2`; processes re-read it every RELOAD_INTERVAL
+# seconds and use the static defaults until one is stored.
+CRYPTO_ARGON2_CALIBRATION = {
+    'TARGET_MS': float(os.getenv('CRYPTO_ARGON2_CALIBRATION_TARGET_MS', 250)),
+    'MAX_MEMORY_KIB': int(os.getenv('CRYPTO_ARGON2_CALIBRATION_MAX_MEMORY_KIB', 64 * 1024)),
+    'MAX_PARALLELISM': int(os.getenv('CRYPTO_ARGON2_CALIBRATION_MAX_PARALLELISM', 4)),
+    'HASH_LEN': int(os.getenv('CRYPTO_ARGON2_CALIBRATION_HASH_LEN', 32)),
+    'ROUNDS': int(os.getenv('CRYPTO_ARGON2_CALIBRATION_ROUNDS', 3)),
+    'RELOAD_INTERVAL': float(os.getenv('CRYPTO_ARGON2_CALIBRATION_RELOAD_INTERVAL', 300)),
+    'CALIBRATE_ON_STARTUP': os.getenv('CRYPTO_ARGON2_CALIBRATION_ON_STARTUP', 'true').lower() == 'true',
+}
+
+# Threads hashing Merkle-tree leaves for files/hash/?mode=tree.
+CRYPTO_HASH_TREE = {
+    'MAX_WORKERS': int(os.getenv('CRYPTO_HASH_TREE_MAX_WORKERS', os.cpu_count() or 1)),
+}
+
+CRYPTO_BULK_VERIFY_MAX_ITEMS = int(os.getenv('CRYPTO_BULK_VERIFY_MAX_ITEMS', 50000))
+
+# Host benchmarks shown next to AlgorithmComparison (manage.py measure_algorithms).
+CRYPTO_MEASUREMENTS = {
+    # Measurements older than this, or taken with another CPU or library
+    # versions, are re-measured on the next run.
+    'MAX_AGE_HOURS': int(os.getenv('CRYPTO_MEASUREMENTS_MAX_AGE_HOURS', 24 * 7)),
+    'MIN_TIME': float(os.getenv('CRYPTO_MEASUREMENTS_MIN_TIME', 0.3)),
+    'CACHE_TIMEOUT': int(os.getenv('CRYPTO_MEASUREMENTS_CACHE_TIMEOUT', 300)),
+}
+
+# The crypto endpoints record history themselves through a write-behind
+# buffer (apps/security/history_recorder.py): rows are written in batches
+# of FLUSH_SIZE or after FLUSH_INTERVAL seconds; beyond MAX_PENDING rows
+# new ones are dropped rather than delaying responses.
+CRYPTO_HISTORY_RECORDER = {
+    'ENABLED': os.getenv('CRYPTO_HISTORY_RECORDER_ENABLED', 'true').lower() == 'true',
+    'MAX_PENDING': int(os.getenv('CRYPTO_HISTORY_RECORDER_MAX_PENDING', 10000)),
+    'FLUSH_SIZE': int(os.getenv('CRYPTO_HISTORY_RECORDER_FLUSH_SIZE', 200)),
+    'FLUSH_INTERVAL': float(os.getenv('CRYPTO_HISTORY_RECORDER_FLUSH_INTERVAL', 1.0)),
+}
+
+# Inputs and outputs of the operation history longer than COMPRESS_THRESHOLD
+# characters are stored as a PREVIEW_CHARS preview, a SHA-256 digest and a
+# zlib-compressed body of at most MAX_BODY_CHARS characters
+# (apps/security/history_storage.py).
+CRYPTO_HISTORY_STORAGE = {
+    'COMPRESS_THRESHOLD': int(os.getenv('CRYPTO_HISTORY_COMPRESS_THRESHOLD', 512)),
+    'PREVIEW_CHARS': int(os.getenv('CRYPTO_HISTORY_PREVIEW_CHARS', 256)),
+    'MAX_BODY_CHARS': int(os.getenv('CRYPTO_HISTORY_MAX_BODY_CHARS', 4096)),
+}
+
+# `manage.py prune_history` keeps at most MAX_ROWS_PER_USER rows per user and
+# none older than MAX_AGE_DAYS (0 turns a limit off). It deletes BATCH_SIZE
+# rows per transaction and sleeps BATCH_PAUSE seconds between batches, so
+# the history writers never wait long for the write lock.
+CRYPTO_HISTORY_RETENTION = {
+    'MAX_ROWS_PER_USER': int(os.getenv('CRYPTO_HISTORY_MAX_ROWS_PER_USER', 1000)),
+    'MAX_AGE_DAYS': int(os.getenv('CRYPTO_HISTORY_MAX_AGE_DAYS', 180)),
+    'BATCH_SIZE': int(os.getenv('CRYPTO_HISTORY_PRUNE_BATCH_SIZE', 500)),
+    'BATCH_PAUSE': float(os.getenv('CRYPTO_HISTORY_PRUNE_BATCH_PAUSE', 0.05)),
+}
+
+# Rendered JSON of the knowledge-base lists, served with ETags from the
+# default cache (apps/security/response_cache.py). Edits in the admin
+# invalidate it right away; TIMEOUT only bounds how long unused entries stay.
+KNOWLEDGE_BASE_CACHE = {
+    'ENABLED': os.getenv('KNOWLEDGE_BASE_CACHE_ENABLED', 'true').lower() == 'true',
+    'TIMEOUT': int(os.getenv('KNOWLEDGE_BASE_CACHE_TIMEOUT', 24 * 3600)),
+}
+
+# Binary AES/ChaCha20 payloads from THRESHOLD bytes up are encrypted in
+# SEGMENT_SIZE segments by MAX_WORKERS threads and authenticated with one
+# HMAC tag (apps/security/parallel_cipher.py). THRESHOLD 0 turns it off,
+# the default on single-core hosts, where it only adds the HMAC pass.
+CRYPTO_PARALLEL_CIPHER = {
+    'THRESHOLD': int(os.getenv(
+        'CRYPTO_PARALLEL_CIPHER_THRESHOLD', 4 * 1024 * 1024 if (os.cpu_count() or 1) > 1 else 0,
+    )),
+    'SEGMENT_SIZE': int(os.getenv('CRYPTO_PARALLEL_CIPHER_SEGMENT_SIZE', 1024 * 1024)),
+    'MAX_WORKERS': int(os.getenv('CRYPTO_PARALLEL_CIPHER_MAX_WORKERS', min(8, os.cpu_count() or 1))),
+}
+
+# The "auto" AEAD picks AES-GCM or ChaCha20-Poly1305 per node by timing both
+# at startup. FORCE pins the choice (aes-gcm or chacha20-poly1305).
+CRYPTO_AUTO_AEAD = {
+    'FORCE': os.getenv('CRYPTO_AUTO_AEAD_FORCE', ''),
+    'CALIBRATE_ON_STARTUP': os.getenv('CRYPTO_AUTO_AEAD_CALIBRATE_ON_STARTUP', 'true').lower() == 'true',
+    'SAMPLE_SIZE': int(os.getenv('CRYPTO_AUTO_AEAD_SAMPLE_SIZE', 256 * 1024)),
+    'ROUNDS': int(os.getenv('CRYPTO_AUTO_AEAD_ROUNDS', 5)),
+}